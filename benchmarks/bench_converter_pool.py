@@ -0,0 +1,82 @@
+# benchmarks/bench_converter_pool.py
+"""Compara abrir un conversor por documento con el pool de conversores abiertos.
+
+Por defecto usa el backend falso (arranque y conversión simulados), así que corre en
+cualquier equipo; con --backend word o libreoffice mide el conversor real.
+
+Uso: python benchmarks/bench_converter_pool.py --files 40 --workers 2
+     python benchmarks/bench_converter_pool.py --backend libreoffice --docx escrito.docx
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from functools import partial
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from converters import BACKENDS, ConverterPool, FakeBackend
+
+
+def run_cold(factory, jobs):
+    """Lo que hacía la pestaña antes: arrancar, convertir y cerrar por cada documento."""
+    start = time.perf_counter()
+    for src, dst in jobs:
+        backend = factory()
+        backend.thread_init()
+        try:
+            backend.start()
+            backend.convert(src, dst)
+        finally:
+            backend.close()
+            backend.thread_exit()
+    return time.perf_counter() - start
+
+
+def run_pool(factory, jobs, workers, recycle_after):
+    start = time.perf_counter()
+    pool = ConverterPool(factory, size=workers, recycle_after=recycle_after)
+    for future in pool.convert_many(jobs):
+        future.result()
+    pool.shutdown()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--recycle-after", type=int, default=50)
+    parser.add_argument("--backend", default="fake", choices=sorted(BACKENDS))
+    parser.add_argument("--docx", help="Documento de ejemplo (obligatorio con un backend real).")
+    parser.add_argument("--startup-ms", type=float, default=800, help="Arranque simulado del backend falso.")
+    parser.add_argument("--convert-ms", type=float, default=60, help="Conversión simulada del backend falso.")
+    args = parser.parse_args()
+
+    if args.backend == "fake":
+        factory = partial(FakeBackend, startup_delay=args.startup_ms / 1000, convert_delay=args.convert_ms / 1000)
+    elif not args.docx:
+        sys.exit("Indica un documento con --docx para medir un backend real.")
+    else:
+        factory = BACKENDS[args.backend]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = []
+        for i in range(args.files):
+            src = os.path.join(tmp, f"escrito_{i}.docx")
+            if args.docx:
+                shutil.copyfile(args.docx, src)
+            else:
+                open(src, "wb").close()
+            jobs.append((src, os.path.join(tmp, f"escrito_{i}.pdf")))
+
+        cold = run_cold(factory, jobs)
+        warm = run_pool(factory, jobs, args.workers, args.recycle_after)
+        print(f"Un conversor por documento: {cold:7.2f} s ({cold / args.files * 1000:.0f} ms por archivo)")
+        print(f"Pool de {args.workers} conversores:    {warm:7.2f} s ({warm / args.files * 1000:.0f} ms por archivo)")
+        print(f"Aceleración: {cold / warm:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
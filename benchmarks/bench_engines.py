@@ -0,0 +1,44 @@
+# benchmarks/bench_engines.py
+"""Compara velocidad y tamaño de salida del motor Ghostscript y del motor nativo.
+
+Uso: python benchmarks/bench_engines.py --pages 200
+     python benchmarks/bench_engines.py --input expediente.pdf
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from compressor import compress_with_engine
+from bench_remove_pages import build_scan_like_pdf
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--input", help="PDF propio en lugar del generado")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = args.input
+        if source is None:
+            source = os.path.join(tmp, "fuente.pdf")
+            build_scan_like_pdf(source, args.pages)
+        print(f"Origen: {os.path.getsize(source) / 1e6:.1f} MB")
+        print(f"{'preset':<9} {'motor':<12} {'tiempo':>9} {'tamaño':>10}")
+        for quality in ("screen", "ebook", "printer"):
+            for engine in ("ghostscript", "native"):
+                out = os.path.join(tmp, f"{engine}_{quality}.pdf")
+                start = time.perf_counter()
+                success, message = compress_with_engine(source, out, quality, engine)
+                elapsed = time.perf_counter() - start
+                size = f"{os.path.getsize(out) / 1e6:8.1f} MB" if success else "error"
+                print(f"{quality:<9} {engine:<12} {elapsed:8.2f}s {size:>10}")
+                if not success:
+                    print(f"  {message}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# benchmarks/bench_gsapi.py
+"""Mide el costo fijo por archivo de Ghostscript como subproceso frente a gsapi en el proceso.
+
+Uso: python benchmarks/bench_gsapi.py --files 30 --pages 2
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import gsapi
+from settings import load_settings
+from compressor import compress_pdf
+from bench_remove_pages import build_scan_like_pdf
+
+
+def run_backend(backend, files, out_dir):
+    load_settings()["ghostscript_backend"] = backend
+    start = time.perf_counter()
+    for i, source in enumerate(files):
+        success, message = compress_pdf(source, os.path.join(out_dir, f"{backend}_{i}.pdf"), "ebook")
+        if not success:
+            sys.exit(message)
+    return (time.perf_counter() - start) / len(files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=30)
+    parser.add_argument("--pages", type=int, default=2, help="Páginas por archivo; pocas para aislar el arranque.")
+    args = parser.parse_args()
+
+    if gsapi.load_library() is None:
+        sys.exit("No se encontró la biblioteca de Ghostscript (gsdll64.dll / libgs.so).")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for i in range(args.files):
+            path = os.path.join(tmp, f"fuente_{i}.pdf")
+            build_scan_like_pdf(path, args.pages, seed=i)
+            files.append(path)
+
+        per_file = {backend: run_backend(backend, files, tmp) for backend in ("subprocess", "gsapi")}
+        for backend, seconds in per_file.items():
+            print(f"{backend:<11} {seconds * 1000:8.1f} ms por archivo")
+        print(f"Ahorro por archivo: {(per_file['subprocess'] - per_file['gsapi']) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# benchmarks/bench_remove_pages.py
+"""Compara el método anterior (insert_pdf por página) con remove_selected_pages.
+
+Uso: python benchmarks/bench_remove_pages.py --pages 1200 --remove 10
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+import fitz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pdf_utils import remove_selected_pages
+
+
+def build_scan_like_pdf(path, pages, seed=0):
+    """PDF con una imagen distinta por página, parecido a un escaneo."""
+    rng = random.Random(seed)
+    doc = fitz.open()
+    width, height = 850, 1100
+    for i in range(pages):
+        pix = fitz.Pixmap(fitz.csGRAY, width, height, rng.randbytes(width * 4) * (height // 4), False)
+        page = doc.new_page(width=612, height=792)
+        page.insert_image(page.rect, pixmap=pix)
+        page.insert_text((72, 72), f"Foja {i + 1}")
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+
+
+def legacy_remove(input_pdf, output_pdf, pages_to_remove):
+    doc = fitz.open(input_pdf)
+    pages_to_keep = [i for i in range(len(doc)) if i not in pages_to_remove]
+    new_doc = fitz.open()
+    for i in pages_to_keep:
+        new_doc.insert_pdf(doc, from_page=i, to_page=i)
+    new_doc.save(output_pdf)
+    new_doc.close()
+    doc.close()
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=1200)
+    parser.add_argument("--remove", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "fuente.pdf")
+        build_scan_like_pdf(source, args.pages)
+        to_remove = sorted(random.Random(1).sample(range(args.pages), args.remove))
+
+        results = [("anterior (insert_pdf)", timed(legacy_remove, source, os.path.join(tmp, "legacy.pdf"), to_remove),
+                    os.path.getsize(os.path.join(tmp, "legacy.pdf")))]
+        for mode in ("fast", "compact"):
+            out = os.path.join(tmp, f"{mode}.pdf")
+            results.append((f"select() + {mode}", timed(remove_selected_pages, source, out, to_remove, save_mode=mode),
+                            os.path.getsize(out)))
+
+        print(f"{args.pages} páginas, {args.remove} eliminadas, origen {os.path.getsize(source) / 1e6:.1f} MB")
+        for name, seconds, size in results:
+            print(f"{name:<24} {seconds:8.2f} s {size / 1e6:10.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# benchmarks/bench_sharded_compression.py
+"""Mide el tiempo de compress_pdf frente a compress_pdf_sharded con distinta cantidad de procesos.
+
+Uso: python benchmarks/bench_sharded_compression.py --pages 900 --quality ebook
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from compressor import compress_pdf, compress_pdf_sharded, default_compression_workers
+from bench_remove_pages import build_scan_like_pdf
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=900)
+    parser.add_argument("--quality", default="ebook", choices=["screen", "ebook", "printer"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "fuente.pdf")
+        build_scan_like_pdf(source, args.pages)
+        print(f"{args.pages} páginas, origen {os.path.getsize(source) / 1e6:.1f} MB, {os.cpu_count()} núcleos")
+
+        out = os.path.join(tmp, "single.pdf")
+        start = time.perf_counter()
+        success, message = compress_pdf(source, out, args.quality)
+        baseline = time.perf_counter() - start
+        if not success:
+            sys.exit(message)
+        print(f"{'1 proceso':<14} {baseline:8.2f} s {os.path.getsize(out) / 1e6:8.1f} MB")
+
+        workers = 2
+        while workers <= default_compression_workers():
+            out = os.path.join(tmp, f"sharded_{workers}.pdf")
+            start = time.perf_counter()
+            success, message = compress_pdf_sharded(source, out, args.quality, max_workers=workers)
+            elapsed = time.perf_counter() - start
+            if not success:
+                sys.exit(message)
+            print(f"{f'{workers} procesos':<14} {elapsed:8.2f} s {os.path.getsize(out) / 1e6:8.1f} MB"
+                  f"  x{baseline / elapsed:.2f}")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# benchmarks/fixtures.py
+"""Documentos sintéticos y deterministas para las mediciones.
+
+Con la misma semilla se generan exactamente los mismos bytes, así que los resultados de
+dos equipos o de dos versiones del código son comparables. Cada página lleva una imagen
+JPEG propia (como un escaneo real), para que PyMuPDF no las unifique al guardar.
+"""
+import io
+import os
+import random
+
+# Tamaño de la imagen de una página escaneada a 150 dpi en tamaño carta
+SCAN_SIZE = (1275, 1650)
+LOREM = ("En la ciudad de Buenos Aires, a los días del mes de la fecha, comparece el señor "
+         "letrado apoderado de la parte actora y manifiesta que viene a interponer formal demanda "
+         "contra la demandada por los fundamentos de hecho y de derecho que a continuación expone. ")
+
+
+def scan_image(rng, index, color=False, size=SCAN_SIZE):
+    """Imagen de Pillow parecida a una hoja escaneada: fondo con ruido, renglones y sello."""
+    from PIL import Image, ImageDraw, ImageFilter
+
+    width, height = size
+    mode = "RGB" if color else "L"
+    # Ruido de baja resolución ampliado: se comprime como un escaneo, no como ruido puro
+    noise = Image.frombytes("L", (width // 8, height // 8), rng.randbytes((width // 8) * (height // 8)))
+    noise = noise.resize(size, Image.BILINEAR).point(lambda value: 225 + value // 10)
+    image = Image.merge("RGB", (noise, noise, noise.point(lambda value: value - 12))) if color else noise
+    draw = ImageDraw.Draw(image)
+    ink = (30, 30, 90) if color else 35
+    for line in range(rng.randint(25, 40)):
+        top = 140 + line * 36
+        if top > height - 120:
+            break
+        left = 110 + rng.randint(0, 40)
+        right = width - 110 - rng.randint(0, 300)
+        # Palabras como bloques de largo variable
+        x = left
+        while x < right:
+            word = rng.randint(20, 110)
+            draw.rectangle((x, top, min(x + word, right), top + 14), fill=ink)
+            x += word + rng.randint(10, 18)
+    if color:
+        center = (rng.randint(200, width - 200), rng.randint(height - 400, height - 200))
+        draw.ellipse((center[0] - 90, center[1] - 90, center[0] + 90, center[1] + 90), outline=(40, 60, 200), width=8)
+    draw.text((width - 200, height - 80), f"Foja {index + 1}", fill=ink)
+    return image.filter(ImageFilter.SMOOTH).convert(mode)
+
+
+def jpeg_bytes(image, quality=85):
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def build_scan_pdf(path, pages, color=False, seed=0):
+    """PDF de solo imágenes, una por página, como un expediente escaneado."""
+    import fitz
+
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for index in range(pages):
+        page = doc.new_page(width=612, height=792)
+        page.insert_image(page.rect, stream=jpeg_bytes(scan_image(rng, index, color)))
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+
+
+def build_mixed_pdf(path, pages, seed=0):
+    """PDF que alterna páginas de texto (escritos) y páginas escaneadas en color."""
+    import fitz
+
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for index in range(pages):
+        page = doc.new_page(width=612, height=792)
+        if index % 2 == 0:
+            paragraphs = "\n\n".join(LOREM * rng.randint(2, 4) for _ in range(4))
+            page.insert_textbox(fitz.Rect(72, 72, 540, 720), paragraphs, fontsize=11, fontname="helv")
+            page.insert_text((500, 760), f"Foja {index + 1}", fontsize=9)
+        else:
+            page.insert_image(page.rect, stream=jpeg_bytes(scan_image(rng, index, color=True)))
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+
+
+def build_image_folder(directory, count, seed=0):
+    """Fotos y escaneos sueltos: JPEG en color y en grises, y algunos PNG. Devuelve las rutas."""
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for index in range(count):
+        image = scan_image(rng, index, color=index % 3 != 1)
+        if index % 5 == 4:
+            path = os.path.join(directory, f"imagen_{index:04d}.png")
+            image.save(path, "PNG")
+        else:
+            path = os.path.join(directory, f"imagen_{index:04d}.jpg")
+            image.save(path, "JPEG", quality=88)
+        paths.append(path)
+    return paths
+
+
+FIXTURES = {
+    "scan_gray": lambda path, pages: build_scan_pdf(path, pages, color=False, seed=1),
+    "scan_color": lambda path, pages: build_scan_pdf(path, pages, color=True, seed=2),
+    "mixed": lambda path, pages: build_mixed_pdf(path, pages, seed=3),
+}
+
+
+def ensure_fixture(directory, kind, pages):
+    """Genera el fixture si no existe todavía en directory; devuelve su ruta."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{kind}_{pages}.pdf")
+    if not os.path.exists(path):
+        partial = path + ".tmp"
+        FIXTURES[kind](partial, pages)
+        os.replace(partial, path)
+    return path
+
+
+def ensure_image_folder(directory, count):
+    folder = os.path.join(directory, f"imagenes_{count}")
+    if not os.path.isdir(folder) or len(os.listdir(folder)) < count:
+        return build_image_folder(folder, count, seed=4)
+    return sorted(os.path.join(folder, name) for name in os.listdir(folder))[:count]
@@ -0,0 +1,314 @@
+# benchmarks/run_suite.py
+"""Suite de mediciones reproducible: tiempos, rendimiento, memoria pico y tamaño de salida.
+
+Cada caso corre en un proceso nuevo (para medir su memoria pico sin arrastrar la de los
+anteriores) sobre fixtures sintéticos deterministas (ver fixtures.py). Funciona sin
+interfaz gráfica; la compresión necesita Ghostscript (`gs`) en el PATH.
+
+Uso:
+    python benchmarks/run_suite.py --profile quick -o resultados.json
+    python benchmarks/run_suite.py --profile default --compare base.json
+    python benchmarks/run_suite.py --cases compress_ebook --kinds scan_gray --pages 2000
+
+Con --compare se marcan como regresión los casos más lentos, con más memoria o con una
+salida más grande que la base por encima del umbral, y el proceso termina con código 1.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+# Páginas de cada fixture e imágenes para img2pdf según el perfil
+PROFILES = {
+    "quick": {"pages": 10, "images": 10, "repeat": 1},
+    "default": {"pages": 200, "images": 100, "repeat": 3},
+    "large": {"pages": 2000, "images": 500, "repeat": 1},
+}
+KINDS = ("scan_gray", "scan_color", "mixed")
+# Casos que se miden sobre cada tipo de fixture; img2pdf y shred usan entradas propias
+PDF_CASES = ("thumbnails", "preview", "analyze", "inspect", "remove_pages", "compress_screen", "compress_ebook", "compress_printer", "compress_native")
+OTHER_CASES = ("img2pdf", "shred")
+# Umbrales por defecto para --compare (fracción de aumento tolerada)
+TIME_THRESHOLD = 0.10
+RSS_THRESHOLD = 0.15
+SIZE_THRESHOLD = 0.02
+
+
+def peak_rss_bytes():
+    """Memoria residente pico del proceso actual, o None si no se puede medir."""
+    from telemetry import peak_rss_bytes as measure
+    return measure()
+
+
+def run_case(case, source, work_dir):
+    """Ejecuta un caso una vez en este proceso; devuelve (unidades procesadas, unidad, bytes de salida)."""
+    if case == "thumbnails":
+        from renderer import PageRasterizer, THUMBNAIL_SIZE
+        import fitz
+        with fitz.open(source) as doc:
+            count = len(doc)
+        rasterizer = PageRasterizer(source, THUMBNAIL_SIZE)
+        try:
+            rendered = sum(1 for _ in rasterizer.render(range(count)))
+        finally:
+            rasterizer.close()
+        return rendered, "páginas", None
+
+    if case == "preview":
+        # Lo que ve la vista previa a 576 ppp: los mosaicos de una ventana de 1000x800 en el centro de cada página
+        import fitz
+        from tiles import ZOOM_LEVELS, page_pixels, render_tile, tiles_in_view
+        zoom = ZOOM_LEVELS[-1]
+        tiles = 0
+        with fitz.open(source) as doc:
+            for page in doc:
+                width, height = page_pixels(page.rect.width, page.rect.height, zoom)
+                view = (max(0, width // 2 - 500), max(0, height // 2 - 400), 1000, 800)
+                for col, row in tiles_in_view(page.rect.width, page.rect.height, zoom, view):
+                    render_tile(page, zoom, col, row)
+                    tiles += 1
+        return tiles, "mosaicos", None
+
+    if case == "analyze":
+        # Comparable con "thumbnails": el análisis de páginas en blanco/duplicadas debe costar una fracción
+        from page_analysis import analyze_pdf
+        result = analyze_pdf(source)
+        return len(result.ink), "páginas", None
+
+    if case == "inspect":
+        from pdf_inspector import page_size_index
+        index = page_size_index(source)
+        return len(index.pages), "páginas", None
+
+    if case == "remove_pages":
+        import fitz
+        from pdf_utils import remove_selected_pages
+        with fitz.open(source) as doc:
+            count = len(doc)
+        output = os.path.join(work_dir, "sin_paginas.pdf")
+        # Una de cada diez páginas, siempre las mismas
+        remove_selected_pages(source, output, list(range(0, count, 10)), save_mode="compact")
+        return count, "páginas", os.path.getsize(output)
+
+    if case.startswith("compress_"):
+        import fitz
+        from compressor import compress_pdf, compress_with_engine
+        with fitz.open(source) as doc:
+            count = len(doc)
+        output = os.path.join(work_dir, f"{case}.pdf")
+        if case == "compress_native":
+            success, message = compress_with_engine(source, output, "ebook", "native")
+        else:
+            success, message = compress_pdf(source, output, case.split("_", 1)[1])
+        if not success:
+            raise RuntimeError(message)
+        return count, "páginas", os.path.getsize(output)
+
+    if case == "img2pdf":
+        from pdf_builder import images_to_pdf
+        images = json.loads(source)
+        output = os.path.join(work_dir, "imagenes.pdf")
+        images_to_pdf(images, output, page_size="a4")
+        return len(images), "imágenes", os.path.getsize(output)
+
+    if case == "shred":
+        from file_utils import secure_delete_file
+        target = os.path.join(work_dir, "a_borrar.pdf")
+        shutil.copyfile(source, target)
+        size = os.path.getsize(target)
+        secure_delete_file(target, passes=1, pattern="zeros")
+        return size / (1024 * 1024), "MB", None
+
+    raise ValueError(f"Caso desconocido: {case}")
+
+
+def child_main(args):
+    """Modo hijo: mide un caso y escribe el resultado como JSON en args.result.
+
+    No se usa stdout: PyMuPDF y Ghostscript pueden escribir avisos ahí y romper el JSON.
+    """
+    work_dir = tempfile.mkdtemp(prefix="legaldocs_bench_")
+    try:
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        units, unit, output_bytes = run_case(args.case, args.source, work_dir)
+        seconds = time.perf_counter() - start
+        cpu_seconds = time.process_time() - cpu_start
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    with open(args.result, "w", encoding="utf-8") as f:
+        json.dump({"seconds": seconds, "cpu_seconds": cpu_seconds, "units": units, "unit": unit,
+                   "output_bytes": output_bytes, "peak_rss": peak_rss_bytes()}, f)
+
+
+def measure(case, source, repeat):
+    """Corre el caso repeat veces en procesos nuevos; mediana de tiempo, máximo de memoria."""
+    runs = []
+    fd, result_path = tempfile.mkstemp(prefix="legaldocs_bench_", suffix=".json")
+    os.close(fd)
+    try:
+        for _ in range(repeat):
+            result = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", case, "--source", source,
+                                     "--result", result_path], capture_output=True, text=True, cwd=REPO_DIR)
+            if result.returncode != 0:
+                error = (result.stderr.strip().splitlines() or ["error desconocido"])[-1]
+                return {"error": error}
+            try:
+                with open(result_path, "r", encoding="utf-8") as f:
+                    runs.append(json.load(f))
+            except ValueError as e:
+                return {"error": f"resultado ilegible del proceso hijo: {e}"}
+    finally:
+        os.remove(result_path)
+    seconds = statistics.median(run["seconds"] for run in runs)
+    rss = [run["peak_rss"] for run in runs if run["peak_rss"] is not None]
+    return {
+        "seconds": round(seconds, 4),
+        "cpu_seconds": round(statistics.median(run["cpu_seconds"] for run in runs), 4),
+        "runs": [round(run["seconds"], 4) for run in runs],
+        "throughput": round(runs[0]["units"] / seconds, 3) if seconds else None,
+        "unit": f"{runs[0]['unit']}/s",
+        "peak_rss_mb": round(max(rss) / (1024 * 1024), 1) if rss else None,
+        "output_bytes": runs[0]["output_bytes"],
+    }
+
+
+def environment():
+    info = {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()}
+    try:
+        import fitz
+        info["pymupdf"] = fitz.VersionBind
+    except ImportError:
+        pass
+    try:
+        from compressor import probe_ghostscript
+        info["ghostscript"] = probe_ghostscript()
+    except Exception:
+        info["ghostscript"] = None
+    try:
+        info["commit"] = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                        cwd=REPO_DIR).stdout.strip() or None
+    except OSError:
+        info["commit"] = None
+    return info
+
+
+def compare(results, baseline, thresholds):
+    """Devuelve una lista de textos, uno por regresión encontrada respecto de baseline."""
+    regressions = []
+    for case_id, current in results.items():
+        previous = baseline.get("results", {}).get(case_id)
+        if not previous or "error" in previous:
+            continue
+        if "error" in current:
+            regressions.append(f"{case_id}: falló ({current['error']})")
+            continue
+        for key, label, threshold in (("seconds", "tiempo", thresholds["seconds"]),
+                                      ("peak_rss_mb", "memoria pico", thresholds["rss"]),
+                                      ("output_bytes", "tamaño de salida", thresholds["size"])):
+            old, new = previous.get(key), current.get(key)
+            if old and new and new > old * (1 + threshold):
+                regressions.append(f"{case_id}: {label} {old} -> {new} (+{(new / old - 1) * 100:.1f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", default="quick", choices=sorted(PROFILES))
+    parser.add_argument("--pages", type=int, help="Páginas por fixture (reemplaza las del perfil).")
+    parser.add_argument("--repeat", type=int, help="Repeticiones por caso (reemplaza las del perfil).")
+    parser.add_argument("--cases", nargs="+", choices=PDF_CASES + OTHER_CASES, help="Solo estos casos.")
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS), help="Tipos de fixture.")
+    parser.add_argument("--fixtures-dir", default=os.path.join(tempfile.gettempdir(), "legaldocs_fixtures"),
+                        help="Dónde se guardan los fixtures generados, para reutilizarlos entre corridas.")
+    parser.add_argument("-o", "--output", help="Archivo JSON de resultados (sirve como base para --compare).")
+    parser.add_argument("--compare", metavar="BASE.json", help="Compara contra resultados guardados.")
+    parser.add_argument("--time-threshold", type=float, default=TIME_THRESHOLD)
+    parser.add_argument("--rss-threshold", type=float, default=RSS_THRESHOLD)
+    parser.add_argument("--size-threshold", type=float, default=SIZE_THRESHOLD)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--source", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        args.case = args.child
+        child_main(args)
+        return 0
+
+    from fixtures import ensure_fixture, ensure_image_folder
+
+    profile = dict(PROFILES[args.profile])
+    if args.pages:
+        profile["pages"] = args.pages
+    if args.repeat:
+        profile["repeat"] = args.repeat
+    cases = args.cases or list(PDF_CASES + OTHER_CASES)
+    env = environment()
+    if env["ghostscript"] is None:
+        print("Aviso: Ghostscript no está disponible; se omiten los casos de compresión con Ghostscript.",
+              file=sys.stderr)
+
+    results = {}
+    for case in cases:
+        if case in PDF_CASES:
+            targets = [(f"{case}/{kind}", lambda kind=kind: ensure_fixture(args.fixtures_dir, kind, profile["pages"]))
+                       for kind in args.kinds]
+        elif case == "img2pdf":
+            targets = [(case, lambda: json.dumps(ensure_image_folder(args.fixtures_dir, profile["images"])))]
+        else:
+            targets = [(case, lambda: ensure_fixture(args.fixtures_dir, "scan_gray", profile["pages"]))]
+
+        for case_id, source in targets:
+            if case.startswith("compress_") and case != "compress_native" and env["ghostscript"] is None:
+                continue
+            print(f"{case_id} ...", file=sys.stderr, flush=True)
+            results[case_id] = measure(case, source(), profile["repeat"])
+
+    report = {"profile": args.profile, "pages": profile["pages"], "images": profile["images"],
+              "repeat": profile["repeat"], "environment": env,
+              "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"{'caso':<32} {'tiempo':>9} {'rendimiento':>20} {'RSS pico':>10} {'salida':>10}")
+    for case_id, result in results.items():
+        if "error" in result:
+            print(f"{case_id:<32} error: {result['error']}")
+            continue
+        output = f"{result['output_bytes'] / 1e6:.1f} MB" if result["output_bytes"] else "-"
+        rss = f"{result['peak_rss_mb']} MB" if result["peak_rss_mb"] is not None else "-"
+        print(f"{case_id:<32} {result['seconds']:8.2f}s {result['throughput']:>11} {result['unit']:<8} "
+              f"{rss:>10} {output:>10}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("pages") != profile["pages"]:
+            print(f"Aviso: la base se midió con {baseline.get('pages')} páginas y esta corrida con {profile['pages']}.",
+                  file=sys.stderr)
+        regressions = compare(results, baseline, {"seconds": args.time_threshold, "rss": args.rss_threshold,
+                                                  "size": args.size_threshold})
+        if regressions:
+            print("\nRegresiones respecto de la base:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nSin regresiones respecto de la base.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
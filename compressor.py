@@ -1,8 +1,14 @@
 # compressor.py
 import subprocess
 import os
+import re
 import sys
+import shutil
 import logging
+import threading
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from settings import get_setting
 
 def get_resource_path(relative_path: str) -> str:
     """Obtiene la ruta absoluta a un recurso en dev, onedir y onefile.
@@ -20,42 +26,249 @@ def get_resource_path(relative_path: str) -> str:
 
     return os.path.join(base_path, relative_path)
 
-def compress_pdf(input_pdf, output_pdf, quality):
+class GhostscriptError(Exception):
+    """Error informado por Ghostscript ejecutado dentro del proceso (ver gsapi.py)."""
+
+    def __init__(self, code, stderr):
+        super().__init__(f"Ghostscript terminó con código {code}: {stderr}")
+        self.code = code
+        self.stderr = stderr
+
+
+class CompressionCancelled(Exception):
+    """El usuario canceló la compresión."""
+
+
+CANCELLED_MESSAGE = "Compresión cancelada."
+
+
+class _LinkedCancel(threading.Event):
+    """Cancelación propia de un lote que además se activa cuando se activa la del llamador."""
+
+    def __init__(self, parent=None):
+        super().__init__()
+        self.parent = parent
+
+    def is_set(self):
+        return super().is_set() or (self.parent is not None and self.parent.is_set())
+
+    def wait(self, timeout=None):
+        if self.parent is None:
+            return super().wait(timeout)
+        remaining = timeout
+        while not self.is_set():
+            if remaining is not None and remaining <= 0:
+                return False
+            step = 0.05 if remaining is None else min(0.05, remaining)
+            super().wait(step)
+            if remaining is not None:
+                remaining -= step
+        return True
+
+# Sin -dQUIET Ghostscript informa "Processing pages 1 through N." y "Page N" al empezar cada página
+_RANGE_LINE = re.compile(r"Processing pages (\d+) through (\d+)")
+_PAGE_LINE = re.compile(r"^Page (\d+)", re.MULTILINE)
+
+
+class PageProgress:
+    """Convierte la salida de Ghostscript (en trozos arbitrarios) en llamadas progress(hechas, total).
+
+    total es la cantidad de páginas conocida de antemano (p. ej. con fitz); si es 0 se toma
+    del rango que anuncia Ghostscript.
+    """
+
+    def __init__(self, total, progress):
+        self.total = total
+        self.progress = progress
+        self.first = 1
+        self.pending = ""
+
+    def feed(self, text):
+        self.pending += text
+        lines, _, self.pending = self.pending.rpartition("\n")
+        match = _RANGE_LINE.search(lines)
+        if match:
+            self.first = int(match.group(1))
+            if not self.total:
+                self.total = int(match.group(2)) - self.first + 1
+        pages = _PAGE_LINE.findall(lines)
+        if pages and self.total:
+            # "Page N" se imprime al comenzar la página: las anteriores ya están listas
+            self.progress(min(int(pages[-1]) - self.first, self.total), self.total)
+
+    def finish(self):
+        if self.total:
+            self.progress(self.total, self.total)
+
+
+def count_pages(pdf_path):
+    """Cantidad de páginas según PyMuPDF, o 0 si no se puede abrir."""
+    try:
+        import fitz
+        with fitz.open(pdf_path) as doc:
+            return len(doc)
+    except Exception:
+        return 0
+
+
+def _run_streaming(command, on_output, cancel_event=None):
+    """Ejecuta Ghostscript leyendo stdout línea a línea; stderr se drena en un hilo aparte.
+
+    Si cancel_event se activa se termina el proceso y se lanza CompressionCancelled.
+    """
+    creationflags = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                               errors="replace", bufsize=1, creationflags=creationflags)
+    stderr_chunks = []
+    drain = threading.Thread(target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True)
+    drain.start()
+
+    def watch():
+        while not cancel_event.wait(0.1):
+            if process.poll() is not None:
+                return
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    if cancel_event is not None:
+        threading.Thread(target=watch, daemon=True).start()
+    for line in process.stdout:
+        on_output(line)
+    code = process.wait()
+    drain.join()
+    if cancel_event is not None and cancel_event.is_set():
+        raise CompressionCancelled()
+    if code != 0:
+        raise subprocess.CalledProcessError(code, command, stderr="".join(stderr_chunks))
+
+
+_ghostscript_path = None
+
+
+def find_ghostscript():
+    """Ruta al ejecutable de Ghostscript: el incluido en recursos o el del PATH (gswin64c/gs).
+
+    El resultado se guarda para no repetir la búsqueda; devuelve None si no hay ninguno.
+    """
+    global _ghostscript_path
+    if _ghostscript_path is None:
+        bundled = get_resource_path(os.path.join("recursos", "gswin64c.exe"))
+        if os.path.exists(bundled):
+            _ghostscript_path = bundled
+        else:
+            _ghostscript_path = next((path for path in map(shutil.which, ("gswin64c", "gswin32c", "gs")) if path), "")
+    return _ghostscript_path or None
+
+
+def use_gsapi():
+    """Decide si Ghostscript se ejecuta dentro del proceso (gsapi) o como subproceso.
+
+    ghostscript_backend = "gsapi" lo fuerza si la biblioteca existe; "auto" solo lo usa si
+    la biblioteca admite instancias concurrentes, porque serializar un lote en un único
+    intérprete sería más lento que varios subprocesos en paralelo.
+    """
+    backend = get_setting("ghostscript_backend")
+    if backend == "subprocess":
+        return False
+    import gsapi
+    if gsapi.load_library() is None:
+        return False
+    return backend == "gsapi" or gsapi.supports_concurrency()
+
+
+_ghostscript_version = None
+_probe_lock = threading.Lock()
+
+
+def probe_ghostscript():
+    """Comprueba Ghostscript una sola vez por proceso; devuelve la versión o None si no está disponible.
+
+    Con gsapi se consulta la versión de la biblioteca; si no, se ejecuta `gs --version`.
+    """
+    global _ghostscript_version
+    with _probe_lock:
+        if _ghostscript_version is None:
+            _ghostscript_version = ""
+            gs_path = find_ghostscript()
+            if use_gsapi():
+                import gsapi
+                _ghostscript_version = gsapi.library_version() or ""
+                logging.info(f"Ghostscript {_ghostscript_version} disponible como biblioteca (gsapi)")
+            elif gs_path is not None:
+                creationflags = 0
+                if sys.platform == "win32":
+                    creationflags = subprocess.CREATE_NO_WINDOW
+                try:
+                    result = subprocess.run([gs_path, "--version"], check=True, capture_output=True, text=True,
+                                            creationflags=creationflags)
+                    _ghostscript_version = result.stdout.strip()
+                    logging.info(f"Ghostscript {_ghostscript_version} disponible en {gs_path}")
+                except (OSError, subprocess.CalledProcessError) as e:
+                    logging.error(f"Ghostscript no responde ({gs_path}): {e}")
+    return _ghostscript_version or None
+
+
+def compress_pdf(input_pdf, output_pdf, quality, extra_args=None, progress=None, cancel_event=None):
     """
     Comprime un archivo PDF usando Ghostscript.
+
+    extra_args se agregan antes del archivo de entrada y permiten ajustar parámetros
+    del preset (p. ej. los de image_settings_args). Con progress(hechas, total) se lee la
+    salida de Ghostscript página por página; si cancel_event (threading.Event) se activa,
+    se detiene Ghostscript, se borra la salida parcial y se devuelve CANCELLED_MESSAGE.
     """
     try:
-        gs_path = get_resource_path(os.path.join("recursos", "gswin64c.exe"))
+        gs_path = find_ghostscript()
+        in_process = use_gsapi()
 
         if not os.path.exists(input_pdf):
             logging.error(f"El archivo de entrada no existe: {input_pdf}")
             return False, f"El archivo de entrada no existe: {input_pdf}"
 
         
-        if not os.path.exists(gs_path):
-            error_msg = f"No se encontró el ejecutable de Ghostscript en la ruta esperada: {gs_path}"
+        if gs_path is None and not in_process:
+            error_msg = f"No se encontró el ejecutable de Ghostscript en la ruta esperada ({get_resource_path(os.path.join('recursos', 'gswin64c.exe'))}) ni en el PATH"
             logging.error(error_msg)
             return False, error_msg
 
-        command = [
-            gs_path,
+        if cancel_event is not None and cancel_event.is_set():
+            raise CompressionCancelled()
+
+        page_progress = PageProgress(count_pages(input_pdf), progress) if progress is not None else None
+        args = [
             "-sDEVICE=pdfwrite",
             "-dCompatibilityLevel=1.4",
             f"-dPDFSETTINGS=/{quality}",
             "-dNOPAUSE",
-            "-dQUIET",
+            # Sin -dQUIET cuando hace falta el número de página en curso
+            *([] if page_progress is not None else ["-dQUIET"]),
             "-dBATCH",
             f"-sOutputFile={output_pdf}",
+            *(extra_args or []),
             f"{input_pdf}"
         ]
+        on_output = page_progress.feed if page_progress is not None else (lambda text: None)
 
-        
-        creationflags = 0
-        if sys.platform == "win32":
-            creationflags = subprocess.CREATE_NO_WINDOW
-        
-        
-        subprocess.run(command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, creationflags=creationflags)
+        if in_process:
+            import gsapi
+            gsapi.run(args, on_stdout=on_output if page_progress is not None else None,
+                      should_cancel=cancel_event.is_set if cancel_event is not None else None)
+            if cancel_event is not None and cancel_event.is_set():
+                raise CompressionCancelled()
+        elif page_progress is not None or cancel_event is not None:
+            _run_streaming([gs_path, *args], on_output, cancel_event)
+        else:
+            creationflags = 0
+            if sys.platform == "win32":
+                creationflags = subprocess.CREATE_NO_WINDOW
+            
+            
+            subprocess.run([gs_path, *args], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, creationflags=creationflags)
+        if page_progress is not None:
+            page_progress.finish()
         
         logging.info("PDF comprimido y guardado exitosamente.")
         return True, "PDF comprimido y guardado exitosamente."
@@ -64,7 +277,17 @@ def compress_pdf(input_pdf, output_pdf, quality):
         error_msg = "Error: El ejecutable de Ghostscript no se pudo encontrar."
         logging.error(error_msg)
         return False, error_msg
-    except subprocess.CalledProcessError as e:
+    except CompressionCancelled:
+        logging.info(f"Compresión cancelada: {input_pdf}")
+        if os.path.exists(output_pdf):
+            os.remove(output_pdf)
+        return False, CANCELLED_MESSAGE
+    except (subprocess.CalledProcessError, GhostscriptError) as e:
+        if cancel_event is not None and cancel_event.is_set():
+            # gsapi aborta con un código de error cuando el sondeo pide cancelar
+            if os.path.exists(output_pdf):
+                os.remove(output_pdf)
+            return False, CANCELLED_MESSAGE
         error_msg = f"Error en el proceso de Ghostscript. Detalles: {e.stderr}"
         logging.error(error_msg)
         if os.path.exists(output_pdf):
@@ -76,3 +299,302 @@ def compress_pdf(input_pdf, output_pdf, quality):
         if os.path.exists(output_pdf):
             os.remove(output_pdf)
         return False, error_msg
+
+
+def compression_backend_name(engine="ghostscript"):
+    """Cómo se ejecuta la compresión, para la telemetría: "native", "gsapi" o "subprocess"."""
+    if engine == "native":
+        return "native"
+    return "gsapi" if use_gsapi() else "subprocess"
+
+
+def default_compression_workers():
+    """Ghostscript usa un solo núcleo por proceso: un proceso por núcleo."""
+    return max(1, os.cpu_count() or 1)
+
+
+def compress_with_engine(input_pdf, output_pdf, quality, engine="ghostscript", progress=None, cancel_event=None):
+    """Comprime con Ghostscript o con el motor nativo (PyMuPDF + Pillow) según engine.
+
+    cancel_event solo se aplica a Ghostscript (ver compress_pdf); con el motor nativo
+    progress cuenta imágenes recodificadas en lugar de páginas.
+    """
+    if engine == "native":
+        if cancel_event is not None and cancel_event.is_set():
+            return False, CANCELLED_MESSAGE
+        from native_compressor import compress_pdf_native
+        return compress_pdf_native(input_pdf, output_pdf, quality, progress=progress)
+    return compress_pdf(input_pdf, output_pdf, quality, progress=progress, cancel_event=cancel_event)
+
+
+def compress_batch(jobs, quality, max_workers=None, on_start=None, target_bytes=None, engine="ghostscript",
+                   on_progress=None, cancel_event=None):
+    """Comprime varios archivos con un máximo de max_workers procesos de Ghostscript a la vez.
+
+    jobs es una lista de (entrada, salida). Genera (indice, exito, mensaje) a medida
+    que cada archivo termina. on_start(indice) se llama desde el hilo que lo procesa.
+    Con target_bytes cada archivo se comprime con compress_to_target y quality se ignora;
+    si no, se usa el motor indicado por engine. on_progress(indice, hechas, total) informa
+    las páginas procesadas de cada archivo; con cancel_event activo los archivos que aún no
+    empezaron terminan con CANCELLED_MESSAGE. Si el llamador deja de iterar antes de tiempo
+    (p. ej. al fallar una parte de compress_pdf_sharded), lo pendiente se cancela y lo que
+    está en curso se interrumpe antes de volver.
+    """
+    stop = _LinkedCancel(cancel_event)
+
+    def run_job(index):
+        if stop.is_set():
+            return False, CANCELLED_MESSAGE
+        if on_start is not None:
+            on_start(index)
+        input_pdf, output_pdf = jobs[index]
+        if target_bytes:
+            return compress_to_target(input_pdf, output_pdf, target_bytes, cancel_event=stop)
+        progress = None
+        if on_progress is not None:
+            progress = lambda done, total: on_progress(index, done, total)
+        return compress_with_engine(input_pdf, output_pdf, quality, engine, progress, stop)
+
+    with ThreadPoolExecutor(max_workers=max_workers or default_compression_workers()) as executor:
+        futures = {executor.submit(run_job, index): index for index in range(len(jobs))}
+        finished = 0
+        try:
+            for future in as_completed(futures):
+                success, message = future.result()
+                finished += 1
+                yield futures[future], success, message
+        finally:
+            # Sin esto, salir del with esperaría a que terminen todos los archivos restantes
+            if finished < len(futures):
+                stop.set()
+                for future in futures:
+                    future.cancel()
+
+
+# Por debajo de esta cantidad de páginas dividir el archivo no compensa el costo de partir y unir
+SHARD_MIN_PAGES = 200
+# Páginas mínimas por parte, para que el arranque de cada Ghostscript se amortice
+SHARD_MIN_SIZE = 50
+
+
+def _restore_cross_shard_links(original, merged, shard_size):
+    """Copia al documento unido los vínculos internos que apuntan a una página de otro rango."""
+    import fitz
+
+    for page in original:
+        for link in page.get_links():
+            if link["kind"] != fitz.LINK_GOTO or link.get("page", -1) < 0:
+                continue
+            if link["page"] // shard_size != page.number // shard_size:
+                merged[page.number].insert_link(link)
+
+
+def compress_pdf_sharded(input_pdf, output_pdf, quality, max_workers=None, min_pages=SHARD_MIN_PAGES,
+                         progress=None, cancel_event=None):
+    """Comprime un PDF grande dividiéndolo en rangos de páginas procesados en paralelo.
+
+    Cada rango se comprime en su propio proceso de Ghostscript y luego los resultados
+    se unen con PyMuPDF, conservando marcadores y metadatos del original. Los vínculos a
+    páginas de otro rango se pierden al partir el documento y se vuelven a crear después
+    de unir. Los recursos compartidos entre rangos (p. ej. fuentes) quedan duplicados una
+    vez por rango. Con pocas páginas o un solo núcleo se usa compress_pdf directamente.
+    progress recibe las páginas terminadas sumando todas las partes. Si una parte falla,
+    las demás se cancelan.
+    """
+    import fitz
+
+    workers = max_workers or default_compression_workers()
+    try:
+        doc = fitz.open(input_pdf)
+    except Exception as e:
+        error_msg = f"No se pudo abrir el PDF para dividirlo: {e}"
+        logging.error(error_msg)
+        return False, error_msg
+
+    page_count = len(doc)
+    if page_count < min_pages or workers < 2:
+        doc.close()
+        return compress_pdf(input_pdf, output_pdf, quality, progress=progress, cancel_event=cancel_event)
+
+    shard_count = max(1, min(workers, page_count // SHARD_MIN_SIZE))
+    shard_size = -(-page_count // shard_count)
+    work_dir = tempfile.mkdtemp(prefix="legaldocs_shards_")
+    try:
+        jobs = []
+        for shard, first in enumerate(range(0, page_count, shard_size)):
+            last = min(first + shard_size, page_count) - 1
+            shard_path = os.path.join(work_dir, f"parte_{shard:03d}.pdf")
+            part = fitz.open()
+            part.insert_pdf(doc, from_page=first, to_page=last)
+            part.save(shard_path)
+            part.close()
+            jobs.append((shard_path, os.path.join(work_dir, f"parte_{shard:03d}_comprimida.pdf")))
+
+        shard_done = [0] * len(jobs)
+        lock = threading.Lock()
+
+        def shard_progress(index, done, total):
+            with lock:
+                shard_done[index] = done
+                pages = sum(shard_done)
+            progress(pages, page_count)
+
+        batch = compress_batch(jobs, quality, workers, on_progress=shard_progress if progress is not None else None,
+                               cancel_event=cancel_event)
+        try:
+            for index, success, message in batch:
+                if not success:
+                    return False, message
+        finally:
+            # Cancela e interrumpe las otras partes antes de borrar work_dir
+            batch.close()
+
+        merged = fitz.open()
+        for _, compressed_path in jobs:
+            with fitz.open(compressed_path) as part:
+                merged.insert_pdf(part)
+        _restore_cross_shard_links(doc, merged, shard_size)
+        merged.set_toc(doc.get_toc(simple=False))
+        merged.set_metadata(doc.metadata)
+        merged.save(output_pdf, garbage=3, deflate=True)
+        merged.close()
+
+        logging.info(f"PDF comprimido en {len(jobs)} partes y guardado exitosamente.")
+        return True, "PDF comprimido y guardado exitosamente."
+    except Exception as e:
+        error_msg = f"Ocurrió un error inesperado al comprimir el PDF por partes: {e}"
+        logging.error(error_msg)
+        if os.path.exists(output_pdf):
+            os.remove(output_pdf)
+        return False, error_msg
+    finally:
+        doc.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+# Escalones de calidad para el modo por tamaño objetivo, de mayor a menor calidad:
+# (resolución de imágenes en dpi, QFactor JPEG; valores más altos de QFactor comprimen más)
+TARGET_SIZE_LEVELS = [
+    (300, 0.15),
+    (200, 0.25),
+    (150, 0.4),
+    (150, 0.76),
+    (120, 0.76),
+    (96, 1.0),
+    (72, 1.3),
+    (60, 2.0),
+]
+# Páginas muestreadas para estimar el tamaño de cada escalón sin comprimir el archivo entero
+TARGET_SAMPLE_PAGES = 12
+# Margen sobre la estimación: la muestra no refleja del todo los recursos compartidos
+TARGET_SAFETY = 0.92
+TARGET_MAX_PASSES = 3
+
+
+def image_settings_args(resolution, qfactor):
+    """Argumentos de Ghostscript que fijan la resolución de las imágenes y la calidad JPEG."""
+    args = []
+    for kind in ("Color", "Gray"):
+        args += [
+            f"-dDownsample{kind}Images=true",
+            f"-d{kind}ImageDownsampleType=/Bicubic",
+            f"-d{kind}ImageResolution={resolution}",
+            f"-d{kind}ImageDownsampleThreshold=1.0",
+            f"-dAutoFilter{kind}Images=false",
+            f"-d{kind}ImageFilter=/DCTEncode",
+        ]
+    # Las imágenes bitonales (texto escaneado) no usan JPEG: se mantienen a mayor resolución
+    args += ["-dDownsampleMonoImages=true", f"-dMonoImageResolution={max(resolution * 2, 300)}"]
+    dct = f"<< /QFactor {qfactor} /Blend 1 /HSamples [2 1 1 2] /VSamples [2 1 1 2] >>"
+    args += ["-c", f"<< /ColorImageDict {dct} /GrayImageDict {dct} >> setdistillerparams", "-f"]
+    return args
+
+
+def _build_sample(doc, sample_path):
+    """Guarda en sample_path un PDF con páginas repartidas uniformemente; devuelve cuántas tiene."""
+    import fitz
+
+    step = max(1, len(doc) // TARGET_SAMPLE_PAGES)
+    sample = fitz.open()
+    pages = list(range(0, len(doc), step))[:TARGET_SAMPLE_PAGES]
+    for page in pages:
+        sample.insert_pdf(doc, from_page=page, to_page=page)
+    sample.save(sample_path, garbage=3, deflate=True)
+    sample.close()
+    return len(pages)
+
+
+def compress_to_target(input_pdf, output_pdf, target_bytes, progress=None, cancel_event=None):
+    """Busca la mayor calidad cuyo resultado entra en target_bytes.
+
+    Primero estima el tamaño final de cada escalón comprimiendo una muestra de páginas,
+    luego hace como máximo TARGET_MAX_PASSES pasadas completas, bajando de escalón según
+    el error observado. Si ningún escalón alcanza el objetivo se conserva el más chico.
+    """
+    import fitz
+
+    def report(value):
+        if progress is not None:
+            progress(value)
+
+    if os.path.getsize(input_pdf) <= target_bytes:
+        shutil.copyfile(input_pdf, output_pdf)
+        return True, "El archivo ya cumple con el tamaño objetivo; se guardó sin cambios."
+
+    work_dir = tempfile.mkdtemp(prefix="legaldocs_target_")
+    try:
+        with fitz.open(input_pdf) as doc:
+            page_count = len(doc)
+            sample_path = os.path.join(work_dir, "muestra.pdf")
+            sample_pages = _build_sample(doc, sample_path)
+
+        # Estimación por página a partir de la muestra, para todos los escalones
+        estimates = []
+        for i, level in enumerate(TARGET_SIZE_LEVELS):
+            sample_out = os.path.join(work_dir, f"muestra_{i}.pdf")
+            success, message = compress_pdf(sample_path, sample_out, "printer", image_settings_args(*level),
+                                            cancel_event=cancel_event)
+            if not success:
+                return False, message
+            estimates.append(os.path.getsize(sample_out) / sample_pages * page_count)
+            report(int((i + 1) / len(TARGET_SIZE_LEVELS) * 30))
+            if estimates[-1] <= target_bytes * TARGET_SAFETY:
+                break
+
+        level = next((i for i, size in enumerate(estimates) if size <= target_bytes * TARGET_SAFETY),
+                     len(estimates) - 1)
+        best = None
+        for attempt in range(TARGET_MAX_PASSES):
+            candidate = os.path.join(work_dir, f"pasada_{attempt}.pdf")
+            success, message = compress_pdf(input_pdf, candidate, "printer", image_settings_args(*TARGET_SIZE_LEVELS[level]),
+                                            cancel_event=cancel_event)
+            if not success:
+                return False, message
+            size = os.path.getsize(candidate)
+            report(30 + int((attempt + 1) / TARGET_MAX_PASSES * 70))
+            logging.info(f"Tamaño objetivo: pasada {attempt + 1} con {TARGET_SIZE_LEVELS[level]} -> {size} bytes")
+            if best is None or size < best[1]:
+                best = (candidate, size)
+            if size <= target_bytes or level == len(TARGET_SIZE_LEVELS) - 1:
+                break
+            # Corrige la estimación con el error medido y salta al escalón que debería entrar
+            correction = size / estimates[level] if level < len(estimates) else size / target_bytes
+            level = next((i for i in range(level + 1, len(TARGET_SIZE_LEVELS))
+                          if i >= len(estimates) or estimates[i] * correction <= target_bytes * TARGET_SAFETY),
+                         len(TARGET_SIZE_LEVELS) - 1)
+
+        candidate, size = best
+        shutil.move(candidate, output_pdf)
+        if size <= target_bytes:
+            message = f"PDF comprimido a {size / (1024 * 1024):.2f} MB (objetivo {target_bytes / (1024 * 1024):.2f} MB)."
+        else:
+            message = (f"No se alcanzó el tamaño objetivo; el resultado más chico pesa "
+                       f"{size / (1024 * 1024):.2f} MB y se guardó igualmente.")
+        logging.info(message)
+        return True, message
+    except Exception as e:
+        error_msg = f"Ocurrió un error inesperado al comprimir al tamaño objetivo: {e}"
+        logging.error(error_msg)
+        return False, error_msg
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,332 @@
+# converters.py
+"""Pool de conversores de documentos a PDF que se mantienen abiertos entre trabajos.
+
+Abrir Word cuesta segundos; convertir un escrito ya abierto, mucho menos. Cada hilo del
+pool es dueño de una instancia de un backend (Word por COM, LibreOffice sin interfaz o
+uno falso para pruebas) y la reutiliza, reciclándola cada N documentos o si se cae.
+"""
+import os
+import sys
+import queue
+import shutil
+import logging
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import Future
+
+from settings import get_setting
+from telemetry import operation
+
+
+class ConversionError(Exception):
+    """El documento no se pudo convertir (el backend sigue utilizable)."""
+
+
+class ConverterBackend:
+    """Interfaz de un conversor. Una instancia se usa siempre desde el mismo hilo."""
+    name = "base"
+
+    def thread_init(self):
+        """Preparación del hilo dueño (p. ej. CoInitialize); se llama una sola vez."""
+
+    def thread_exit(self):
+        """Limpieza del hilo dueño al cerrar el pool."""
+
+    def start(self):
+        """Arranca la aplicación de conversión."""
+
+    def convert(self, src, dst):
+        raise NotImplementedError
+
+    def is_alive(self):
+        return True
+
+    def close(self):
+        """Cierra la aplicación; no debe lanzar excepciones."""
+
+
+class WordBackend(ConverterBackend):
+    """Microsoft Word por COM (solo Windows)."""
+    name = "word"
+
+    def __init__(self):
+        self.word = None
+        self.pythoncom = None
+
+    def thread_init(self):
+        import pythoncom
+        self.pythoncom = pythoncom
+        pythoncom.CoInitialize()
+
+    def thread_exit(self):
+        try:
+            self.pythoncom.CoUninitialize()
+        except Exception:
+            pass
+
+    def start(self):
+        import win32com.client
+        self.word = win32com.client.DispatchEx('Word.Application')
+        self.word.Visible = False
+        try:
+            self.word.DisplayAlerts = 0
+        except Exception:
+            pass
+
+    def convert(self, src, dst):
+        doc = self.word.Documents.Open(src, ReadOnly=True, AddToRecentFiles=False)
+        try:
+            doc.ExportAsFixedFormat(OutputFileName=dst, ExportFormat=17)
+        finally:
+            try:
+                doc.Close(False)
+            except Exception:
+                pass
+
+    def is_alive(self):
+        try:
+            self.word.Documents.Count
+            return True
+        except Exception:
+            return False
+
+    def close(self):
+        try:
+            if self.word is not None:
+                self.word.Quit()
+        except Exception:
+            pass
+        self.word = None
+
+
+def find_libreoffice():
+    """Ruta de soffice/libreoffice, o None si no está instalado."""
+    candidates = ["soffice", "libreoffice"]
+    if sys.platform == "win32":
+        candidates.insert(0, os.path.join(os.environ.get("PROGRAMFILES", r"C:\Program Files"),
+                                          "LibreOffice", "program", "soffice.exe"))
+    for candidate in candidates:
+        path = candidate if os.path.isfile(candidate) else shutil.which(candidate)
+        if path:
+            return path
+    return None
+
+
+class LibreOfficeBackend(ConverterBackend):
+    """LibreOffice sin interfaz.
+
+    Cada instancia usa su propio perfil, que se crea una vez y se reutiliza: así el arranque
+    posterior es más rápido y varias instancias pueden convertir a la vez sin bloquearse.
+    """
+    name = "libreoffice"
+    TIMEOUT = 300
+
+    def __init__(self, soffice_path=None):
+        self.soffice_path = soffice_path or find_libreoffice()
+        self.workdir = None
+
+    def start(self):
+        if not self.soffice_path:
+            raise ConversionError("LibreOffice no está instalado.")
+        self.workdir = tempfile.mkdtemp(prefix="legaldocs_lo_")
+
+    def convert(self, src, dst):
+        outdir = os.path.join(self.workdir, "out")
+        os.makedirs(outdir, exist_ok=True)
+        profile = "file:///" + os.path.join(self.workdir, "profile").replace("\\", "/").lstrip("/")
+        result = subprocess.run(
+            [self.soffice_path, f"-env:UserInstallation={profile}", "--headless", "--norestore",
+             "--convert-to", "pdf", "--outdir", outdir, src],
+            capture_output=True, text=True, timeout=self.TIMEOUT,
+            creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0,
+        )
+        produced = os.path.join(outdir, os.path.splitext(os.path.basename(src))[0] + ".pdf")
+        if not os.path.exists(produced):
+            raise ConversionError(result.stderr.strip() or "LibreOffice no generó el PDF.")
+        shutil.move(produced, dst)
+
+    def close(self):
+        if self.workdir:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+        self.workdir = None
+
+
+class FakeBackend(ConverterBackend):
+    """Backend de prueba: simula arranque y conversión y puede caerse cada N documentos."""
+    name = "fake"
+
+    def __init__(self, startup_delay=0.0, convert_delay=0.0, crash_every=0):
+        self.startup_delay = startup_delay
+        self.convert_delay = convert_delay
+        self.crash_every = crash_every
+        self.converted = 0
+        self.alive = False
+        self.starts = 0
+
+    def start(self):
+        threading.Event().wait(self.startup_delay)
+        self.alive = True
+        self.converted = 0
+        self.starts += 1
+
+    def convert(self, src, dst):
+        if not self.alive:
+            raise RuntimeError("El conversor falso no está en ejecución.")
+        threading.Event().wait(self.convert_delay)
+        self.converted += 1
+        if self.crash_every and self.converted % self.crash_every == 0:
+            self.alive = False
+            raise RuntimeError("Caída simulada del conversor.")
+        with open(dst, "wb") as f:
+            f.write(b"%PDF-1.4\n% " + os.path.basename(src).encode("utf-8", "replace") + b"\n%%EOF\n")
+
+    def is_alive(self):
+        return self.alive
+
+    def close(self):
+        self.alive = False
+
+
+BACKENDS = {"word": WordBackend, "libreoffice": LibreOfficeBackend, "fake": FakeBackend}
+
+
+def default_backend_name():
+    """Backend según la configuración; "auto" elige Word en Windows y LibreOffice en el resto."""
+    name = get_setting("converter_backend")
+    if name == "auto":
+        name = "word" if sys.platform == "win32" else "libreoffice"
+    return name
+
+
+class ConverterPool:
+    """Hilos con un conversor abierto cada uno que atienden una cola común de archivos.
+
+    backend_factory crea una instancia nueva del backend; recycle_after es la cantidad de
+    documentos tras la cual se reinicia (0 = nunca). Si un backend se cae durante una
+    conversión, se reinicia y el documento se reintenta una vez.
+    """
+
+    def __init__(self, backend_factory, size=1, recycle_after=0):
+        self.backend_factory = backend_factory
+        self.size = max(1, size)
+        self.recycle_after = recycle_after
+        self.jobs = queue.Queue()
+        self.threads = []
+        self.lock = threading.Lock()
+        self.closed = False
+        self.restarts = 0
+
+    def submit(self, src, dst):
+        """Encola una conversión; devuelve un Future con la ruta del PDF."""
+        future = Future()
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("El pool de conversión está cerrado.")
+            self.jobs.put((os.path.abspath(src), os.path.abspath(dst), future))
+            # Los hilos (y sus conversores) se crean a medida que llega trabajo, hasta `size`
+            if len(self.threads) < self.size:
+                thread = threading.Thread(target=self._serve, name=f"converter-{len(self.threads)}", daemon=True)
+                self.threads.append(thread)
+                thread.start()
+        return future
+
+    def convert_many(self, pairs):
+        """Encola varias conversiones [(origen, destino)] y devuelve sus Futures en el mismo orden."""
+        return [self.submit(src, dst) for src, dst in pairs]
+
+    def _serve(self):
+        backend = self.backend_factory()
+        backend.thread_init()
+        started = False
+        done = 0
+        try:
+            while True:
+                job = self.jobs.get()
+                if job is None:
+                    break
+                src, dst, future = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                input_bytes = os.path.getsize(src) if os.path.exists(src) else None
+                with operation("convert", backend=backend.name, input_bytes=input_bytes, cold_start=False) as record:
+                    try:
+                        if not started or (self.recycle_after and done >= self.recycle_after):
+                            if started:
+                                backend.close()
+                            backend.start()
+                            started, done = True, 0
+                            record["cold_start"] = True
+                        os.makedirs(os.path.dirname(dst), exist_ok=True)
+                        try:
+                            backend.convert(src, dst)
+                        except ConversionError:
+                            raise
+                        except Exception as e:
+                            if backend.is_alive():
+                                raise
+                            logging.warning(f"El conversor {backend.name} se cayó con {src} ({e}); se reinicia.")
+                            with self.lock:
+                                self.restarts += 1
+                            backend.close()
+                            backend.start()
+                            done = 0
+                            record["restarted"] = True
+                            backend.convert(src, dst)
+                        done += 1
+                        record["output_bytes"] = os.path.getsize(dst) if os.path.exists(dst) else None
+                        future.set_result(dst)
+                    except Exception as e:
+                        logging.error(f"Error al convertir {src} con {backend.name}: {e}")
+                        record["ok"], record["error"] = False, str(e)
+                        future.set_exception(e)
+        finally:
+            backend.close()
+            backend.thread_exit()
+
+    def shutdown(self, wait=True):
+        """Cancela los trabajos que siguen en cola y cierra las instancias.
+
+        Las conversiones en curso terminan; las encoladas quedan canceladas para que cerrar
+        la aplicación no espere a que se convierta todo lo pendiente.
+        """
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            threads = list(self.threads)
+        while True:
+            try:
+                job = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                job[2].cancel()
+        for _ in threads:
+            self.jobs.put(None)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_converter_pool():
+    """Pool compartido por la aplicación, creado con la configuración la primera vez."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            backend_class = BACKENDS[default_backend_name()]
+            _pool = ConverterPool(backend_class, size=get_setting("converter_workers"),
+                                  recycle_after=get_setting("converter_recycle_after"))
+        return _pool
+
+
+def shutdown_converter_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
@@ -1,29 +1,100 @@
 # file_utils.py
 import os
-from docx2pdf import convert
-from PIL import Image
+import uuid
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-def secure_delete_file(file_path):
-    """Sobrescribe un archivo con ceros antes de eliminarlo."""
+from telemetry import operation
+
+# Tamaño del buffer reutilizado al sobrescribir: la memoria no depende del tamaño del archivo
+SHRED_CHUNK = 1024 * 1024
+# Patrón por pasada (se repite cíclicamente); None significa datos aleatorios
+SHRED_PATTERNS = {
+    "zeros": [b"\0"],
+    "random": [None],
+    "dod": [b"\0", b"\xff", None],
+}
+
+
+def secure_delete_file(file_path, passes=1, pattern="zeros", progress=None):
+    """Sobrescribe un archivo por bloques (con fsync tras cada pasada) antes de eliminarlo.
+
+    progress(fraccion) se llama a medida que avanza la escritura.
+    """
     if os.path.exists(file_path):
-        try:
-            with open(file_path, "wb") as f:
-                f.seek(0)
-                f.write(b'\0' * os.path.getsize(file_path))
-            os.remove(file_path)
-        except Exception:
-           
-            os.remove(file_path)
-
-def image_to_pdf(image_path, output_pdf_path):
+        with operation("shred", passes=passes, pattern=pattern, input_bytes=os.path.getsize(file_path)):
+            try:
+                size = os.path.getsize(file_path)
+                fills = SHRED_PATTERNS[pattern]
+                total = max(1, size * passes)
+                done = 0
+                buffer = bytearray(SHRED_CHUNK)
+                view = memoryview(buffer)
+                # r+b no trunca el archivo: se sobrescriben los mismos bloques del disco
+                with open(file_path, "r+b", buffering=0) as f:
+                    for current in range(passes):
+                        fill = fills[current % len(fills)]
+                        if fill is not None:
+                            buffer[:] = fill * SHRED_CHUNK
+                        f.seek(0)
+                        written = 0
+                        while written < size:
+                            length = min(SHRED_CHUNK, size - written)
+                            if fill is None:
+                                view[:length] = os.urandom(length)
+                            written += f.write(view[:length])
+                            done += length
+                            if progress is not None:
+                                progress(done / total)
+                        os.fsync(f.fileno())
+                # También se oculta el nombre original antes de borrar la entrada del directorio
+                hidden_path = os.path.join(os.path.dirname(file_path), uuid.uuid4().hex)
+                os.replace(file_path, hidden_path)
+                os.remove(hidden_path)
+            except Exception as e:
+                logging.warning(f"No se pudo sobrescribir {file_path} antes de eliminarlo: {e}")
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+                # El archivo se borró igual, pero quien llama debe saber que no fue de forma segura
+                raise
+
+
+def shred_files(paths, passes=1, pattern="zeros", max_workers=2, progress=None):
+    """Elimina varios archivos de forma segura con a lo sumo max_workers escrituras simultáneas.
+
+    Genera (ruta, exito, error) a medida que terminan. progress(fraccion) informa el avance
+    global ponderado por tamaño.
+    """
+    sizes = {path: max(1, os.path.getsize(path)) if os.path.exists(path) else 1 for path in paths}
+    total = sum(sizes.values())
+    fractions = dict.fromkeys(paths, 0.0)
+    lock = threading.Lock()
+
+    def shred(path):
+        def report(fraction):
+            with lock:
+                fractions[path] = fraction
+                overall = sum(sizes[p] * f for p, f in fractions.items()) / total
+            if progress is not None:
+                progress(overall)
+        secure_delete_file(path, passes, pattern, report)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(shred, path): path for path in paths}
+        for future in as_completed(futures):
+            error = future.exception()
+            yield futures[future], error is None, str(error) if error else ""
+
+def image_to_pdf(image_path, output_pdf_path, page_size="image", dpi=100, auto_orient=True):
     """Convierte un archivo de imagen (JPG, PNG) a PDF."""
-    image = Image.open(image_path)
-    if image.mode != "RGB":
-        image = image.convert("RGB")
-    image.save(output_pdf_path, "PDF", resolution=100.0)
+    from pdf_builder import images_to_pdf
+    images_to_pdf([image_path], output_pdf_path, page_size=page_size, dpi=dpi, auto_orient=auto_orient, max_workers=1)
 
 def word_to_pdf(word_path, output_pdf_path):
     """Convierte un archivo de Word (DOCX) a PDF."""
+    # docx2pdf arrastra la automatización COM de Word: solo se importa si se usa
+    from docx2pdf import convert
     try:
         convert(word_path, output_pdf_path)
         return True
@@ -0,0 +1,199 @@
+# gsapi.py
+"""Ejecuta Ghostscript dentro del proceso a través de su biblioteca compartida (gsapi).
+
+Evita crear un proceso nuevo por cada compresión. La biblioteca se busca y carga una
+sola vez; si no está disponible, compressor.py sigue usando el ejecutable.
+"""
+import os
+import sys
+import ctypes
+import ctypes.util
+import logging
+import threading
+from compressor import get_resource_path, GhostscriptError
+
+GS_ARG_ENCODING_UTF8 = 1
+# gsapi_init_with_args devuelve gs_error_Quit cuando el intérprete termina por -dBATCH
+GS_ERROR_QUIT = -101
+
+if sys.platform == "win32":
+    LIBRARY_NAMES = ["gsdll64.dll", "gsdll32.dll"]
+    _loader, _callback_type = ctypes.WinDLL, ctypes.WINFUNCTYPE
+elif sys.platform == "darwin":
+    LIBRARY_NAMES = ["libgs.dylib", "libgs.10.dylib", "libgs.9.dylib"]
+    _loader, _callback_type = ctypes.CDLL, ctypes.CFUNCTYPE
+else:
+    LIBRARY_NAMES = ["libgs.so", "libgs.so.10", "libgs.so.9"]
+    _loader, _callback_type = ctypes.CDLL, ctypes.CFUNCTYPE
+
+# int (*)(void *caller_handle, char *buf, int len)
+_STDIO_CALLBACK = _callback_type(ctypes.c_int, ctypes.c_void_p, ctypes.POINTER(ctypes.c_char), ctypes.c_int)
+# int (*)(void *caller_handle); un valor negativo aborta la ejecución
+_POLL_CALLBACK = _callback_type(ctypes.c_int, ctypes.c_void_p)
+
+
+class _Revision(ctypes.Structure):
+    _fields_ = [("product", ctypes.c_char_p), ("copyright", ctypes.c_char_p),
+                ("revision", ctypes.c_long), ("revisiondate", ctypes.c_long)]
+
+
+# Salida capturada por hilo: Ghostscript invoca los callbacks desde el hilo que lo ejecuta
+_output = threading.local()
+
+
+def _stdin(handle, buf, length):
+    return 0
+
+
+def _stdout(handle, buf, length):
+    data = ctypes.string_at(buf, length)
+    _output.stdout.append(data)
+    if _output.on_stdout is not None:
+        _output.on_stdout(data.decode("utf-8", "replace"))
+    return length
+
+
+def _stderr(handle, buf, length):
+    _output.stderr.append(ctypes.string_at(buf, length))
+    return length
+
+
+def _poll(handle):
+    should_cancel = _output.should_cancel
+    return -1 if should_cancel is not None and should_cancel() else 0
+
+
+# Referencias globales: si se liberaran, Ghostscript llamaría a memoria inválida
+_callbacks = (_STDIO_CALLBACK(_stdin), _STDIO_CALLBACK(_stdout), _STDIO_CALLBACK(_stderr))
+_poll_callback = _POLL_CALLBACK(_poll)
+
+_library = None
+_probed = False
+_probe_lock = threading.Lock()
+# Sin soporte de múltiples instancias se serializan las ejecuciones con este lock
+_instance_lock = threading.Lock()
+_concurrent = False
+
+
+def _candidate_paths():
+    for name in LIBRARY_NAMES:
+        bundled = get_resource_path(os.path.join("recursos", name))
+        if os.path.exists(bundled):
+            yield bundled
+    yield from LIBRARY_NAMES
+    found = ctypes.util.find_library("gs")
+    if found:
+        yield found
+
+
+def _configure(lib):
+    lib.gsapi_revision.argtypes = [ctypes.POINTER(_Revision), ctypes.c_int]
+    lib.gsapi_new_instance.argtypes = [ctypes.POINTER(ctypes.c_void_p), ctypes.c_void_p]
+    lib.gsapi_delete_instance.argtypes = [ctypes.c_void_p]
+    lib.gsapi_delete_instance.restype = None
+    lib.gsapi_set_stdio.argtypes = [ctypes.c_void_p, _STDIO_CALLBACK, _STDIO_CALLBACK, _STDIO_CALLBACK]
+    lib.gsapi_set_arg_encoding.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    lib.gsapi_init_with_args.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.POINTER(ctypes.c_char_p)]
+    lib.gsapi_exit.argtypes = [ctypes.c_void_p]
+    # gsapi_set_poll no existe en todas las compilaciones; sin él no se puede cancelar en curso
+    if hasattr(lib, "gsapi_set_poll"):
+        lib.gsapi_set_poll.argtypes = [ctypes.c_void_p, _POLL_CALLBACK]
+
+
+def _supports_concurrent_instances(lib):
+    """Las versiones compiladas sin soporte multi-instancia rechazan una segunda instancia viva."""
+    first, second = ctypes.c_void_p(), ctypes.c_void_p()
+    if lib.gsapi_new_instance(ctypes.byref(first), None) < 0:
+        return False
+    try:
+        if lib.gsapi_new_instance(ctypes.byref(second), None) < 0:
+            return False
+        lib.gsapi_delete_instance(second)
+        return True
+    finally:
+        lib.gsapi_delete_instance(first)
+
+
+def load_library():
+    """Carga la biblioteca de Ghostscript una sola vez por proceso; devuelve None si no existe."""
+    global _library, _probed, _concurrent
+    with _probe_lock:
+        if not _probed:
+            _probed = True
+            for path in _candidate_paths():
+                try:
+                    lib = _loader(path)
+                    _configure(lib)
+                except (OSError, AttributeError):
+                    continue
+                _library = lib
+                _concurrent = _supports_concurrent_instances(lib)
+                logging.info(f"Biblioteca de Ghostscript cargada: {path} (instancias concurrentes: {_concurrent})")
+                break
+    return _library
+
+
+def supports_concurrency():
+    """True si la biblioteca admite varias instancias vivas a la vez (ver _supports_concurrent_instances)."""
+    load_library()
+    return _concurrent
+
+
+def library_version():
+    lib = load_library()
+    if lib is None:
+        return None
+    revision = _Revision()
+    if lib.gsapi_revision(ctypes.byref(revision), ctypes.sizeof(revision)) != 0:
+        return None
+    # 9540 -> 9.54, 10030 -> 10.03; versiones anteriores a 9.53 usan 952 -> 9.52
+    if revision.revision >= 1000:
+        major, rest = divmod(revision.revision, 1000)
+        minor = rest // 10
+    else:
+        major, minor = divmod(revision.revision, 100)
+    return f"{major}.{minor:02d}"
+
+
+def run(args, on_stdout=None, should_cancel=None):
+    """Ejecuta Ghostscript con args (sin el nombre del ejecutable); devuelve (stdout, stderr).
+
+    on_stdout(texto) recibe la salida a medida que se produce; si should_cancel() devuelve
+    True el intérprete aborta. Lanza GhostscriptError si el intérprete informa un error.
+    """
+    lib = load_library()
+    if lib is None:
+        raise OSError("La biblioteca de Ghostscript no está disponible.")
+    argv = ["gs", *args]
+    c_argv = (ctypes.c_char_p * len(argv))(*[arg.encode("utf-8") for arg in argv])
+    _output.stdout, _output.stderr = [], []
+    _output.on_stdout, _output.should_cancel = on_stdout, should_cancel
+
+    lock = None if _concurrent else _instance_lock
+    if lock is not None:
+        lock.acquire()
+    try:
+        instance = ctypes.c_void_p()
+        code = lib.gsapi_new_instance(ctypes.byref(instance), None)
+        if code < 0:
+            raise GhostscriptError(code, "No se pudo crear la instancia de Ghostscript.")
+        try:
+            lib.gsapi_set_stdio(instance, *_callbacks)
+            if should_cancel is not None and hasattr(lib, "gsapi_set_poll"):
+                lib.gsapi_set_poll(instance, _poll_callback)
+            lib.gsapi_set_arg_encoding(instance, GS_ARG_ENCODING_UTF8)
+            code = lib.gsapi_init_with_args(instance, len(argv), c_argv)
+            exit_code = lib.gsapi_exit(instance)
+            if code in (0, GS_ERROR_QUIT):
+                code = exit_code
+        finally:
+            lib.gsapi_delete_instance(instance)
+    finally:
+        if lock is not None:
+            lock.release()
+
+    stdout = b"".join(_output.stdout).decode("utf-8", "replace")
+    stderr = b"".join(_output.stderr).decode("utf-8", "replace")
+    if code < 0:
+        raise GhostscriptError(code, stderr)
+    return stdout, stderr
@@ -0,0 +1,284 @@
+# jobs.py
+"""Planificador central del trabajo en segundo plano.
+
+Cada tarea larga (miniaturas, análisis, compresión, conversión, borrado) se registra
+como un Job con un recurso ("render", "compress", "convert", "io") y una prioridad.
+Antes de empezar, el job espera un lugar libre en su recurso; entre los que esperan
+pasa primero el de mayor prioridad y, a igual prioridad, el más antiguo.
+
+La cancelación es cooperativa: cada Job tiene un CancelToken (un threading.Event, así
+que sirve directamente como cancel_event de compress_pdf y compañía) que los bucles
+revisan entre páginas. Mientras hay trabajo interactivo en curso (miniaturas visibles,
+vista previa) los trabajos por lotes se detienen en su próximo punto de control.
+
+Solo ceden el paso los trabajos BATCH: una compresión NORMAL la pidió el usuario y
+sigue de largo. Los puntos de control son Job.report, CancelToken.checkpoint y los
+avisos de avance que el trabajo conecte a wait_if_paused (el lote de compresión lo hace
+al empezar cada archivo y en cada página); lo que corre fuera de Python entre dos
+avisos, como un proceso de Ghostscript externo, no se puede detener a mitad de camino.
+"""
+import time
+import heapq
+import itertools
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+INTERACTIVE, NORMAL, BATCH = 0, 1, 2
+PRIORITY_LABELS = {INTERACTIVE: "Interactiva", NORMAL: "Normal", BATCH: "Por lotes"}
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+STATE_LABELS = {QUEUED: "En cola", RUNNING: "En curso", DONE: "Terminado", FAILED: "Con error", CANCELLED: "Cancelado"}
+
+# Trabajos simultáneos por recurso; settings.json puede cambiarlos con "job_limits".
+# La vista previa tiene su propio recurso: vive mientras la ventana está abierta y no
+# debe dejar sin lugar al análisis de páginas.
+DEFAULT_LIMITS = {"render": 2, "preview": 1, "compress": 1, "convert": 1, "io": 2}
+# Trabajos terminados que se conservan para la lista
+HISTORY = 50
+# Intervalo mínimo entre avisos de avance de un mismo trabajo
+NOTIFY_INTERVAL = 0.2
+
+
+class JobCancelled(Exception):
+    """El trabajo se canceló antes de empezar o en un punto de control."""
+
+
+class CancelToken(threading.Event):
+    """Señal de cancelación de un trabajo; además frena los trabajos por lotes cuando hace falta."""
+
+    def __init__(self, scheduler=None, priority=NORMAL):
+        super().__init__()
+        self._scheduler = scheduler
+        self._priority = priority
+
+    def cancel(self):
+        self.set()
+        if self._scheduler is not None:
+            self._scheduler._wake()
+
+    @property
+    def cancelled(self):
+        return self.is_set()
+
+    def wait_if_paused(self):
+        """Espera mientras el planificador pida ceder el paso a trabajo interactivo."""
+        if self._scheduler is not None:
+            self._scheduler._wait_while_paused(self)
+
+    def checkpoint(self):
+        """Punto de control: cede el paso si corresponde y lanza JobCancelled si se canceló."""
+        self.wait_if_paused()
+        if self.is_set():
+            raise JobCancelled()
+
+
+class Job:
+    """Un trabajo registrado en el planificador. progress va de 0 a 1 (None si no se conoce)."""
+
+    def __init__(self, scheduler, job_id, name, resource, priority):
+        self.scheduler = scheduler
+        self.id = job_id
+        self.name = name
+        self.resource = resource
+        self.priority = priority
+        self.token = CancelToken(scheduler, priority)
+        self.state = QUEUED
+        self.progress = None
+        self.detail = ""
+        self.ok = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        # Funciones que se llaman al cancelar (p. ej. despertar un hilo que espera pedidos)
+        self.cancel_callbacks = []
+        self._last_notify = 0.0
+
+    @property
+    def finished(self):
+        return self.state in (DONE, FAILED, CANCELLED)
+
+    def cancel(self):
+        self.token.cancel()
+        for callback in list(self.cancel_callbacks):
+            callback()
+
+    def report(self, fraction=None, detail=None):
+        """Actualiza el avance; también es un punto donde un trabajo por lotes cede el paso."""
+        if fraction is not None:
+            self.progress = max(0.0, min(1.0, fraction))
+        if detail is not None:
+            self.detail = detail
+        now = time.monotonic()
+        if now - self._last_notify >= NOTIFY_INTERVAL or self.progress == 1.0:
+            self._last_notify = now
+            self.scheduler._notify(self)
+        self.token.wait_if_paused()
+
+    def set_result(self, ok, detail=None):
+        """Para trabajos que informan el error con (exito, mensaje) en lugar de una excepción."""
+        self.ok = ok
+        if detail is not None:
+            self.detail = detail
+
+
+class JobScheduler:
+    def __init__(self, limits=None):
+        self.limits = dict(DEFAULT_LIMITS)
+        self.limits.update(limits or {})
+        self._condition = threading.Condition()
+        self._jobs = OrderedDict()
+        self._waiting = []
+        self._running = {}
+        self._interactive_busy = 0
+        self._ids = itertools.count(1)
+        self._listeners = []
+
+    # --- Avisos ---
+
+    def add_listener(self, callback):
+        """callback(job) se llama desde cualquier hilo cada vez que un trabajo cambia."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, job):
+        for callback in list(self._listeners):
+            try:
+                callback(job)
+            except Exception as e:
+                logging.debug(f"Error en un aviso del planificador: {e}")
+
+    def _wake(self):
+        with self._condition:
+            self._condition.notify_all()
+
+    # --- Consulta ---
+
+    def jobs(self):
+        with self._condition:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.cancel()
+
+    def cancel_all(self, resource=None):
+        for job in self.jobs():
+            if not job.finished and (resource is None or job.resource == resource):
+                job.cancel()
+
+    # --- Ciclo de vida de un trabajo ---
+
+    def create(self, name, resource, priority=NORMAL):
+        """Registra un trabajo en cola; empieza cuando se entra en run(job)."""
+        with self._condition:
+            job = Job(self, next(self._ids), name, resource, priority)
+            self._jobs[job.id] = job
+            self._trim_history()
+        self._notify(job)
+        return job
+
+    def _trim_history(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - HISTORY)]:
+            del self._jobs[job_id]
+
+    def _is_next(self, job):
+        """True si job encabeza la cola de su recurso y hay un lugar libre."""
+        limit = max(1, self.limits.get(job.resource, 1))
+        if self._running.get(job.resource, 0) >= limit:
+            return False
+        first = min((entry for entry in self._waiting if entry[2].resource == job.resource), default=None)
+        return first is not None and first[2] is job
+
+    @contextmanager
+    def run(self, job):
+        """Espera un lugar en el recurso del trabajo y lo ocupa mientras dura el bloque.
+
+        Lanza JobCancelled si el trabajo se cancela mientras espera. Al salir el estado
+        queda en DONE, FAILED (excepción o set_result(False)) o CANCELLED.
+        """
+        with self._condition:
+            entry = (job.priority, job.id, job)
+            heapq.heappush(self._waiting, entry)
+            while not job.token.is_set() and not self._is_next(job):
+                self._condition.wait()
+            self._waiting.remove(entry)
+            heapq.heapify(self._waiting)
+            if job.token.is_set():
+                job.state, job.finished_at = CANCELLED, time.time()
+                self._condition.notify_all()
+            else:
+                self._running[job.resource] = self._running.get(job.resource, 0) + 1
+                job.state, job.started_at = RUNNING, time.time()
+        self._notify(job)
+        if job.state == CANCELLED:
+            raise JobCancelled()
+
+        try:
+            yield job.token
+        except JobCancelled:
+            job.state = CANCELLED
+        except Exception as e:
+            job.state, job.detail = FAILED, str(e)
+            raise
+        else:
+            if job.token.is_set():
+                job.state = CANCELLED
+            else:
+                job.state = FAILED if job.ok is False else DONE
+        finally:
+            with self._condition:
+                self._running[job.resource] -= 1
+                job.finished_at = time.time()
+                if job.state == DONE:
+                    job.progress = 1.0
+                self._trim_history()
+                self._condition.notify_all()
+            self._notify(job)
+
+    @contextmanager
+    def busy(self, job):
+        """Marca un tramo de trabajo interactivo; mientras dure, los trabajos por lotes ceden el paso.
+
+        Los trabajos interactivos de larga vida (el renderizador de miniaturas) lo usan solo
+        mientras efectivamente renderizan, no mientras esperan pedidos.
+        """
+        interactive = job.priority == INTERACTIVE
+        if interactive:
+            with self._condition:
+                self._interactive_busy += 1
+        try:
+            yield
+        finally:
+            if interactive:
+                with self._condition:
+                    self._interactive_busy -= 1
+                    self._condition.notify_all()
+
+    def _wait_while_paused(self, token):
+        """Bloquea a un trabajo BATCH mientras haya tramos interactivos; el resto nunca espera."""
+        if token._priority != BATCH:
+            return
+        with self._condition:
+            while self._interactive_busy > 0 and not token.is_set():
+                self._condition.wait(0.5)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Planificador compartido por toda la aplicación, con los límites de settings.json."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            from settings import get_setting
+            _scheduler = JobScheduler(get_setting("job_limits"))
+    return _scheduler
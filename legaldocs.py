@@ -0,0 +1,339 @@
+# legaldocs.py
+"""Interfaz de línea de comandos sin Qt ni COM para procesar archivos por lotes.
+
+Ejemplos:
+    python -m legaldocs compress -q ebook -o salida/ expedientes/
+    python -m legaldocs remove -p 1,3-5 "escaneos/*.pdf"
+    python -m legaldocs remove --blank --duplicates escaneos/
+    python -m legaldocs img2pdf fotos/*.jpg
+    python -m legaldocs img2pdf --merge escrito.pdf --page-size a4 fotos/
+    python -m legaldocs pipeline --remove 1,3 --compress ebook escrito.docx
+    python -m legaldocs inspect --top 10 expediente.pdf
+    python -m legaldocs watch -o comprimidos/ /srv/escaner/entrada
+    python -m legaldocs report
+
+Cada subcomando importa solo lo que necesita. El resultado se imprime como JSON.
+"""
+import os
+import sys
+import glob
+import json
+import time
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+EXTENSIONS = {
+    "compress": (".pdf",),
+    "remove": (".pdf",),
+    "img2pdf": (".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff"),
+    "pipeline": (".pdf", ".doc", ".docx"),
+}
+SUFFIXES = {
+    "compress": "_comprimido",
+    "remove": "_sin_paginas",
+    "img2pdf": "",
+    "pipeline": "_procesado",
+}
+
+
+def expand_inputs(patterns, extensions, recursive=False):
+    """Expande archivos, carpetas y patrones glob a una lista ordenada y sin duplicados."""
+    found = []
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if os.path.isdir(path):
+                if recursive:
+                    for root, _, names in os.walk(path):
+                        found.extend(os.path.join(root, name) for name in names)
+                else:
+                    found.extend(os.path.join(path, name) for name in os.listdir(path))
+            else:
+                found.append(path)
+    files = [os.path.abspath(p) for p in found if p.lower().endswith(extensions) and os.path.isfile(p)]
+    return sorted(set(files))
+
+
+def parse_page_ranges(spec):
+    """Convierte "1,3,5-7" (páginas desde 1) en índices desde 0."""
+    pages = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            pages.update(range(int(first) - 1, int(last)))
+        else:
+            pages.add(int(part) - 1)
+    if any(page < 0 for page in pages):
+        raise ValueError(f"Número de página inválido en {spec!r}")
+    return sorted(pages)
+
+
+def output_path_for(command, input_path, output_dir):
+    base = os.path.splitext(os.path.basename(input_path))[0] + SUFFIXES[command] + ".pdf"
+    return os.path.join(output_dir or os.path.dirname(input_path), base)
+
+
+def run_job(command, input_path, output_path, options):
+    """Ejecuta un trabajo; se llama en hilos (compress, pipeline) o en procesos (remove, img2pdf)."""
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    inputs = input_path if isinstance(input_path, list) else [input_path]
+    duplicates = None
+    try:
+        if command == "compress":
+            import telemetry
+            from compressor import (compress_with_engine, compress_to_target, compress_pdf_sharded,
+                                    compression_backend_name, count_pages)
+            mode = "target" if options["target_mb"] else "sharded" if options["sharded"] else "single"
+            with telemetry.operation("compress", engine=options["engine"], quality=options["quality"], mode=mode,
+                                     backend=compression_backend_name(options["engine"]), source="cli",
+                                     pages=count_pages(input_path) if telemetry.enabled() else None,
+                                     input_bytes=os.path.getsize(input_path)) as record:
+                if options["target_mb"]:
+                    success, message = compress_to_target(input_path, output_path, int(options["target_mb"] * 1024 * 1024))
+                elif options["sharded"] and options["engine"] == "ghostscript":
+                    success, message = compress_pdf_sharded(input_path, output_path, options["quality"])
+                else:
+                    success, message = compress_with_engine(input_path, output_path, options["quality"], options["engine"])
+                record["ok"] = success
+                if success:
+                    record["output_bytes"] = os.path.getsize(output_path)
+        elif command == "remove":
+            from pdf_utils import remove_selected_pages
+            pages = set(options["pages"])
+            if options["blank"] or options["duplicates"]:
+                from page_analysis import analyze_pdf, removal_candidates
+                # Ya corre en un proceso del pool: el análisis renderiza en este mismo proceso
+                result = analyze_pdf(input_path, workers=1)
+                # Las duplicadas se informan (desde 1) y solo se eliminan si se pidió expresamente
+                duplicates = {page + 1: original + 1 for page, original in sorted(result.duplicates.items())}
+                pages.update(removal_candidates(result, blank=options["blank"],
+                                                duplicates=options["remove_duplicates"]))
+            if pages:
+                remove_selected_pages(input_path, output_path, sorted(pages), save_mode=options["save_mode"])
+                success, message = True, f"{len(pages)} páginas eliminadas."
+            else:
+                success, message = True, "No hay páginas para eliminar."
+                output_path = None
+        elif command == "pipeline":
+            from pipeline import Pipeline, ConvertStage, RemovePagesStage, CompressStage
+            stages = []
+            if not input_path.lower().endswith(".pdf"):
+                stages.append(ConvertStage())
+            if options["pages"]:
+                stages.append(RemovePagesStage(options["pages"]))
+            if options["quality"]:
+                stages.append(CompressStage(options["quality"], options["engine"]))
+            success, message = Pipeline(stages, save_mode=options["save_mode"]).run(input_path, output_path)
+        else:
+            from pdf_builder import images_to_pdf
+            # Con --merge input_path es la lista completa de imágenes
+            images_to_pdf(inputs, output_path, page_size=options["page_size"], dpi=options["dpi"],
+                          auto_orient=options["auto_orient"], max_workers=options.get("workers") or 1)
+            success, message = True, f"{len(inputs)} imágenes convertidas a PDF."
+    except Exception as e:
+        success, message = False, str(e)
+
+    return {
+        "input": input_path,
+        "output": output_path if success else None,
+        "pages_removed": len(pages) if command == "remove" and success else None,
+        "duplicates": duplicates,
+        "ok": success,
+        "message": message,
+        "input_bytes": sum(os.path.getsize(path) for path in inputs if os.path.exists(path)),
+        "output_bytes": os.path.getsize(output_path) if success and output_path and os.path.exists(output_path) else None,
+        "seconds": round(time.perf_counter() - start, 3),
+        "cpu_seconds": round(time.process_time() - cpu_start, 3),
+    }
+
+
+def watch_main(args):
+    """Corre el vigilante de carpetas hasta Ctrl+C, escribiendo los contadores en stderr."""
+    from settings import get_setting
+    from watch_folder import FolderWatcher
+
+    folders = args.folders or get_setting("watch_folders")
+    if not folders:
+        print("No hay carpetas para vigilar (argumento o watch_folders en settings.json).", file=sys.stderr)
+        return 2
+    watcher = FolderWatcher(folders,
+                            output_dir=args.output_dir or get_setting("watch_output_dir") or None,
+                            quality=args.quality or get_setting("watch_quality"),
+                            engine=args.engine or get_setting("compression_engine"),
+                            name_pattern=args.pattern or get_setting("watch_name_pattern"),
+                            workers=args.jobs or get_setting("watch_workers"),
+                            stable_seconds=args.stable or get_setting("watch_stable_seconds"),
+                            process_existing=not args.skip_existing,
+                            use_inotify=not args.poll)
+    watcher.start()
+    try:
+        while True:
+            time.sleep(args.stats_every)
+            print(json.dumps(watcher.stats(), ensure_ascii=False), file=sys.stderr, flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+    json.dump(watcher.stats(), sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="legaldocs", description="Herramientas de PDF por lotes, sin interfaz gráfica.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Muestra el registro detallado en stderr.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(sub):
+        sub.add_argument("inputs", nargs="+", help="Archivos, carpetas o patrones glob.")
+        sub.add_argument("-o", "--output-dir", help="Carpeta de salida (por defecto, la del archivo de entrada).")
+        sub.add_argument("-r", "--recursive", action="store_true", help="Recorre las subcarpetas.")
+        sub.add_argument("-j", "--jobs", type=int, default=0, help="Trabajos en paralelo (0 = uno por núcleo).")
+
+    compress = subparsers.add_parser("compress", help="Comprime PDF.")
+    add_common(compress)
+    compress.add_argument("-q", "--quality", default="ebook", choices=["screen", "ebook", "printer"])
+    compress.add_argument("--engine", default="ghostscript", choices=["ghostscript", "native"])
+    compress.add_argument("--target-mb", type=float, default=0, help="Tamaño máximo de cada archivo en MB.")
+    compress.add_argument("--sharded", action="store_true", help="Divide los archivos grandes en partes paralelas.")
+
+    remove = subparsers.add_parser("remove", help="Elimina páginas de PDF.")
+    add_common(remove)
+    remove.add_argument("-p", "--pages", default="", help='Páginas a eliminar, desde 1 (p. ej. "1,3,5-7").')
+    remove.add_argument("--blank", action="store_true", help="Elimina también las páginas en blanco.")
+    remove.add_argument("--duplicates", action="store_true",
+                        help="Informa las páginas escaneadas dos veces (página: original) sin eliminarlas.")
+    remove.add_argument("--remove-duplicates", action="store_true",
+                        help="Elimina también las duplicadas. Revisá antes el informe de --duplicates.")
+    remove.add_argument("--save-mode", default="compact", choices=["fast", "compact", "max"])
+
+    img2pdf = subparsers.add_parser("img2pdf", help="Convierte imágenes a PDF.")
+    add_common(img2pdf)
+    img2pdf.add_argument("--merge", metavar="SALIDA.pdf", help="Une todas las imágenes, en orden, en un único PDF.")
+    img2pdf.add_argument("--page-size", default="image", choices=["image", "a4", "letter", "legal", "oficio"],
+                         help='Tamaño de página; "image" usa el tamaño de la imagen según el DPI.')
+    img2pdf.add_argument("--dpi", type=float, default=0, help="DPI de las imágenes (0 = el de cada archivo o 150).")
+    img2pdf.add_argument("--no-exif", action="store_true", help="Ignora la orientación EXIF de las fotos.")
+
+    pipeline = subparsers.add_parser("pipeline", help="Convierte, elimina páginas y comprime en un solo paso.")
+    add_common(pipeline)
+    pipeline.add_argument("--remove", help='Páginas a eliminar, desde 1 (p. ej. "1,3,5-7").')
+    pipeline.add_argument("--compress", choices=["screen", "ebook", "printer"], help="Calidad de compresión.")
+    pipeline.add_argument("--engine", default="ghostscript", choices=["ghostscript", "native"])
+    pipeline.add_argument("--save-mode", default="compact", choices=["fast", "compact", "max"])
+
+    inspect = subparsers.add_parser("inspect", help="Muestra qué páginas pesan más (imágenes, fuentes, contenido).")
+    inspect.add_argument("inputs", nargs="+", help="Archivos, carpetas o patrones glob.")
+    inspect.add_argument("-r", "--recursive", action="store_true", help="Recorre las subcarpetas.")
+    inspect.add_argument("--top", type=int, default=10, help="Páginas a listar por archivo (0 = todas).")
+
+    watch = subparsers.add_parser("watch", help="Vigila carpetas y comprime cada PDF nuevo (Ctrl+C para salir).")
+    watch.add_argument("folders", nargs="*", help="Carpetas a vigilar (por defecto, watch_folders de settings.json).")
+    watch.add_argument("-o", "--output-dir", help="Carpeta de salida (por defecto, la del archivo).")
+    watch.add_argument("-q", "--quality", choices=["screen", "ebook", "printer"])
+    watch.add_argument("--engine", choices=["ghostscript", "native"])
+    watch.add_argument("--pattern", help='Regla de nombres de salida; admite {name}, {quality} y {date}.')
+    watch.add_argument("-j", "--jobs", type=int, default=0, help="Compresiones simultáneas.")
+    watch.add_argument("--stable", type=float, default=0, help="Segundos sin cambios antes de tomar un archivo.")
+    watch.add_argument("--poll", action="store_true", help="Usa sondeo en lugar de inotify (p. ej. en carpetas de red).")
+    watch.add_argument("--skip-existing", action="store_true", help="Ignora los PDF que ya estaban al arrancar.")
+    watch.add_argument("--stats-every", type=float, default=30, help="Segundos entre líneas de contadores en stderr.")
+
+    report = subparsers.add_parser("report", help="Resume la telemetría registrada (percentiles por operación).")
+    report.add_argument("--log", help="Archivo telemetry.jsonl (por defecto, el de la carpeta de datos).")
+    report.add_argument("--json", action="store_true", help="Imprime el resumen como JSON.")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(stream=sys.stderr, level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.command == "report":
+        import telemetry
+        summary = telemetry.build_report(telemetry.load_entries(args.log))
+        if args.json:
+            json.dump(summary, sys.stdout, ensure_ascii=False, indent=2)
+            sys.stdout.write("\n")
+        else:
+            print(telemetry.format_report(summary))
+        return 0
+
+    if args.command == "inspect":
+        from pdf_inspector import page_size_index, heaviest_pages
+        results = []
+        for path in expand_inputs(args.inputs, (".pdf",), args.recursive):
+            index = page_size_index(path)
+            pages = heaviest_pages(index, args.top or len(index.pages))
+            results.append({
+                "input": path,
+                "file_bytes": index.file_bytes,
+                "document_bytes": round(index.document_bytes),
+                "pages": [dict({"page": page + 1}, **{key: round(value) for key, value in index.pages[page].items()})
+                          for page in pages],
+            })
+        json.dump(results, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+        return 0 if results else 1
+
+    if args.command == "watch":
+        return watch_main(args)
+
+    files = expand_inputs(args.inputs, EXTENSIONS[args.command], args.recursive)
+    options = {}
+    if args.command == "compress":
+        options = {"quality": args.quality, "engine": args.engine, "target_mb": args.target_mb, "sharded": args.sharded}
+    elif args.command == "remove":
+        if not (args.pages or args.blank or args.duplicates or args.remove_duplicates):
+            build_parser().error("remove necesita -p, --blank, --duplicates o --remove-duplicates")
+        options = {"pages": parse_page_ranges(args.pages), "save_mode": args.save_mode, "blank": args.blank,
+                   "duplicates": args.duplicates or args.remove_duplicates,
+                   "remove_duplicates": args.remove_duplicates}
+    elif args.command == "img2pdf":
+        options = {"page_size": args.page_size, "dpi": args.dpi or None, "auto_orient": not args.no_exif}
+    elif args.command == "pipeline":
+        options = {"pages": parse_page_ranges(args.remove) if args.remove else [], "quality": args.compress,
+                   "engine": args.engine, "save_mode": args.save_mode}
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    # Ghostscript corre en su propio proceso: alcanza con hilos. El resto usa CPU en Python.
+    # Los trabajos encadenados comparten el pool de conversores del proceso, así que también van en hilos.
+    executor_class = ThreadPoolExecutor if args.command in ("compress", "pipeline") else ProcessPoolExecutor
+    start = time.perf_counter()
+    results = []
+    if files and args.command == "img2pdf" and args.merge:
+        # Un solo PDF: el paralelismo está dentro del armado (decodificación de imágenes)
+        options["workers"] = args.jobs or os.cpu_count() or 1
+        merge_path = os.path.join(args.output_dir, args.merge) if args.output_dir else args.merge
+        results.append(run_job(args.command, files, os.path.abspath(merge_path), options))
+    elif files:
+        with executor_class(max_workers=args.jobs or os.cpu_count() or 1) as executor:
+            futures = [executor.submit(run_job, args.command, path, output_path_for(args.command, path, args.output_dir), options)
+                       for path in files]
+            for future in as_completed(futures):
+                results.append(future.result())
+    results.sort(key=lambda result: str(result["input"]))
+
+    summary = {
+        "command": args.command,
+        "files": len(results),
+        "failed": sum(1 for result in results if not result["ok"]),
+        "input_bytes": sum(result["input_bytes"] or 0 for result in results),
+        "output_bytes": sum(result["output_bytes"] or 0 for result in results),
+        "seconds": round(time.perf_counter() - start, 3),
+        "results": results,
+    }
+    json.dump(summary, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 1 if summary["failed"] or not files else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,8 @@
+import time
+# Referencia para la línea de tiempo de arranque que se escribe en el log
+STARTUP_T0 = time.perf_counter()
 import sys
 import os
-import subprocess
 import logging
 if sys.platform == "win32" and hasattr(sys, 'frozen'):
     # Usamos la carpeta AppData/Local de manera estándar
@@ -14,55 +16,72 @@ if sys.platform == "win32" and hasattr(sys, 'frozen'):
 
 import math
 import io
-import fitz 
-from PIL import Image
-from docx2pdf import convert
+import threading
+import multiprocessing
 from PyQt5.QtWidgets import (QApplication, QWidget, QListWidgetItem, QComboBox, 
                              QProgressBar, QTabWidget, QGridLayout, QVBoxLayout, 
                              QPushButton, QLabel, QFileDialog, QMessageBox, 
                              QHBoxLayout, QListView, QCheckBox, QSizePolicy, 
-                             QAbstractItemView, QListWidget, QSplashScreen)
-from PyQt5.QtGui import QPixmap, QImage, QIcon
+                             QAbstractItemView, QListWidget, QSplashScreen,
+                             QTableWidget, QTableWidgetItem, QHeaderView,
+                             QDoubleSpinBox, QDialog, QScrollArea, QShortcut)
+from PyQt5.QtGui import QPixmap, QImage, QIcon, QPainter, QColor, QKeySequence
 from PyQt5.QtCore import (Qt, QThread, pyqtSignal, QSize, QUrl, QTimer, 
-                          QPropertyAnimation, QEasingCurve, QRect, QPoint)
-import win32com
+                          QPropertyAnimation, QEasingCurve, QRect, QPoint,
+                          QMutex, QWaitCondition, QObject)
+# Importaciones de tus utilidades
+# fitz, Pillow, win32com y el renderizador se importan al usarse o en WarmupWorker
+from compressor import (compress_pdf, compress_batch, compress_pdf_sharded, compress_to_target,
+                        compress_with_engine, probe_ghostscript, compression_backend_name, count_pages,
+                        CANCELLED_MESSAGE)
+from file_utils import shred_files
+from settings import get_app_data_dir, get_setting
+from jobs import get_scheduler, JobCancelled, INTERACTIVE, NORMAL, BATCH, RUNNING, PRIORITY_LABELS, STATE_LABELS
+import telemetry
 
-# --- Añadir carpeta gen_py para win32com antes de importar módulos que la usen ---
-genpy_path = os.path.join(os.path.dirname(__file__), 'recursos', 'gen_py')
-if os.path.exists(genpy_path):
-    sys.path.append(genpy_path)
 
+_com_modules = None
+_com_lock = threading.Lock()
 
-if sys.platform == "win32" and hasattr(sys, 'frozen'):
-    try:
-        temp_dir = os.path.join(os.environ["TEMP"], "win32com_gen_py")
-        if not os.path.exists(temp_dir):
-            os.makedirs(temp_dir)
-        win32com.__path__.insert(0, temp_dir)
-    except Exception as e:
-        logging.error(f"Error al configurar el directorio temporal de win32com: {e}")
-
-import pythoncom
-import win32com.client
-import pywintypes
-try:
-    win32com.client.gencache.SetEnabled = 0
-except Exception as e:
-    logging.warning(f"No se pudo deshabilitar la caché de win32com: {e}")
-# Importaciones de tus utilidades
-from pdf_utils import remove_selected_pages
-from compressor import compress_pdf
-from file_utils import secure_delete_file, image_to_pdf, word_to_pdf
 
+def load_com_modules():
+    """Importa pythoncom, win32com.client y pywintypes una sola vez, configurando gen_py antes."""
+    global _com_modules
+    with _com_lock:
+        if _com_modules is None:
+            import win32com
 
-def configure_logging():
-    if sys.platform == "win32":
-        appdata_path = os.path.join(os.getenv('LOCALAPPDATA'), "LegalDocs")
-    else:
-        appdata_path = os.path.join(os.path.expanduser("~"), ".LegalDocs")
+            # --- Añadir carpeta gen_py para win32com antes de importar módulos que la usen ---
+            genpy_path = os.path.join(os.path.dirname(__file__), 'recursos', 'gen_py')
+            if os.path.exists(genpy_path):
+                sys.path.append(genpy_path)
+
+            if sys.platform == "win32" and hasattr(sys, 'frozen'):
+                try:
+                    temp_dir = os.path.join(os.environ["TEMP"], "win32com_gen_py")
+                    if not os.path.exists(temp_dir):
+                        os.makedirs(temp_dir)
+                    win32com.__path__.insert(0, temp_dir)
+                except Exception as e:
+                    logging.error(f"Error al configurar el directorio temporal de win32com: {e}")
+
+            import pythoncom
+            import win32com.client
+            import pywintypes
+            try:
+                win32com.client.gencache.SetEnabled = 0
+            except Exception as e:
+                logging.warning(f"No se pudo deshabilitar la caché de win32com: {e}")
+            _com_modules = (pythoncom, win32com.client, pywintypes)
+    return _com_modules
 
-    if not os.path.exists(appdata_path):
-        os.makedirs(appdata_path)
+
+def log_startup(stage):
+    logging.info(f"Arranque: {stage} a los {(time.perf_counter() - STARTUP_T0) * 1000:.0f} ms")
+
+
+def configure_logging():
+    appdata_path = get_app_data_dir()
 
     log_file_path = os.path.join(appdata_path, 'app_activity.log')
 
@@ -73,6 +92,7 @@ def configure_logging():
     )
 
 configure_logging()
+log_startup("módulos importados y log configurado")
 
 
 if sys.stdout is None:
@@ -88,56 +108,507 @@ if sys.stderr is None:
 
 
 def ensure_com_modules():
-    import win32com.client
+    _, client, _ = load_com_modules()
     try:
-        win32com.client.Dispatch('Word.Application')
+        client.Dispatch('Word.Application')
     except Exception as e:
         
         print(f"Warning: fallo al crear instancia COM: {e}")
 
 
-class Worker(QThread):
-    finished = pyqtSignal(list, str)
+class WarmupWorker(QThread):
+    """Importa en segundo plano los backends pesados para que el primer uso sea inmediato."""
+    finished_warmup = pyqtSignal()
+
+    def run(self):
+        steps = [
+            ("PyMuPDF", lambda: __import__("fitz")),
+            ("renderizador", lambda: __import__("renderer")),
+            ("caché de miniaturas", lambda: __import__("thumbnail_cache")),
+            ("eliminación de páginas", lambda: __import__("pdf_utils")),
+            ("Ghostscript", probe_ghostscript),
+        ]
+        if sys.platform == "win32":
+            steps.append(("COM de Word", load_com_modules))
+        for name, step in steps:
+            try:
+                step()
+                log_startup(f"precarga de {name}")
+            except Exception as e:
+                logging.warning(f"No se pudo precargar {name}: {e}")
+        self.finished_warmup.emit()
+
+
+class JobThread(QThread):
+    """QThread cuyo trabajo pasa por el planificador (jobs.py).
+
+    Espera su turno según recurso y prioridad, aparece en la pestaña Trabajos y se puede
+    cancelar desde ahí. cancel_event es el CancelToken del trabajo. Las subclases
+    implementan run_job(); on_cancelled() avisa a la interfaz si el trabajo se canceló
+    antes de empezar, para que no quede esperando una señal que nunca llega.
+    """
+
+    def __init__(self, name, resource, priority=NORMAL):
+        super().__init__()
+        self.job = get_scheduler().create(name, resource, priority)
+        self.cancel_event = self.job.token
+
+    def cancel(self):
+        self.job.cancel()
+
+    def run(self):
+        try:
+            with get_scheduler().run(self.job):
+                self.run_job()
+        except JobCancelled:
+            self.on_cancelled()
+
+    def run_job(self):
+        raise NotImplementedError
+
+    def on_cancelled(self):
+        pass
+
+
+_retired_workers = []
+
+
+def retire_worker(worker):
+    """Cancela un worker que la interfaz va a reemplazar y lo desconecta de ella.
+
+    Se conserva la referencia hasta que el hilo termine: destruir un QThread en marcha
+    cierra la aplicación.
+    """
+    if worker is None or not worker.isRunning():
+        return
+    worker.blockSignals(True)
+    worker.cancel()
+    _retired_workers[:] = [w for w in _retired_workers if w.isRunning()]
+    _retired_workers.append(worker)
+
+
+class ThumbnailWorker(JobThread):
+    """Renderiza miniaturas bajo demanda manteniendo el documento abierto.
+
+    Las páginas se entregan en lotes de (indice, QImage) para que la interfaz las
+    inserte de a poco. Una nueva solicitud o stop() interrumpe el lote en curso.
+    """
+    thumbnails_ready = pyqtSignal(list)
+    progress_update = pyqtSignal(int)
+    error = pyqtSignal(str)
+
+    # Un lote se emite al juntar BATCH_PAGES páginas o al pasar BATCH_INTERVAL segundos
+    BATCH_PAGES = 8
+    BATCH_INTERVAL = 0.05
+
+    def __init__(self, pdf_path):
+        super().__init__(f"Miniaturas: {os.path.basename(pdf_path)}", "render", INTERACTIVE)
+        self.pdf_path = pdf_path
+        self.job.cancel_callbacks.append(self.stop)
+        self._pending = []
+        self._generation = 0
+        self._requested = 0
+        self._done = 0
+        self._stopped = False
+        self._mutex = QMutex()
+        self._condition = QWaitCondition()
+
+    def request_pages(self, indices):
+        """Reemplaza la cola de páginas pendientes; se renderizan en el orden recibido."""
+        self._mutex.lock()
+        self._pending = list(indices)
+        self._generation += 1
+        self._requested = len(self._pending)
+        self._done = 0
+        self._condition.wakeAll()
+        self._mutex.unlock()
+
+    def stop(self):
+        self._mutex.lock()
+        self._stopped = True
+        self._pending = []
+        self._generation += 1
+        self._condition.wakeAll()
+        self._mutex.unlock()
+
+    def _next_batch(self, size):
+        self._mutex.lock()
+        try:
+            while not self._pending and not self._stopped:
+                self._condition.wait(self._mutex)
+            if self._stopped:
+                return [], self._generation
+            batch = self._pending[:size]
+            del self._pending[:size]
+            return batch, self._generation
+        finally:
+            self._mutex.unlock()
+
+    def _is_current(self, generation):
+        # Lectura sin lock: un valor desactualizado solo retrasa la interrupción una página
+        return generation == self._generation and not self._stopped and not self.cancel_event.is_set()
+
+    def _emit_batch(self, batch, generation):
+        if not batch:
+            return
+        self.thumbnails_ready.emit(list(batch))
+        if generation == self._generation and self._requested:
+            self._done += len(batch)
+            self.progress_update.emit(min(100, int(self._done / self._requested * 100)))
+            self.job.report(self._done / self._requested)
+        batch.clear()
+
+    def run_job(self):
+        from renderer import PageRasterizer, THUMBNAIL_SIZE
+        from thumbnail_cache import open_thumbnail_cache
+
+        variant = "%dx%d" % THUMBNAIL_SIZE
+        cache = open_thumbnail_cache()
+        doc_hash = None
+        # Solo cuenta el tiempo trabajando, no la espera de nuevas solicitudes
+        busy_seconds = 0.0
+        rendered = 0
+        cache_hits = 0
+        rasterizer = None
+        try:
+            rasterizer = PageRasterizer(self.pdf_path, workers=get_setting("render_workers"),
+                                        jpeg_quality=80 if cache is not None else None)
+            if cache is not None:
+                doc_hash = cache.document_hash(self.pdf_path)
+        except Exception as e:
+            self.error.emit(str(e))
+            if rasterizer is not None:
+                rasterizer.close()
+            if cache is not None:
+                cache.close()
+            return
+        # close() descarta el pool: se anota antes cuántos procesos renderizaron
+        workers = rasterizer.workers if rasterizer.executor else 1
+        try:
+            while True:
+                batch, generation = self._next_batch(rasterizer.batch_size)
+                if not batch:
+                    break
+                batch_start = time.perf_counter()
+                ready = []
+                # Mientras se renderiza, los trabajos por lotes ceden el paso
+                with get_scheduler().busy(self.job):
+                    if cache is not None:
+                        cached = cache.get_many(doc_hash, batch, variant)
+                        ready.extend((index, QImage.fromData(data, "JPG")) for index, data in cached.items())
+                        cache_hits += len(cached)
+                        batch = [i for i in batch if i not in cached]
+                    last_emit = time.monotonic()
+                    pages = rasterizer.render(batch)
+                    for page in pages:
+                        if not self._is_current(generation):
+                            pages.close()
+                            break
+                        if page.jpeg is not None:
+                            cache.put(doc_hash, page.index, variant, page.jpeg)
+                        # QImage envuelve las muestras sin copiarlas; se guarda la referencia
+                        # para que el buffer viva hasta que la interfaz cree el QPixmap
+                        image = QImage(page.samples, page.width, page.height, page.stride, QImage.Format_RGB888)
+                        image.buffer = page.samples
+                        ready.append((page.index, image))
+                        rendered += 1
+                        if len(ready) >= self.BATCH_PAGES or time.monotonic() - last_emit >= self.BATCH_INTERVAL:
+                            self._emit_batch(ready, generation)
+                            last_emit = time.monotonic()
+                    self._emit_batch(ready, generation)
+                    if cache is not None:
+                        # Una transacción por lote en lugar de una por página
+                        cache.flush()
+                busy_seconds += time.perf_counter() - batch_start
+        except Exception as e:
+            self.error.emit(str(e))
+        finally:
+            rasterizer.close()
+            if cache is not None:
+                cache.close()
+            if rendered or cache_hits:
+                telemetry.record("render", seconds=round(busy_seconds, 4), pages=rendered + cache_hits,
+                                 rendered=rendered, cache_hits=cache_hits, cache=get_setting("thumbnail_cache"),
+                                 workers=workers, input_bytes=telemetry.file_size(self.pdf_path))
+
+
+class PageAnalysisWorker(JobThread):
+    """Busca páginas en blanco y duplicadas sin bloquear la interfaz."""
+    progress_update = pyqtSignal(int)
+    # AnalysisResult de page_analysis
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, pdf_path):
+        super().__init__(f"Análisis de páginas: {os.path.basename(pdf_path)}", "render")
+        self.pdf_path = pdf_path
+
+    def stop(self):
+        self.cancel()
+
+    def report(self, done, total):
+        self.progress_update.emit(int(done / total * 100))
+        self.job.report(done / total)
+
+    def run_job(self):
+        from page_analysis import analyze_pdf
+
+        try:
+            result = analyze_pdf(self.pdf_path, workers=get_setting("render_workers"), progress=self.report,
+                                 should_stop=self.cancel_event.is_set)
+        except Exception as e:
+            self.job.set_result(False, str(e))
+            self.error.emit(str(e))
+            return
+        if result is None:
+            self.cancelled.emit()
+        else:
+            self.finished.emit(result)
+
+    def on_cancelled(self):
+        self.cancelled.emit()
+
+
+class PageSizeWorker(JobThread):
+    """Calcula el peso por página (pdf_inspector) fuera del hilo de la interfaz.
+
+    Si se pasa una DocumentSession se usa su documento abierto en lugar de reabrir el archivo.
+    """
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+    def __init__(self, pdf_path, session=None):
+        super().__init__(f"Peso por página: {os.path.basename(pdf_path)}", "io")
+        self.pdf_path = pdf_path
+        self.session = session
+
+    def run_job(self):
+        from pdf_inspector import page_size_index
+
+        try:
+            if self.session is not None:
+                with self.session.lock:
+                    index = page_size_index(self.pdf_path, self.session.document())
+            else:
+                index = page_size_index(self.pdf_path)
+        except Exception as e:
+            self.job.set_result(False, str(e))
+            self.error.emit(str(e))
+            return
+        self.finished.emit(index)
+
+
+class SortableItem(QTableWidgetItem):
+    """Celda que se ordena por el valor guardado en Qt.UserRole en lugar de por el texto."""
+
+    def __lt__(self, other):
+        return self.data(Qt.UserRole) < other.data(Qt.UserRole)
+
+
+class PreviewWorker(JobThread):
+    """Renderiza los mosaicos de la vista previa con su propio documento abierto.
+
+    Cada pedido reemplaza al anterior y el mosaico en curso es lo único que se termina
+    de lo viejo. El orden es: mosaicos visibles (del centro hacia afuera), un margen
+    alrededor para desplazarse y, por último, las páginas vecinas, que solo se guardan
+    en el caché. Lo que ya está en el caché no se vuelve a renderizar ni se envía: la
+    vista lo toma directamente de ahí.
+    """
+    # indice, ancho y alto en puntos de la página tal como se muestra (con su rotación)
+    page_ready = pyqtSignal(int, float, float)
+    # clave del caché de mosaicos, imagen
+    tile_ready = pyqtSignal(object, QImage)
+    error = pyqtSignal(str)
+
+    def __init__(self, pdf_path):
+        super().__init__(f"Vista previa: {os.path.basename(pdf_path)}", "preview", INTERACTIVE)
+        self.pdf_path = pdf_path
+        self.job.cancel_callbacks.append(self.stop)
+        self._request = None
+        self._generation = 0
+        self._stopped = False
+        self._mutex = QMutex()
+        self._condition = QWaitCondition()
+
+    def request(self, page, zoom, view, neighbors=()):
+        """Pide los mosaicos de page que tocan view = (x, y, ancho, alto) en píxeles al zoom dado."""
+        self._mutex.lock()
+        self._request = (page, zoom, view, tuple(neighbors))
+        self._generation += 1
+        self._condition.wakeAll()
+        self._mutex.unlock()
+
+    def stop(self):
+        self._mutex.lock()
+        self._stopped = True
+        self._request = None
+        self._generation += 1
+        self._condition.wakeAll()
+        self._mutex.unlock()
+
+    def _next_request(self):
+        self._mutex.lock()
+        try:
+            while self._request is None and not self._stopped:
+                self._condition.wait(self._mutex)
+            request, self._request = self._request, None
+            return request, self._generation
+        finally:
+            self._mutex.unlock()
+
+    def _plan(self, doc, rects, request):
+        """Genera (pagina, col, fila, enviar) en el orden en que conviene renderizar."""
+        from tiles import tiles_in_view
+
+        page, zoom, view, neighbors = request
+        width, height = rects(page)
+        for col, row in tiles_in_view(width, height, zoom, view, margin=1):
+            yield page, col, row, True
+        # En la página vecina se llega arriba de todo, a la misma altura de desplazamiento horizontal
+        for neighbor in neighbors:
+            if 0 <= neighbor < len(doc):
+                width, height = rects(neighbor)
+                for col, row in tiles_in_view(width, height, zoom, (view[0], 0, view[2], view[3])):
+                    yield neighbor, col, row, False
+
+    def run_job(self):
+        import fitz
+        from tiles import document_key, get_tile_cache, render_tile, zoom_key
+
+        cache = get_tile_cache()
+        try:
+            doc = fitz.open(self.pdf_path)
+            doc_key = document_key(self.pdf_path)
+        except Exception as e:
+            self.error.emit(str(e))
+            return
+
+        pages = {}
+
+        def load(index):
+            if index not in pages:
+                pages[index] = doc[index]
+            return pages[index]
+
+        def rects(index):
+            rect = load(index).rect
+            return rect.width, rect.height
+
+        # Como en las miniaturas, solo cuenta el tiempo trabajando
+        busy_seconds = 0.0
+        rendered = 0
+        try:
+            while True:
+                request, generation = self._next_request()
+                if request is None:
+                    break
+                page, zoom = request[0], request[1]
+                if not 0 <= page < len(doc):
+                    continue
+                self.page_ready.emit(page, *rects(page))
+                start = time.perf_counter()
+                with get_scheduler().busy(self.job):
+                    for index, col, row, send in self._plan(doc, rects, request):
+                        if generation != self._generation:
+                            break
+                        key = (doc_key, index, zoom_key(zoom), col, row)
+                        if key in cache:
+                            continue
+                        tile = render_tile(load(index), zoom, col, row)
+                        cache.put(key, tile)
+                        rendered += 1
+                        if send:
+                            image = QImage(tile.samples, tile.width, tile.height, tile.stride, QImage.Format_RGB888)
+                            image.buffer = tile.samples
+                            self.tile_ready.emit(key, image)
+                # Solo se conservan las páginas cercanas: cada fitz.Page retiene sus recursos
+                for index in [i for i in pages if abs(i - page) > 1]:
+                    del pages[index]
+                busy_seconds += time.perf_counter() - start
+        except Exception as e:
+            self.error.emit(str(e))
+        finally:
+            pages.clear()
+            doc.close()
+            if rendered:
+                telemetry.record("preview", seconds=round(busy_seconds, 4), tiles=rendered,
+                                 cache_bytes=cache.size_bytes, input_bytes=telemetry.file_size(self.pdf_path))
+
+
+class Worker(JobThread):
     finished_compression = pyqtSignal(bool, str) 
     progress_update = pyqtSignal(int)
+    # páginas hechas, páginas totales, páginas por segundo, segundos restantes estimados
+    page_progress = pyqtSignal(int, int, float, float)
     error = pyqtSignal(str)
     sizes_updated = pyqtSignal(float, float) 
+    # Intervalo mínimo entre señales de avance, para no saturar el hilo de la interfaz
+    PROGRESS_INTERVAL = 0.2
     
     def __init__(self, task, input_data=None):
-        super().__init__()
+        super().__init__(f"Comprimir: {os.path.basename(input_data[0])}", "compress")
         self.task = task
         self.input_data = input_data
+        self.started_at = None
+        self.last_emit = 0.0
 
-    def run(self):
+    def on_cancelled(self):
+        self.finished_compression.emit(False, CANCELLED_MESSAGE)
+
+    def report_pages(self, done, total):
+        now = time.perf_counter()
+        if done < total and now - self.last_emit < self.PROGRESS_INTERVAL:
+            return
+        self.last_emit = now
+        elapsed = max(now - self.started_at, 1e-6)
+        rate = done / elapsed
+        eta = (total - done) / rate if rate > 0 else -1.0
+        self.progress_update.emit(10 + int(done / total * 90))
+        self.page_progress.emit(done, total, rate, eta)
+        self.job.report(done / total, f"página {done} de {total}")
+
+    def run_job(self):
         try:
-            if self.task == "render_pdf":
-                pdf_path = self.input_data
-                doc = fitz.open(pdf_path)
-                images = []
-                for i, page in enumerate(doc):
-                    pix = page.get_pixmap(dpi=50)
-                    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                    images.append(img)
-                    self.progress_update.emit(int((i + 1) / len(doc) * 100))
-                doc.close()
-                self.finished.emit(images, pdf_path)
-            
-            elif self.task == "process_pdf":
-                input_pdf, out_path, quality = self.input_data
+            if self.task == "process_pdf":
+                input_pdf, out_path, quality, sharded, target_mb, engine = self.input_data
                 
                 original_size_bytes = os.path.getsize(input_pdf)
                 original_mb = original_size_bytes / (1024 * 1024)
 
                 self.progress_update.emit(10)
-                
-                success, message = compress_pdf(input_pdf, out_path, quality)
-                
+                self.started_at = time.perf_counter()
+                mode = "target" if quality == "target" else "native" if engine == "native" else "sharded" if sharded else "single"
+
+                with telemetry.operation("compress", engine=engine, quality=quality, mode=mode,
+                                         backend=compression_backend_name(engine),
+                                         pages=count_pages(input_pdf) if telemetry.enabled() else None,
+                                         input_bytes=original_size_bytes) as record:
+                    if mode == "target":
+                        success, message = compress_to_target(input_pdf, out_path, int(target_mb * 1024 * 1024),
+                                                              progress=self.progress_update.emit,
+                                                              cancel_event=self.cancel_event)
+                    elif mode == "native":
+                        success, message = compress_with_engine(input_pdf, out_path, quality, engine,
+                                                                cancel_event=self.cancel_event)
+                    elif mode == "sharded":
+                        success, message = compress_pdf_sharded(input_pdf, out_path, quality, get_setting("compression_workers"),
+                                                                progress=self.report_pages, cancel_event=self.cancel_event)
+                    else:
+                        success, message = compress_pdf(input_pdf, out_path, quality, progress=self.report_pages,
+                                                        cancel_event=self.cancel_event)
+                    record["ok"] = success
+                    record["cancelled"] = message == CANCELLED_MESSAGE
+                    if success:
+                        record["output_bytes"] = os.path.getsize(out_path)
+                self.job.set_result(success, None if success else message)
+
                 if success:
                     try:
                         compressed_size_bytes = os.path.getsize(out_path)
                         compressed_mb = compressed_size_bytes / (1024 * 1024)
                         self.sizes_updated.emit(original_mb, compressed_mb)
-                        self.finished_compression.emit(True, "PDF comprimido y guardado exitosamente.")
+                        self.finished_compression.emit(True, message)
                     except Exception as e:
                         error_msg = f"Compresión exitosa, pero no se pudo obtener el tamaño del archivo: {e}"
                         self.finished_compression.emit(False, error_msg)
@@ -147,81 +618,241 @@ class Worker(QThread):
                     self.finished_compression.emit(False, message)
 
         except Exception as e:
+            self.job.set_result(False, str(e))
+            self.error.emit(str(e))
+
+
+class BatchCompressionWorker(JobThread):
+    """Comprime una lista de archivos con varios procesos de Ghostscript en paralelo."""
+    file_started = pyqtSignal(int)
+    file_finished = pyqtSignal(int, bool, str)
+    file_sizes_updated = pyqtSignal(int, float, float)
+    sizes_updated = pyqtSignal(float, float)
+    progress_update = pyqtSignal(int)
+    finished_batch = pyqtSignal(int, int)
+    error = pyqtSignal(str)
+
+    def __init__(self, jobs, quality, max_workers=None, target_bytes=None, engine="ghostscript"):
+        super().__init__(f"Comprimir lote: {len(jobs)} archivos", "compress", BATCH)
+        self.jobs = jobs
+        self.quality = quality
+        self.max_workers = max_workers
+        self.target_bytes = target_bytes
+        self.engine = engine
+        self.started_at = {}
+
+    def on_file_started(self, index):
+        # Antes de lanzar el próximo Ghostscript se cede el paso al trabajo interactivo
+        self.cancel_event.wait_if_paused()
+        self.started_at[index] = time.perf_counter()
+        self.file_started.emit(index)
+
+    def on_file_progress(self, index, done, total):
+        # Cada página (o imagen, con el motor nativo) también es un punto de control. Con el
+        # motor nativo o Ghostscript dentro del proceso el archivo en curso se detiene ahí
+        # mismo; un gs.exe externo sigue hasta llenar el pipe de su salida
+        self.cancel_event.wait_if_paused()
+
+    def on_cancelled(self):
+        for index in range(len(self.jobs)):
+            self.file_finished.emit(index, False, CANCELLED_MESSAGE)
+        self.finished_batch.emit(0, len(self.jobs))
+
+    def run_job(self):
+        try:
+            total_original_mb = 0.0
+            total_compressed_mb = 0.0
+            done = 0
+            succeeded = 0
+            log_files = telemetry.enabled()
+            for index, success, message in compress_batch(self.jobs, self.quality, self.max_workers,
+                                                          on_start=self.on_file_started,
+                                                          on_progress=self.on_file_progress,
+                                                          target_bytes=self.target_bytes,
+                                                          engine=self.engine,
+                                                          cancel_event=self.cancel_event):
+                done += 1
+                if success:
+                    succeeded += 1
+                    input_pdf, out_path = self.jobs[index]
+                    original_mb = os.path.getsize(input_pdf) / (1024 * 1024)
+                    compressed_mb = os.path.getsize(out_path) / (1024 * 1024)
+                    total_original_mb += original_mb
+                    total_compressed_mb += compressed_mb
+                    self.file_sizes_updated.emit(index, original_mb, compressed_mb)
+                    self.sizes_updated.emit(total_original_mb, total_compressed_mb)
+                if log_files and index in self.started_at:
+                    input_pdf, out_path = self.jobs[index]
+                    # Los archivos corren en paralelo: se registra solo el tiempo real de cada uno
+                    telemetry.record("compress", seconds=round(time.perf_counter() - self.started_at[index], 4),
+                                     engine=self.engine, quality=self.quality, mode="target" if self.target_bytes else "batch",
+                                     backend=compression_backend_name(self.engine), workers=self.max_workers,
+                                     pages=count_pages(input_pdf), input_bytes=os.path.getsize(input_pdf),
+                                     output_bytes=os.path.getsize(out_path) if success else None, ok=success,
+                                     cancelled=message == CANCELLED_MESSAGE)
+                self.file_finished.emit(index, success, message)
+                self.progress_update.emit(int(done / len(self.jobs) * 100))
+                self.job.report(done / len(self.jobs), f"{done} de {len(self.jobs)} archivos")
+            self.job.set_result(succeeded == len(self.jobs), f"{succeeded} de {len(self.jobs)} comprimidos")
+            self.finished_batch.emit(succeeded, len(self.jobs))
+        except Exception as e:
+            self.job.set_result(False, str(e))
             self.error.emit(str(e))
 
 
-class WordToPDFWorker(QThread):
+class ShredWorker(JobThread):
+    """Elimina archivos de forma segura fuera del hilo de la interfaz.
+
+    Un archivo que ya empezó a sobrescribirse se termina; cancelar solo evita empezar.
+    """
     progress_update = pyqtSignal(int)
     finished = pyqtSignal(bool, str)
 
-    def __init__(self, docx_path, output_pdf_path):
-        super().__init__()
-        self.docx_path = docx_path
-        self.output_pdf_path = output_pdf_path
+    def __init__(self, paths):
+        super().__init__(f"Borrado seguro: {os.path.basename(paths[0])}" + (f" y {len(paths) - 1} más" if len(paths) > 1 else ""),
+                         "io")
+        self.paths = paths
 
-    def run(self):
+    def report(self, fraction):
+        self.progress_update.emit(int(fraction * 100))
+        self.job.report(fraction)
+
+    def run_job(self):
+        errors = []
         try:
-            
-            pythoncom.CoInitialize()
+            for path, success, error in shred_files(self.paths, get_setting("shred_passes"), get_setting("shred_pattern"),
+                                                    get_setting("shred_workers"), progress=self.report):
+                if not success:
+                    errors.append(f"{os.path.basename(path)}: {error}")
+        except Exception as e:
+            errors.append(str(e))
+        self.job.set_result(not errors, "; ".join(errors) or None)
+        self.finished.emit(not errors, "; ".join(errors))
 
-            self.progress_update.emit(10)
+    def on_cancelled(self):
+        self.finished.emit(False, "Borrado cancelado.")
 
-            
-            src = os.path.normpath(os.path.abspath(self.docx_path))
-            dst = os.path.normpath(os.path.abspath(self.output_pdf_path))
-            os.makedirs(os.path.dirname(dst), exist_ok=True)
 
-            
-            word = None
-            doc = None
-            try:
-                word = win32com.client.DispatchEx('Word.Application')
-                word.Visible = False
-                try:
-                    word.DisplayAlerts = 0  
-                except Exception:
-                    pass
+class PipelineWorker(JobThread):
+    """Ejecuta un Pipeline (p. ej. eliminar páginas y comprimir) con una sola barra de progreso.
 
-                doc = word.Documents.Open(src, ReadOnly=True)
-                
-                doc.ExportAsFixedFormat(OutputFileName=dst, ExportFormat=17)
-            finally:
-                try:
-                    if doc is not None:
-                        doc.Close(False)
-                except Exception:
-                    pass
-                try:
-                    if word is not None:
-                        word.Quit()
-                except Exception:
-                    pass
+    Si source es una DocumentSession, el worker libera esa referencia al terminar.
+    """
+    progress_update = pyqtSignal(int, str)
+    finished = pyqtSignal(bool, str)
 
-            self.progress_update.emit(100)
-            self.finished.emit(True, self.output_pdf_path)
+    def __init__(self, pipeline, source, out_path):
+        super().__init__(f"Procesar y guardar: {os.path.basename(out_path)}", "compress")
+        self.pipeline = pipeline
+        self.source = source
+        self.out_path = out_path
 
-        except pywintypes.com_error as e:
-            self.finished.emit(False, f"Error de conversión (COM). Verifica que Microsoft Word esté instalado y activado. Detalle: {e}")
-        except Exception as e:
-            self.finished.emit(False, f"Error de conversión. Verifica que Microsoft Word esté instalado y activado. Detalle: {e}")
+    def report(self, fraction, stage):
+        self.progress_update.emit(int(fraction * 100), stage)
+        self.job.report(fraction, stage)
+
+    def release_source(self):
+        from pipeline import DocumentSession, release_session
+
+        if isinstance(self.source, DocumentSession):
+            release_session(self.source)
+
+    def run_job(self):
+        try:
+            success, message = self.pipeline.run(self.source, self.out_path, progress=self.report,
+                                                 cancel_event=self.cancel_event)
         finally:
+            self.release_source()
+        self.job.set_result(success, None if success else message)
+        self.finished.emit(success, message)
+
+    def on_cancelled(self):
+        self.release_source()
+        self.finished.emit(False, CANCELLED_MESSAGE)
+
+
+class WordToPDFWorker(JobThread):
+    """Convierte una cola de documentos con el pool de conversores abiertos.
+
+    Al cancelar, los documentos que todavía no empezaron se descartan; los que ya están
+    en Word o LibreOffice terminan.
+    """
+    progress_update = pyqtSignal(int)
+    file_finished = pyqtSignal(str, bool, str)
+    finished = pyqtSignal(bool, str)
+    CANCELLED_TEXT = "Conversión cancelada."
+
+    def __init__(self, jobs):
+        super().__init__(f"Convertir a PDF: {os.path.basename(jobs[0][0])}" + (f" y {len(jobs) - 1} más" if len(jobs) > 1 else ""),
+                         "convert")
+        self.jobs = jobs
+
+    def on_cancelled(self):
+        self.finished.emit(False, self.CANCELLED_TEXT)
+
+    def completed(self, futures):
+        """Como as_completed, pero descarta lo pendiente en cuanto se cancela el trabajo."""
+        from concurrent.futures import wait, FIRST_COMPLETED
+
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            yield from done
+            if self.cancel_event.is_set():
+                for future in pending:
+                    future.cancel()
+
+    def run_job(self):
+        from concurrent.futures import CancelledError
+        from converters import get_converter_pool
+
+        try:
+            futures = {}
+            pool = get_converter_pool()
+            for src, dst in self.jobs:
+                futures[pool.submit(src, dst)] = src
+        except Exception as e:
+            self.finished.emit(False, f"Error de conversión. Verifica que Microsoft Word (o LibreOffice) esté instalado. Detalle: {e}")
+            return
+
+        self.progress_update.emit(5)
+        failed = []
+        for done, future in enumerate(self.completed(futures), start=1):
+            src = futures[future]
             try:
-                pythoncom.CoUninitialize()
-            except Exception:
-                pass
+                error = future.exception()
+            except CancelledError:
+                error = self.CANCELLED_TEXT
+            if error is None:
+                self.file_finished.emit(src, True, future.result())
+            else:
+                failed.append(f"{os.path.basename(src)}: {error}")
+                self.file_finished.emit(src, False, str(error))
+            self.progress_update.emit(int(done / len(futures) * 100))
+            self.job.report(done / len(futures))
+
+        self.job.set_result(not failed, "\n".join(failed) or None)
+        if self.cancel_event.is_set():
+            self.finished.emit(False, self.CANCELLED_TEXT)
+        elif failed:
+            self.finished.emit(False, "Error de conversión. Verifica que Microsoft Word esté instalado y activado.\n" + "\n".join(failed))
+        else:
+            outputs = [dst for _, dst in self.jobs]
+            self.finished.emit(True, outputs[0] if len(outputs) == 1 else os.path.dirname(outputs[0]))
 
 
 class WordToPDFTab(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.output_pdf = None
+        self.worker = None
         self.init_ui()
         self.setAcceptDrops(True)
 
     def init_ui(self):
         layout = QVBoxLayout()
         
-        self.label = QLabel("Arrastra y suelta un archivo de Word aquí o usa el botón para convertirlo a PDF.")
+        self.label = QLabel("Arrastra y suelta uno o varios archivos de Word aquí o usa el botón para convertirlos a PDF.")
         self.label.setAlignment(Qt.AlignCenter)
         self.label.setStyleSheet("""
         font-size: 16px; 
@@ -258,36 +889,49 @@ class WordToPDFTab(QWidget):
             event.ignore()
 
     def dropEvent(self, event):
-        for url in event.mimeData().urls():
-            self.handle_file(url.toLocalFile())
-            break
+        self.handle_files([url.toLocalFile() for url in event.mimeData().urls()])
 
     def open_file_dialog(self):
-        file_name, _ = QFileDialog.getOpenFileName(self, "Seleccionar Archivo de Word", "", "Archivos Word (*.docx)")
-        if file_name:
-            self.handle_file(file_name)
+        file_names, _ = QFileDialog.getOpenFileNames(self, "Seleccionar Archivos de Word", "", "Archivos Word (*.docx)")
+        if file_names:
+            self.handle_files(file_names)
 
     def handle_file(self, file_path):
-        if not os.path.exists(file_path):
-            QMessageBox.warning(self, "Advertencia", "El archivo no existe.")
+        self.handle_files([file_path])
+
+    def handle_files(self, file_paths):
+        if self.worker is not None and self.worker.isRunning():
+            QMessageBox.warning(self, "Advertencia", "Espera a que termine la conversión en curso.")
+            return
+
+        missing = [path for path in file_paths if not os.path.exists(path)]
+        if missing:
+            QMessageBox.warning(self, "Advertencia", "El archivo no existe:\n" + "\n".join(missing))
             return
         
-        if not file_path.lower().endswith(".docx"):
-            QMessageBox.warning(self, "Advertencia", "Por favor, selecciona un archivo de Word (.docx).")
+        if not all(path.lower().endswith(".docx") for path in file_paths):
+            QMessageBox.warning(self, "Advertencia", "Por favor, selecciona archivos de Word (.docx).")
             return
 
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
-        self.info_label.setText("Convirtiendo a PDF...")
+        self.info_label.setText(f"Convirtiendo {len(file_paths)} archivo(s) a PDF...")
         self.info_label.setAlignment(Qt.AlignCenter)
         
-        output_pdf = os.path.abspath(file_path.replace(".docx", "_convertido.pdf"))
+        jobs = [(path, os.path.abspath(path[:-len(".docx")] + "_convertido.pdf")) for path in file_paths]
         
-        self.worker = WordToPDFWorker(file_path, output_pdf)
+        self.worker = WordToPDFWorker(jobs)
         self.worker.progress_update.connect(self.progress_bar.setValue)
+        self.worker.file_finished.connect(self.on_file_converted)
         self.worker.finished.connect(self.on_conversion_finished)
         self.worker.start()
-        logging.info(f"Conversión de Word a PDF iniciada para: {file_path}")
+        logging.info(f"Conversión de Word a PDF iniciada para {len(jobs)} archivo(s): {file_paths}")
+
+    def on_file_converted(self, src, success, detail):
+        if success:
+            logging.info(f"Word a PDF: {src} -> {detail}")
+        else:
+            logging.error(f"Error al convertir Word a PDF {src}: {detail}")
 
     def on_conversion_finished(self, success, output_path):
         self.progress_bar.setVisible(False)
@@ -296,15 +940,373 @@ class WordToPDFTab(QWidget):
             logging.info(f"Conversión de Word a PDF exitosa. Archivo: {output_path}")
             QMessageBox.information(self, "Conversión exitosa", f"Archivo guardado en:\n{output_path}")
         else:
-            self.info_label.setText(f"Error al convertir. El problema podría ser Pandoc o el archivo.")
+            self.info_label.setText(f"Error al convertir.\n{output_path}")
             logging.error(f"Error al convertir Word a PDF: {output_path}")
 
 
+class TileView(QWidget):
+    """Lienzo de la vista previa: una página al zoom actual, dibujada por mosaicos.
+
+    Donde todavía no hay mosaico se ve la miniatura estirada o, justo después de un
+    cambio de zoom, los mosaicos del zoom anterior reescalados; así acercar, alejar y
+    desplazarse responden enseguida y el detalle llega a medida que se renderiza.
+    """
+    # Mosaicos del zoom actual que se conservan como QPixmap fuera de la zona visible
+    MAX_PIXMAPS = 64
+
+    def __init__(self, dialog):
+        super().__init__()
+        self.dialog = dialog
+        self.page = None
+        self.page_size = (1.0, 1.0)
+        self.zoom = 1.0
+        self.fallback = None
+        self.pixmaps = {}
+        self.previous = None
+        self.drag_start = None
+        self.setCursor(Qt.OpenHandCursor)
+
+    def set_page(self, page, width, height, zoom, fallback):
+        self.page = page
+        self.page_size = (width, height)
+        self.fallback = fallback
+        self.pixmaps = {}
+        self.previous = None
+        self.set_zoom(zoom)
+
+    def set_page_size(self, width, height):
+        self.page_size = (width, height)
+        self.resize(*self.pixel_size())
+
+    def set_zoom(self, zoom):
+        from tiles import zoom_key
+
+        if self.pixmaps and zoom_key(zoom) != zoom_key(self.zoom):
+            self.previous = (self.zoom, self.pixmaps)
+            self.pixmaps = {}
+        self.zoom = zoom
+        self.resize(*self.pixel_size())
+        self.update()
+
+    def pixel_size(self):
+        from tiles import page_pixels
+        return page_pixels(self.page_size[0], self.page_size[1], self.zoom)
+
+    def tile_key(self, col, row):
+        from tiles import zoom_key
+        return (self.dialog.doc_key, self.page, zoom_key(self.zoom), col, row)
+
+    def add_tile(self, col, row, pixmap):
+        from tiles import tile_rect
+
+        self.pixmaps[(col, row)] = pixmap
+        x0, y0, x1, y1 = tile_rect(*self.page_size, self.zoom, col, row)
+        self.update(QRect(x0, y0, x1 - x0, y1 - y0))
+
+    def cached_pixmap(self, col, row):
+        """Mosaico ya renderizado (quizás para otra ventana o antes de un cambio de página)."""
+        from tiles import get_tile_cache
+
+        tile = get_tile_cache().get(self.tile_key(col, row))
+        if tile is None:
+            return None
+        image = QImage(tile.samples, tile.width, tile.height, tile.stride, QImage.Format_RGB888)
+        pixmap = QPixmap.fromImage(image)
+        self.pixmaps[(col, row)] = pixmap
+        return pixmap
+
+    def trim(self, view):
+        """Descarta los QPixmap lejos de view; siguen en el caché de mosaicos si hacen falta."""
+        from tiles import tiles_in_view
+
+        if len(self.pixmaps) > self.MAX_PIXMAPS:
+            keep = set(tiles_in_view(*self.page_size, self.zoom, view, margin=1))
+            self.pixmaps = {tile: pixmap for tile, pixmap in self.pixmaps.items() if tile in keep}
+            # Para entonces el zoom anterior ya no hace falta como relleno
+            self.previous = None
+
+    def paintEvent(self, event):
+        from tiles import tile_rect, tiles_in_view
+
+        painter = QPainter(self)
+        area = event.rect()
+        painter.fillRect(area, QColor("white"))
+        if self.page is None:
+            return
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        if self.fallback is not None:
+            painter.drawPixmap(self.rect(), self.fallback)
+        if self.previous is not None:
+            old_zoom, pixmaps = self.previous
+            scale = self.zoom / old_zoom
+            for (col, row), pixmap in pixmaps.items():
+                x0, y0, x1, y1 = tile_rect(*self.page_size, old_zoom, col, row)
+                target = QRect(int(x0 * scale), int(y0 * scale), math.ceil((x1 - x0) * scale), math.ceil((y1 - y0) * scale))
+                if target.intersects(area):
+                    painter.drawPixmap(target, pixmap)
+        for col, row in tiles_in_view(*self.page_size, self.zoom, (area.x(), area.y(), area.width(), area.height())):
+            pixmap = self.pixmaps.get((col, row)) or self.cached_pixmap(col, row)
+            if pixmap is not None:
+                x0, y0, x1, y1 = tile_rect(*self.page_size, self.zoom, col, row)
+                painter.drawPixmap(QRect(x0, y0, x1 - x0, y1 - y0), pixmap)
+
+    def wheelEvent(self, event):
+        if event.modifiers() & Qt.ControlModifier:
+            self.dialog.zoom_step(1 if event.angleDelta().y() > 0 else -1, event.pos())
+            event.accept()
+        else:
+            event.ignore()
+
+    # Arrastrar con el mouse desplaza la página
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            bars = self.dialog.scroll_area
+            self.drag_start = (event.globalPos(), bars.horizontalScrollBar().value(), bars.verticalScrollBar().value())
+            self.setCursor(Qt.ClosedHandCursor)
+
+    def mouseMoveEvent(self, event):
+        if self.drag_start is not None:
+            origin, x, y = self.drag_start
+            delta = event.globalPos() - origin
+            self.dialog.scroll_area.horizontalScrollBar().setValue(x - delta.x())
+            self.dialog.scroll_area.verticalScrollBar().setValue(y - delta.y())
+
+    def mouseReleaseEvent(self, event):
+        self.drag_start = None
+        self.setCursor(Qt.OpenHandCursor)
+
+
+class PagePreviewDialog(QDialog):
+    """Vista previa de una página en alta resolución, con zoom y navegación entre páginas.
+
+    Se abre con doble clic en el eliminador de páginas; "Eliminar esta página" marca o
+    desmarca la miniatura correspondiente.
+    """
+
+    def __init__(self, tab, pdf_path, page_sizes, page):
+        from tiles import document_key
+
+        super().__init__(tab)
+        self.tab = tab
+        self.pdf_path = pdf_path
+        self.doc_key = document_key(pdf_path)
+        # Tamaños provisorios (cropbox sin rotación) hasta que el worker informe los reales
+        self.page_sizes = list(page_sizes)
+        self.fit_width = True
+        self.setWindowTitle(f"Vista previa - {os.path.basename(pdf_path)}")
+        self.resize(900, 1000)
+        self.init_ui()
+
+        # Agrupa los eventos de desplazamiento y zoom antes de pedir mosaicos
+        self.request_timer = QTimer(self)
+        self.request_timer.setSingleShot(True)
+        self.request_timer.setInterval(15)
+        self.request_timer.timeout.connect(self.send_request)
+        self.scroll_area.horizontalScrollBar().valueChanged.connect(self.request_timer.start)
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self.request_timer.start)
+
+        self.worker = PreviewWorker(pdf_path)
+        self.worker.page_ready.connect(self.on_page_ready)
+        self.worker.tile_ready.connect(self.on_tile_ready)
+        self.worker.error.connect(self.on_error)
+        self.worker.start()
+        # La selección puede cambiar desde la grilla (clics, análisis) con la vista previa abierta
+        self.tab.list_widget.itemSelectionChanged.connect(self.sync_delete_checkbox)
+        self.show_page(page)
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        toolbar = QHBoxLayout()
+        self.prev_button = QPushButton("◀ Anterior")
+        self.prev_button.clicked.connect(lambda: self.show_page(self.view.page - 1))
+        toolbar.addWidget(self.prev_button)
+        self.page_label = QLabel()
+        toolbar.addWidget(self.page_label)
+        self.next_button = QPushButton("Siguiente ▶")
+        self.next_button.clicked.connect(lambda: self.show_page(self.view.page + 1))
+        toolbar.addWidget(self.next_button)
+        toolbar.addStretch()
+
+        zoom_out = QPushButton("−")
+        zoom_out.setFixedWidth(32)
+        zoom_out.setToolTip("Alejar (Ctrl + rueda del mouse)")
+        zoom_out.clicked.connect(lambda: self.zoom_step(-1))
+        toolbar.addWidget(zoom_out)
+        self.zoom_label = QLabel()
+        toolbar.addWidget(self.zoom_label)
+        zoom_in = QPushButton("+")
+        zoom_in.setFixedWidth(32)
+        zoom_in.setToolTip("Acercar (Ctrl + rueda del mouse)")
+        zoom_in.clicked.connect(lambda: self.zoom_step(1))
+        toolbar.addWidget(zoom_in)
+        fit_button = QPushButton("Ajustar al ancho")
+        fit_button.clicked.connect(self.fit_to_width)
+        toolbar.addWidget(fit_button)
+        toolbar.addStretch()
+
+        self.delete_checkbox = QCheckBox("Eliminar esta página")
+        self.delete_checkbox.setToolTip("Marca o desmarca la página para eliminarla (tecla Supr).")
+        self.delete_checkbox.toggled.connect(self.toggle_delete)
+        toolbar.addWidget(self.delete_checkbox)
+        layout.addLayout(toolbar)
+
+        self.view = TileView(self)
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setAlignment(Qt.AlignCenter)
+        self.scroll_area.setWidget(self.view)
+        layout.addWidget(self.scroll_area)
+
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("font-style: italic; color: gray;")
+        layout.addWidget(self.status_label)
+
+        QShortcut(QKeySequence(Qt.Key_PageDown), self, lambda: self.show_page(self.view.page + 1))
+        QShortcut(QKeySequence(Qt.Key_PageUp), self, lambda: self.show_page(self.view.page - 1))
+        QShortcut(QKeySequence(QKeySequence.ZoomIn), self, lambda: self.zoom_step(1))
+        QShortcut(QKeySequence(QKeySequence.ZoomOut), self, lambda: self.zoom_step(-1))
+        QShortcut(QKeySequence(Qt.Key_Delete), self, self.delete_checkbox.toggle)
+
+    def page_count(self):
+        return len(self.page_sizes)
+
+    def width_zoom(self, page):
+        width = self.scroll_area.viewport().width() - self.scroll_area.verticalScrollBar().sizeHint().width()
+        return max(0.05, width / max(self.page_sizes[page][0], 1))
+
+    def show_page(self, page):
+        if not 0 <= page < self.page_count():
+            return
+        zoom = self.width_zoom(page) if self.fit_width else self.view.zoom
+        item = self.tab.list_widget.item(page)
+        fallback = item.icon().pixmap(self.tab.list_widget.iconSize()) if item is not None else None
+        self.view.set_page(page, *self.page_sizes[page], zoom, fallback)
+        self.scroll_area.verticalScrollBar().setValue(0)
+        self.page_label.setText(f"Página {page + 1} de {self.page_count()}")
+        self.prev_button.setEnabled(page > 0)
+        self.next_button.setEnabled(page < self.page_count() - 1)
+        self.sync_delete_checkbox()
+        self.update_zoom_label()
+        self.send_request()
+
+    def sync_delete_checkbox(self):
+        item = self.tab.list_widget.item(self.view.page)
+        self.delete_checkbox.blockSignals(True)
+        self.delete_checkbox.setChecked(item is not None and item.isSelected())
+        self.delete_checkbox.blockSignals(False)
+
+    def update_zoom_label(self):
+        self.zoom_label.setText(f"{self.view.zoom * 100:.0f} % ({self.view.zoom * 72:.0f} ppp)")
+
+    def set_zoom(self, zoom, anchor=None):
+        """Cambia el zoom manteniendo fijo el punto anchor del área visible (por defecto, el centro)."""
+        from tiles import ZOOM_LEVELS
+
+        zoom = max(ZOOM_LEVELS[0], min(ZOOM_LEVELS[-1], zoom))
+        viewport = self.scroll_area.viewport()
+        if anchor is None:
+            anchor = QPoint(viewport.width() // 2, viewport.height() // 2)
+        else:
+            anchor = self.view.mapTo(viewport, anchor)
+        hbar, vbar = self.scroll_area.horizontalScrollBar(), self.scroll_area.verticalScrollBar()
+        content = self.view.mapFrom(viewport, anchor)
+        scale = zoom / self.view.zoom
+        self.view.set_zoom(zoom)
+        hbar.setValue(int(content.x() * scale - anchor.x()))
+        vbar.setValue(int(content.y() * scale - anchor.y()))
+        self.update_zoom_label()
+        self.request_timer.start()
+
+    def zoom_step(self, direction, anchor=None):
+        from tiles import ZOOM_LEVELS
+
+        self.fit_width = False
+        current = self.view.zoom
+        if direction > 0:
+            zoom = next((level for level in ZOOM_LEVELS if level > current * 1.01), ZOOM_LEVELS[-1])
+        else:
+            zoom = next((level for level in reversed(ZOOM_LEVELS) if level < current * 0.99), ZOOM_LEVELS[0])
+        self.set_zoom(zoom, anchor)
+
+    def fit_to_width(self):
+        self.fit_width = True
+        self.set_zoom(self.width_zoom(self.view.page))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.fit_width and self.view.page is not None:
+            self.set_zoom(self.width_zoom(self.view.page))
+
+    def visible_area(self):
+        viewport = self.scroll_area.viewport()
+        top_left = self.view.mapFrom(viewport, QPoint(0, 0))
+        return max(0, top_left.x()), max(0, top_left.y()), viewport.width(), viewport.height()
+
+    def send_request(self):
+        if self.view.page is None:
+            return
+        view = self.visible_area()
+        self.view.trim(view)
+        page = self.view.page
+        self.worker.request(page, self.view.zoom, view, neighbors=(page + 1, page - 1))
+
+    def on_page_ready(self, page, width, height):
+        if self.page_sizes[page] == (width, height):
+            return
+        # Rotada o con otro cuadro visible que el cropbox: se corrige el lienzo y se vuelve a pedir
+        self.page_sizes[page] = (width, height)
+        if page == self.view.page:
+            if self.fit_width:
+                self.view.set_page_size(width, height)
+                self.set_zoom(self.width_zoom(page))
+            else:
+                self.view.set_page_size(width, height)
+                self.request_timer.start()
+
+    def on_tile_ready(self, key, image):
+        from tiles import zoom_key
+
+        _, page, zoom, col, row = key
+        if page == self.view.page and zoom == zoom_key(self.view.zoom):
+            self.view.add_tile(col, row, QPixmap.fromImage(image))
+
+    def toggle_delete(self, checked):
+        item = self.tab.list_widget.item(self.view.page)
+        if item is not None:
+            item.setSelected(checked)
+
+    def on_error(self, message):
+        self.status_label.setText(f"No se pudo renderizar la vista previa: {message}")
+        logging.error(f"Error en la vista previa de {self.pdf_path}: {message}")
+
+    def done(self, result):
+        # Cerrar la ventana, Esc y close() pasan por acá. El mosaico en curso es lo único que queda por terminar
+        self.tab.list_widget.itemSelectionChanged.disconnect(self.sync_delete_checkbox)
+        self.worker.stop()
+        self.worker.wait()
+        super().done(result)
+        self.deleteLater()
+
+
 class PageRemoverTab(QWidget):
+    # Páginas extra (en múltiplos del área visible) que se renderizan o conservan alrededor del viewport
+    PREFETCH_SCREENS = 1
+    KEEP_SCREENS = 3
+
     def __init__(self):
         super().__init__()
         self.setAcceptDrops(True)
         self.input_pdf = None
+        self.session = None
+        self.thumbnail_worker = None
+        self.analysis_worker = None
+        self.pipeline_worker = None
+        self.size_worker = None
+        self.preview = None
+        self.rendered_pages = set()
+        self.page_sizes = []
+        self.placeholder_icons = {}
         self.init_ui()
 
     def init_ui(self):
@@ -326,6 +1328,7 @@ class PageRemoverTab(QWidget):
         self.list_widget.setAcceptDrops(False)
         self.list_widget.setDragDropMode(QAbstractItemView.NoDragDrop)
         self.list_widget.setSelectionMode(QAbstractItemView.MultiSelection)
+        self.list_widget.setUniformItemSizes(True)
         self.list_widget.setStyleSheet("""
             QListWidget::item:selected {
                 background-color: #007bff;
@@ -334,7 +1337,38 @@ class PageRemoverTab(QWidget):
         """)
         
         self.list_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        main_layout.addWidget(self.list_widget)
+        self.list_widget.setToolTip("Doble clic para ver la página en alta resolución.")
+        self.list_widget.itemDoubleClicked.connect(self.open_preview)
+
+        # Peso por página, ordenable; un clic lleva a la página en la grilla
+        self.size_table = QTableWidget(0, 6)
+        self.size_table.setHorizontalHeaderLabels(["Página", "Total", "Imágenes", "Fuentes", "Contenido", "Otros"])
+        self.size_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.size_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.size_table.verticalHeader().setVisible(False)
+        self.size_table.setFixedWidth(460)
+        self.size_table.cellClicked.connect(self.scroll_to_size_row)
+        self.size_table.setVisible(False)
+
+        grid_layout = QHBoxLayout()
+        grid_layout.addWidget(self.list_widget)
+        grid_layout.addWidget(self.size_table)
+        main_layout.addLayout(grid_layout)
+
+        # Agrupa los eventos de scroll/redimensión antes de pedir miniaturas
+        self.viewport_timer = QTimer(self)
+        self.viewport_timer.setSingleShot(True)
+        self.viewport_timer.setInterval(80)
+        self.viewport_timer.timeout.connect(self.update_visible_thumbnails)
+        self.list_widget.verticalScrollBar().valueChanged.connect(self.viewport_timer.start)
+        self.list_widget.verticalScrollBar().rangeChanged.connect(self.viewport_timer.start)
+
+        # Los lotes que llegan del renderizador se aplican juntos en un solo repintado
+        self.pending_thumbnails = {}
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(30)
+        self.flush_timer.timeout.connect(self.flush_thumbnails)
 
         hlayout = QHBoxLayout()
         hlayout.addStretch()
@@ -347,6 +1381,14 @@ class PageRemoverTab(QWidget):
         self.open_button.setStyleSheet("""font-size: 14px;""")
         hlayout.addWidget(self.open_button)
 
+        self.analyze_button = QPushButton("Detectar en blanco y duplicadas")
+        self.analyze_button.setFixedSize(230, 40)
+        self.analyze_button.clicked.connect(self.analyze_pages)
+        self.analyze_button.setEnabled(False)
+        self.analyze_button.setToolTip("Selecciona las páginas en blanco y las escaneadas dos veces para revisarlas antes de eliminarlas.")
+        self.analyze_button.setStyleSheet("""font-size: 14px;""")
+        hlayout.addWidget(self.analyze_button)
+
         self.remove_button = QPushButton("Eliminar Páginas Seleccionadas y Guardar como...")
         self.remove_button.setFixedSize(350, 40)
         self.remove_button.clicked.connect(self.remove_pages_and_save)
@@ -378,6 +1420,15 @@ class PageRemoverTab(QWidget):
         self.secure_delete_checkbox = QCheckBox("Eliminar archivo original de forma segura")
         self.secure_delete_checkbox.setToolTip("Sobrescribe el archivo original para que no pueda ser recuperado.")
         checkbox_layout.addWidget(self.secure_delete_checkbox)
+
+        self.sizes_checkbox = QCheckBox("Mostrar peso por página")
+        self.sizes_checkbox.setToolTip("Muestra cuánto ocupa cada página (imágenes, fuentes, contenido) para decidir qué eliminar.")
+        self.sizes_checkbox.toggled.connect(self.toggle_page_sizes)
+        checkbox_layout.addWidget(self.sizes_checkbox)
+
+        self.compress_checkbox = QCheckBox("Comprimir al guardar")
+        self.compress_checkbox.setToolTip("Comprime el resultado en el mismo paso, sin archivos intermedios.")
+        checkbox_layout.addWidget(self.compress_checkbox)
         
         checkbox_layout.addStretch()
         main_layout.addLayout(checkbox_layout)
@@ -401,30 +1452,279 @@ class PageRemoverTab(QWidget):
             self.handle_file(file_name)
 
     def handle_file(self, file_path):
+        self.stop_thumbnail_worker()
+        self.stop_analysis_worker()
         self.input_pdf = file_path
         self.list_widget.clear()
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setValue(0)
+        self.rendered_pages = set()
+        self.progress_bar.setVisible(False)
         self.remove_button.setEnabled(False)
+        self.analyze_button.setEnabled(False)
         self.secure_delete_checkbox.setChecked(False)  
-        
-        self.worker = Worker("render_pdf", file_path)
-        self.worker.progress_update.connect(self.progress_bar.setValue)
-        self.worker.finished.connect(self.on_pdf_rendered)
-        self.worker.error.connect(self.on_error)
-        self.worker.start()
-        logging.info(f"PDF abierto para eliminación de páginas: {file_path}")
 
-    def on_pdf_rendered(self, images, pdf_path):
-        self.pages = images
-        for i, img in enumerate(self.pages):
-            pixmap = QPixmap.fromImage(QImage(img.tobytes(), img.width, img.height, img.width*3, QImage.Format_RGB888))
+        from pipeline import open_session
+
+        try:
+            self.release_session()
+            # La sesión queda abierta: guardar reutiliza el documento ya analizado
+            self.session = open_session(file_path)
+            with self.session.lock:
+                doc = self.session.document()
+                # page_cropbox no carga la página: abrir 1500 páginas cuesta lo mismo que abrir 10
+                self.page_sizes = [(rect.width, rect.height) for rect in (doc.page_cropbox(i) for i in range(len(doc)))]
+        except Exception as e:
+            self.release_session()
+            self.on_error(str(e))
+            return
+
+        self.list_widget.setUpdatesEnabled(False)
+        for i in range(len(self.page_sizes)):
             item = QListWidgetItem(f"Página {i+1}")
-            item.setIcon(QIcon(pixmap.scaled(self.list_widget.iconSize(), Qt.KeepAspectRatio, Qt.SmoothTransformation)))
+            item.setIcon(self.placeholder_icon(i))
             self.list_widget.addItem(item)
-        
-        self.progress_bar.setVisible(False)
+        self.list_widget.setUpdatesEnabled(True)
         self.remove_button.setEnabled(True)
+        self.analyze_button.setEnabled(True)
+        if self.sizes_checkbox.isChecked():
+            self.toggle_page_sizes(True)
+
+        self.thumbnail_worker = ThumbnailWorker(file_path)
+        self.thumbnail_worker.thumbnails_ready.connect(self.on_thumbnails_ready)
+        self.thumbnail_worker.progress_update.connect(self.on_render_progress)
+        self.thumbnail_worker.error.connect(self.on_error)
+        self.thumbnail_worker.start()
+        self.viewport_timer.start()
+        logging.info(f"PDF abierto para eliminación de páginas: {file_path}")
+
+    def release_session(self):
+        if self.session is not None:
+            from pipeline import release_session
+            release_session(self.session)
+            self.session = None
+
+    def toggle_page_sizes(self, checked):
+        if not checked:
+            self.size_table.setVisible(False)
+            for index in range(self.list_widget.count()):
+                item = self.list_widget.item(index)
+                item.setText(item.text().split(" · ")[0])
+                item.setToolTip("")
+            return
+        if self.session is None:
+            return
+        retire_worker(self.size_worker)
+        self.size_worker = PageSizeWorker(self.input_pdf, self.session)
+        self.size_worker.finished.connect(self.on_page_sizes_ready)
+        self.size_worker.error.connect(self.on_error)
+        self.size_worker.start()
+
+    def on_page_sizes_ready(self, index):
+        if self.sender() is not self.size_worker or not self.sizes_checkbox.isChecked():
+            return
+        from pdf_inspector import CATEGORIES, CATEGORY_LABELS
+
+        if len(index.pages) != self.list_widget.count():
+            return
+        self.list_widget.setUpdatesEnabled(False)
+        for number, sizes in enumerate(index.pages):
+            item = self.list_widget.item(number)
+            item.setText(f"{item.text().split(' · ')[0]} · {format_size(sizes['total'])}")
+            item.setToolTip("\n".join(f"{CATEGORY_LABELS[category]}: {format_size(sizes[category])}"
+                                      for category in CATEGORIES))
+        self.list_widget.setUpdatesEnabled(True)
+
+        self.size_table.setSortingEnabled(False)
+        self.size_table.setRowCount(len(index.pages))
+        for number, sizes in enumerate(index.pages):
+            cells = [(str(number + 1), number)] + [(format_size(sizes[key]), sizes[key]) for key in ("total",) + CATEGORIES]
+            for column, (text, value) in enumerate(cells):
+                cell = SortableItem(text)
+                cell.setData(Qt.UserRole, value)
+                self.size_table.setItem(number, column, cell)
+        self.size_table.setSortingEnabled(True)
+        self.size_table.sortItems(1, Qt.DescendingOrder)
+        self.size_table.setVisible(True)
+        logging.info(f"Peso por página mostrado para {self.input_pdf}")
+
+    def scroll_to_size_row(self, row, column):
+        page = self.size_table.item(row, 0).data(Qt.UserRole)
+        self.list_widget.scrollToItem(self.list_widget.item(page), QAbstractItemView.PositionAtCenter)
+
+    def stop_analysis_worker(self):
+        if self.analysis_worker is not None:
+            self.analysis_worker.stop()
+            self.analysis_worker.wait()
+            self.analysis_worker = None
+
+    def analyze_pages(self):
+        self.stop_analysis_worker()
+        self.analyze_button.setEnabled(False)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(0)
+        self.analysis_worker = PageAnalysisWorker(self.input_pdf)
+        self.analysis_worker.progress_update.connect(self.progress_bar.setValue)
+        self.analysis_worker.finished.connect(self.on_analysis_finished)
+        self.analysis_worker.error.connect(self.on_error)
+        self.analysis_worker.finished.connect(lambda _: self.analyze_button.setEnabled(True))
+        self.analysis_worker.error.connect(lambda _: self.analyze_button.setEnabled(True))
+        self.analysis_worker.cancelled.connect(self.on_analysis_cancelled)
+        self.analysis_worker.start()
+
+    def on_analysis_cancelled(self):
+        # Cancelado desde la pestaña Trabajos; si lo reemplazó otro análisis no hay nada que hacer
+        if self.sender() is not self.analysis_worker:
+            return
+        self.progress_bar.setVisible(False)
+        self.analyze_button.setEnabled(True)
+
+    def on_analysis_finished(self, result):
+        """Preselecciona las candidatas (sin tocar lo que el usuario ya eligió) y las rotula."""
+        if self.sender() is not self.analysis_worker:
+            return
+        self.progress_bar.setVisible(False)
+        from page_analysis import removal_candidates
+
+        self.list_widget.setUpdatesEnabled(False)
+        for index in result.blank:
+            self.list_widget.item(index).setText(f"Página {index + 1} (en blanco)")
+        for index, original in result.duplicates.items():
+            self.list_widget.item(index).setText(f"Página {index + 1} (igual a la {original + 1})")
+        candidates = removal_candidates(result)
+        for index in candidates:
+            self.list_widget.item(index).setSelected(True)
+        self.list_widget.setUpdatesEnabled(True)
+        if self.sizes_checkbox.isChecked():
+            # Los rótulos nuevos pisaron el peso; el índice está en caché
+            self.toggle_page_sizes(True)
+        if candidates:
+            self.list_widget.scrollToItem(self.list_widget.item(candidates[0]))
+            QMessageBox.information(self, "Análisis", f"Se seleccionaron {len(result.blank)} páginas en blanco y "
+                                                      f"{len(result.duplicates)} duplicadas. Revísalas antes de eliminarlas.")
+        else:
+            QMessageBox.information(self, "Análisis", "No se encontraron páginas en blanco ni duplicadas.")
+
+    def open_preview(self, item):
+        page = self.list_widget.row(item)
+        # En selección múltiple el doble clic alterna la selección dos veces: queda como estaba
+        if self.preview is not None:
+            self.preview.show_page(page)
+            self.preview.raise_()
+            self.preview.activateWindow()
+            return
+        try:
+            self.preview = PagePreviewDialog(self, self.input_pdf, self.page_sizes, page)
+        except OSError as e:
+            self.on_error(str(e))
+            return
+        self.preview.finished.connect(lambda _, preview=self.preview: self.on_preview_closed(preview))
+        self.preview.show()
+
+    def on_preview_closed(self, preview):
+        if self.preview is preview:
+            self.preview = None
+
+    def close_preview(self):
+        if self.preview is not None:
+            self.preview.close()
+            self.preview = None
+
+    def stop_thumbnail_worker(self):
+        # La vista previa también tiene abierto el archivo
+        self.close_preview()
+        if self.thumbnail_worker is not None:
+            self.thumbnail_worker.stop()
+            self.thumbnail_worker.wait()
+            self.thumbnail_worker = None
+        self.flush_timer.stop()
+        self.pending_thumbnails = {}
+        self.progress_bar.setVisible(False)
+
+    def placeholder_icon(self, index):
+        """Icono gris con la proporción de la página, compartido entre páginas del mismo tamaño."""
+        width, height = self.page_sizes[index]
+        target = QSize(max(1, int(width)), max(1, int(height))).scaled(self.list_widget.iconSize(), Qt.KeepAspectRatio)
+        key = (target.width(), target.height())
+        if key not in self.placeholder_icons:
+            pixmap = QPixmap(target)
+            pixmap.fill(Qt.lightGray)
+            self.placeholder_icons[key] = QIcon(pixmap)
+        return self.placeholder_icons[key]
+
+    def visible_page_range(self):
+        """Devuelve (primera, última) fila visible buscando por bisección sobre las posiciones de los ítems."""
+        count = self.list_widget.count()
+        if count == 0:
+            return None
+        height = self.list_widget.viewport().height()
+        model = self.list_widget.model()
+
+        def first_row(predicate):
+            low, high = 0, count
+            while low < high:
+                mid = (low + high) // 2
+                if predicate(self.list_widget.visualRect(model.index(mid, 0))):
+                    high = mid
+                else:
+                    low = mid + 1
+            return low
+
+        first = first_row(lambda rect: rect.bottom() >= 0)
+        last = first_row(lambda rect: rect.top() > height) - 1
+        if first >= count or last < first:
+            return None
+        return first, last
+
+    def update_visible_thumbnails(self):
+        if self.thumbnail_worker is None:
+            return
+        visible = self.visible_page_range()
+        if visible is None:
+            return
+        first, last = visible
+        count = self.list_widget.count()
+        span = last - first + 1
+
+        # Primero las visibles, luego las cercanas por distancia al viewport
+        wanted = list(range(first, last + 1))
+        for offset in range(1, span * self.PREFETCH_SCREENS + 1):
+            if last + offset < count:
+                wanted.append(last + offset)
+            if first - offset >= 0:
+                wanted.append(first - offset)
+        missing = [i for i in wanted if i not in self.rendered_pages]
+        self.thumbnail_worker.request_pages(missing)
+        if not missing:
+            self.progress_bar.setVisible(False)
+
+        keep_from = first - span * self.KEEP_SCREENS
+        keep_to = last + span * self.KEEP_SCREENS
+        for index in [i for i in self.rendered_pages if i < keep_from or i > keep_to]:
+            self.list_widget.item(index).setIcon(self.placeholder_icon(index))
+            self.rendered_pages.discard(index)
+
+    def on_thumbnails_ready(self, batch):
+        if self.sender() is not self.thumbnail_worker:
+            return
+        self.pending_thumbnails.update(batch)
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush_thumbnails(self):
+        pending, self.pending_thumbnails = self.pending_thumbnails, {}
+        count = self.list_widget.count()
+        self.list_widget.setUpdatesEnabled(False)
+        for index, image in pending.items():
+            if index < count:
+                # La imagen ya viene al tamaño del icono: solo queda la conversión a QPixmap
+                self.list_widget.item(index).setIcon(QIcon(QPixmap.fromImage(image)))
+                self.rendered_pages.add(index)
+        self.list_widget.setUpdatesEnabled(True)
+
+    def on_render_progress(self, value):
+        if self.sender() is not self.thumbnail_worker:
+            return
+        self.progress_bar.setValue(value)
+        self.progress_bar.setVisible(value < 100)
 
     def remove_pages_and_save(self):
         selected = self.list_widget.selectedIndexes()
@@ -436,20 +1736,80 @@ class PageRemoverTab(QWidget):
 
         out_path, _ = QFileDialog.getSaveFileName(self, "Guardar PDF sin páginas", "", "Archivos PDF (*.pdf)")
         if out_path:
-            remove_selected_pages(self.input_pdf, out_path, to_remove)
-            
-            if self.secure_delete_checkbox.isChecked():
-                try:
-                    secure_delete_file(self.input_pdf)
-                    QMessageBox.information(self, "Éxito", "PDF guardado exitosamente sin las páginas seleccionadas. El archivo original ha sido eliminado de forma segura.")
-                    logging.info(f"Archivo original {self.input_pdf} eliminado de forma segura.")
-                except Exception as e:
-                    QMessageBox.warning(self, "Advertencia", f"El archivo original se guardó, pero no se pudo eliminar de forma segura: {e}")
-                    logging.error(f"Fallo en el borrado seguro de {self.input_pdf}: {e}")
-            else:
-                QMessageBox.information(self, "Éxito", "PDF guardado exitosamente sin las páginas seleccionadas.")
-            
-            logging.info(f"Páginas eliminadas de {self.input_pdf}. Nuevo archivo guardado en: {out_path}")
+            overwrite = os.path.exists(out_path) and os.path.samefile(self.input_pdf, out_path)
+            if overwrite:
+                # El renderizador y el análisis tienen abierto el archivo que se va a reemplazar
+                self.stop_thumbnail_worker()
+                self.stop_analysis_worker()
+
+            if self.compress_checkbox.isChecked():
+                from pipeline import Pipeline, RemovePagesStage, CompressStage, open_session
+
+                pipeline = Pipeline([RemovePagesStage(to_remove),
+                                     CompressStage("ebook", get_setting("compression_engine"))])
+                self.progress_bar.setVisible(True)
+                self.progress_bar.setValue(0)
+                self.remove_button.setEnabled(False)
+                # El trabajo toma su propia referencia: la pestaña puede abrir otro archivo mientras tanto
+                self.pipeline_worker = PipelineWorker(pipeline, open_session(self.input_pdf), out_path)
+                self.pipeline_worker.progress_update.connect(lambda value, stage: self.progress_bar.setValue(value))
+                self.pipeline_worker.finished.connect(
+                    lambda success, message: self.on_pipeline_finished(success, message, out_path, overwrite))
+                self.pipeline_worker.start()
+                return
+
+            from pdf_utils import remove_selected_pages
+
+            if overwrite:
+                self.session.close()
+            try:
+                remove_selected_pages(self.input_pdf, out_path, to_remove)
+            except Exception as e:
+                self.on_error(str(e))
+                return
+            self.after_save(out_path, overwrite)
+
+    def on_pipeline_finished(self, success, message, out_path, overwrite):
+        self.progress_bar.setVisible(False)
+        self.remove_button.setEnabled(True)
+        if not success:
+            if overwrite:
+                self.handle_file(self.input_pdf)
+            self.on_error(message)
+            return
+        self.after_save(out_path, overwrite)
+
+    def after_save(self, out_path, overwrite):
+        """Recarga el archivo si se sobrescribió y, si se pidió, borra el original de forma segura."""
+        if overwrite:
+            self.handle_file(out_path)
+
+        logging.info(f"Páginas eliminadas de {self.input_pdf}. Nuevo archivo guardado en: {out_path}")
+
+        # Si se sobrescribió el original no queda nada que borrar
+        if self.secure_delete_checkbox.isChecked() and not overwrite:
+            # El renderizador y la sesión mantienen el archivo abierto; hay que liberarlo antes de borrarlo
+            self.stop_thumbnail_worker()
+            self.release_session()
+            self.progress_bar.setVisible(True)
+            self.progress_bar.setValue(0)
+            self.remove_button.setEnabled(False)
+            self.shred_worker = ShredWorker([self.input_pdf])
+            self.shred_worker.progress_update.connect(self.progress_bar.setValue)
+            self.shred_worker.finished.connect(self.on_shred_finished)
+            self.shred_worker.start()
+        else:
+            QMessageBox.information(self, "Éxito", "PDF guardado exitosamente sin las páginas seleccionadas.")
+
+    def on_shred_finished(self, success, message):
+        self.progress_bar.setVisible(False)
+        self.remove_button.setEnabled(True)
+        if success:
+            QMessageBox.information(self, "Éxito", "PDF guardado exitosamente sin las páginas seleccionadas. El archivo original ha sido eliminado de forma segura.")
+            logging.info(f"Archivo original {self.input_pdf} eliminado de forma segura.")
+        else:
+            QMessageBox.warning(self, "Advertencia", f"El archivo original se guardó, pero no se pudo eliminar de forma segura: {message}")
+            logging.error(f"Fallo en el borrado seguro de {self.input_pdf}: {message}")
             
     def on_error(self, message):
         self.progress_bar.setVisible(False)
@@ -461,6 +1821,11 @@ class PDFCompressorTab(QWidget):
         super().__init__(parent)
         self.setAcceptDrops(True)
         self.input_pdf = None
+        self.batch_files = []
+        self.worker = None
+        self.size_worker = None
+        # Sesión compartida con el eliminador de páginas si ambos tienen abierto el mismo PDF
+        self.session = None
         self.init_ui()
 
     def init_ui(self):
@@ -470,13 +1835,35 @@ class PDFCompressorTab(QWidget):
         self.label.setAlignment(Qt.AlignCenter)
         self.label.setStyleSheet("font-size: 16px; color: gray; min-height: 300px;")
         layout.addWidget(self.label)
+
+        # Resumen por archivo del modo por lotes
+        self.batch_table = QTableWidget(0, 4)
+        self.batch_table.setHorizontalHeaderLabels(["Archivo", "Estado", "Original", "Comprimido"])
+        self.batch_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.batch_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.batch_table.setMinimumHeight(300)
+        self.batch_table.setVisible(False)
+        layout.addWidget(self.batch_table)
         
+        open_layout = QHBoxLayout()
+        open_layout.addStretch()
+
         self.open_button = QPushButton("Abrir PDF")
         self.open_button.clicked.connect(self.open_file_dialog)
         self.open_button.setFixedSize(150, 40) 
-        self.open_button.setToolTip("Abre el explorador de archivos para seleccionar un documento PDF a comprimir.")
+        self.open_button.setToolTip("Abre el explorador de archivos para seleccionar uno o varios documentos PDF a comprimir.")
         self.open_button.setIcon(QIcon(resource_path('recursos/pdflogo.png')))
-        layout.addWidget(self.open_button, alignment=Qt.AlignCenter)
+        open_layout.addWidget(self.open_button)
+
+        self.open_folder_button = QPushButton("Abrir Carpeta")
+        self.open_folder_button.clicked.connect(self.open_folder_dialog)
+        self.open_folder_button.setFixedSize(150, 40)
+        self.open_folder_button.setToolTip("Comprime todos los PDF de una carpeta.")
+        self.open_folder_button.setIcon(QIcon(resource_path('recursos/folder.png')))
+        open_layout.addWidget(self.open_folder_button)
+
+        open_layout.addStretch()
+        layout.addLayout(open_layout)
 
         self.progress_bar = QProgressBar(self)
         self.progress_bar.setVisible(False)
@@ -486,7 +1873,8 @@ class PDFCompressorTab(QWidget):
         combo_layout.addStretch()
         
         self.quality_combo = QComboBox()
-        self.quality_combo.addItems(["Compresion Extrema (menos calidad)", "Compresion Recomendada (Buena Calidad)", "Baja Compresion (Alta Calidad)"])
+        self.quality_combo.addItems(["Compresion Extrema (menos calidad)", "Compresion Recomendada (Buena Calidad)", "Baja Compresion (Alta Calidad)", "Ajustar a un Tamaño Maximo (MB)"])
+        self.quality_combo.currentIndexChanged.connect(lambda index: self.target_spin.setVisible(index == 3))
         self.quality_combo.setFixedSize(280, 30)
         self.quality_combo.setStyleSheet("""
             QComboBox {
@@ -498,10 +1886,36 @@ class PDFCompressorTab(QWidget):
             }
         """)
         combo_layout.addWidget(self.quality_combo)
+
+        self.target_spin = QDoubleSpinBox()
+        self.target_spin.setRange(0.5, 2048)
+        self.target_spin.setDecimals(1)
+        self.target_spin.setValue(25)
+        self.target_spin.setSuffix(" MB")
+        self.target_spin.setFixedSize(100, 30)
+        self.target_spin.setToolTip("Tamaño máximo del PDF comprimido (por ejemplo, el límite de adjuntos del correo).")
+        self.target_spin.setVisible(False)
+        combo_layout.addWidget(self.target_spin)
         combo_layout.addStretch()
         
         layout.addLayout(combo_layout)
 
+        sharded_layout = QHBoxLayout()
+        sharded_layout.addStretch()
+        self.sharded_checkbox = QCheckBox("Dividir archivos grandes y comprimir en paralelo")
+        self.sharded_checkbox.setToolTip("Comprime por partes los PDF de muchas páginas usando todos los núcleos del equipo.")
+        self.sharded_checkbox.setChecked(True)
+        sharded_layout.addWidget(self.sharded_checkbox)
+
+        self.engine_combo = QComboBox()
+        self.engine_combo.addItems(["Motor: Ghostscript", "Motor: Nativo (más rápido en escaneos)"])
+        self.engine_combo.setToolTip("El motor nativo recodifica solo las imágenes del PDF, sin Ghostscript. "
+                                     "El modo de tamaño máximo y la división en partes usan siempre Ghostscript.")
+        self.engine_combo.setCurrentIndex(1 if get_setting("compression_engine") == "native" else 0)
+        sharded_layout.addWidget(self.engine_combo)
+        sharded_layout.addStretch()
+        layout.addLayout(sharded_layout)
+
         self.size_layout = QHBoxLayout()
         self.size_layout.addStretch()  
 
@@ -531,37 +1945,105 @@ class PDFCompressorTab(QWidget):
         self.compress_button.setFixedSize(300, 40)
         self.compress_button.clicked.connect(self.process_pdf) 
         
-        self.compress_button.setEnabled(False)
-        
-        self.compress_button.setStyleSheet("""
-            QPushButton {
-                background-color: #bdc3c7;
-                color: #808080;
-                font-weight: bold;
-                border-radius: 5px;
-            }
-        """)
+        self.set_compress_button_enabled(False)
         self.compress_button.setIcon(QIcon(resource_path('recursos/compress.png')))
         
         layout.addWidget(self.compress_button, alignment=Qt.AlignCenter)
 
+        self.cancel_button = QPushButton("Cancelar")
+        self.cancel_button.setFixedSize(150, 30)
+        self.cancel_button.setToolTip("Detiene la compresión en curso y descarta el archivo parcial.")
+        self.cancel_button.clicked.connect(self.cancel_compression)
+        self.cancel_button.setVisible(False)
+        layout.addWidget(self.cancel_button, alignment=Qt.AlignCenter)
+
         self.setLayout(layout)
         
+    def set_compress_button_enabled(self, enabled):
+        self.compress_button.setEnabled(enabled)
+        if enabled:
+            self.compress_button.setStyleSheet("""
+                QPushButton {
+                    background-color: #4CAF50;
+                    color: white;
+                    font-weight: bold;
+                    border-radius: 5px;
+                }
+                QPushButton:hover {
+                    background-color: #45a049;
+                }
+                QPushButton:pressed {
+                    background-color: #3e8e41;
+                }
+            """)
+        else:
+            self.compress_button.setStyleSheet("""
+                QPushButton {
+                    background-color: #bdc3c7;
+                    color: #808080;
+                    font-weight: bold;
+                    border-radius: 5px;
+                }
+            """)
+
     def open_file_dialog(self):
-        file_name, _ = QFileDialog.getOpenFileName(self, "Seleccionar PDF", "", "Archivos PDF (*.pdf)")
-        if file_name:
-            self.handle_file(file_name)
+        file_names, _ = QFileDialog.getOpenFileNames(self, "Seleccionar PDF", "", "Archivos PDF (*.pdf)")
+        if file_names:
+            self.handle_files(file_names)
+
+    def open_folder_dialog(self):
+        folder = QFileDialog.getExistingDirectory(self, "Seleccionar carpeta con PDF")
+        if folder:
+            self.handle_files([folder])
 
     def dragEnterEvent(self, event):
-        if event.mimeData().hasUrls() and all(url.isLocalFile() and url.toLocalFile().lower().endswith(".pdf") for url in event.mimeData().urls()):
+        if event.mimeData().hasUrls() and all(url.isLocalFile() and (url.toLocalFile().lower().endswith(".pdf") or os.path.isdir(url.toLocalFile())) for url in event.mimeData().urls()):
             event.accept()
         else:
             event.ignore()
 
     def dropEvent(self, event):
-        for url in event.mimeData().urls():
-            self.handle_file(url.toLocalFile())
-            break
+        self.handle_files([url.toLocalFile() for url in event.mimeData().urls()])
+
+    def handle_files(self, paths):
+        """Un solo PDF usa el flujo normal; varios archivos o una carpeta activan el modo por lotes."""
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                files.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                    if name.lower().endswith(".pdf")))
+            else:
+                files.append(path)
+
+        if not files:
+            QMessageBox.warning(self, "Advertencia", "No se encontraron archivos PDF.")
+        elif len(files) == 1 and not os.path.isdir(paths[0]):
+            self.handle_file(files[0])
+        else:
+            self.load_batch(files)
+
+    def load_batch(self, files):
+        files = [f for f in files if f.lower().endswith(".pdf") and os.path.exists(f)]
+        self.release_session()
+        self.input_pdf = None
+        self.batch_files = files
+        self.label.setVisible(False)
+        self.batch_table.setVisible(True)
+        self.batch_table.setRowCount(len(files))
+        total = 0
+        for row, file_path in enumerate(files):
+            size = os.path.getsize(file_path)
+            total += size
+            self.batch_table.setItem(row, 0, QTableWidgetItem(os.path.basename(file_path)))
+            self.batch_table.setItem(row, 1, QTableWidgetItem("En cola"))
+            self.batch_table.setItem(row, 2, QTableWidgetItem(self.format_size(size)))
+            self.batch_table.setItem(row, 3, QTableWidgetItem(""))
+
+        self.status_label.setText(f"Estado: {len(files)} archivos cargados")
+        self.status_label.setStyleSheet("font-style: italic; color: #2ecc71;")
+        self.original_size_label.setText(f"Tamaño Original: {self.format_size(total)}")
+        self.compressed_size_label.setText("Tamaño Comprimido: N/A")
+        self.set_compress_button_enabled(bool(files))
             
     def handle_file(self, file_path):
         if not os.path.exists(file_path):
@@ -572,7 +2054,14 @@ class PDFCompressorTab(QWidget):
             QMessageBox.warning(self, "Advertencia", "Por favor, selecciona un archivo PDF.")
             return
 
+        from pipeline import open_session
+
+        self.release_session()
         self.input_pdf = file_path
+        self.session = open_session(file_path)
+        self.batch_files = []
+        self.batch_table.setVisible(False)
+        self.label.setVisible(True)
         self.original_size = os.path.getsize(file_path)
         
         self.status_label.setText(f"Estado: Archivo cargado - {os.path.basename(file_path)}")
@@ -580,24 +2069,54 @@ class PDFCompressorTab(QWidget):
         
         self.original_size_label.setText(f"Tamaño Original: {self.format_size(self.original_size)}")
         self.compressed_size_label.setText("Tamaño Comprimido: N/A")
-        
-        self.compress_button.setStyleSheet("""
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                font-weight: bold;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-            QPushButton:pressed {
-                background-color: #3e8e41;
-            }
-        """)
-        self.compress_button.setEnabled(True)
+        self.set_compress_button_enabled(True)
+
+        # Qué páginas pesan más, para decidir antes de esperar a Ghostscript
+        self.label.setText(f"{os.path.basename(file_path)}\nAnalizando el peso de cada página...")
+        retire_worker(self.size_worker)
+        self.size_worker = PageSizeWorker(file_path, self.session)
+        self.size_worker.finished.connect(self.on_page_sizes_ready)
+        self.size_worker.error.connect(lambda message: self.label.setText(os.path.basename(self.input_pdf or "")))
+        self.size_worker.start()
+
+    def release_session(self):
+        if self.session is not None:
+            from pipeline import release_session
+            # El índice de peso puede estar leyendo el documento de la sesión
+            retire_worker(self.size_worker)
+            self.size_worker = None
+            release_session(self.session)
+            self.session = None
+
+    def on_page_sizes_ready(self, index):
+        if self.sender() is not self.size_worker or self.input_pdf is None:
+            return
+        from pdf_inspector import CATEGORY_LABELS, heaviest_pages, main_category
+
+        lines = [f"{os.path.basename(self.input_pdf)} · {len(index.pages)} páginas", "", "Páginas más pesadas:"]
+        for page in heaviest_pages(index):
+            sizes = index.pages[page]
+            lines.append(f"Página {page + 1}: {format_size(sizes['total'])} "
+                         f"(sobre todo {CATEGORY_LABELS[main_category(sizes)].lower()})")
+        self.label.setText("\n".join(lines))
+
+    def selected_quality(self):
+        quality_map = {
+            0: "screen",
+            1: "ebook",
+            2: "printer",
+            3: "target"
+        }
+        return quality_map.get(self.quality_combo.currentIndex())
+
+    def selected_engine(self):
+        return "native" if self.engine_combo.currentIndex() == 1 else "ghostscript"
 
     def process_pdf(self):
+        if self.batch_files:
+            self.process_batch()
+            return
+
         if not self.input_pdf:
             QMessageBox.warning(self, "Advertencia", "Por favor, selecciona un archivo PDF primero.")
             return
@@ -608,83 +2127,124 @@ class PDFCompressorTab(QWidget):
             QMessageBox.information(self, "Cancelado", "La operación de guardado ha sido cancelada.")
             return
 
-        gs_path = None
-        if hasattr(sys, '_MEIPASS'):
-            gs_path = os.path.join(sys._MEIPASS, "recursos", "gswin64c.exe")
-        else:
-            gs_path = "gswin64c"
-        
-        try:
-            
-            creationflags = 0
-            if sys.platform == "win32":
-                creationflags = subprocess.CREATE_NO_WINDOW
-            
-            subprocess.run([gs_path, "--version"], check=True, capture_output=True, text=True, creationflags=creationflags)
-        except (FileNotFoundError, subprocess.CalledProcessError):
-            QMessageBox.critical(self, "Error", 
-                "No se encontró Ghostscript. La función de compresión no está disponible.")
+        if self.needs_ghostscript() and not self.ghostscript_available():
             return
 
+        if os.path.exists(out_path) and os.path.samefile(self.input_pdf, out_path):
+            # Se va a reemplazar el archivo: el documento abierto de la sesión lo bloquearía en Windows
+            self.session.close()
+
         self.status_label.setText("Estado: Comprimiendo...")
         self.status_label.setStyleSheet("font-style: italic; color: #f39c12;")
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
-        self.compress_button.setEnabled(False)
-        self.compress_button.setStyleSheet("""
-            QPushButton {
-                background-color: #bdc3c7;
-                color: #808080;
-                font-weight: bold;
-                border-radius: 5px;
-            }
-        """)
+        self.set_compress_button_enabled(False)
         
-        quality_map = {
-            0: "screen",
-            1: "ebook",
-            2: "printer"
-        }
-        quality = quality_map.get(self.quality_combo.currentIndex())
-        
-        self.worker = Worker("process_pdf", (self.input_pdf, out_path, quality))
+        self.worker = Worker("process_pdf", (self.input_pdf, out_path, self.selected_quality(),
+                                             self.sharded_checkbox.isChecked(), self.target_spin.value(),
+                                             self.selected_engine()))
         self.worker.progress_update.connect(self.progress_bar.setValue)
+        self.worker.page_progress.connect(self.on_page_progress)
         self.worker.sizes_updated.connect(self.update_sizes)
         self.worker.finished_compression.connect(self.on_compression_finished)
         self.worker.error.connect(self.on_error)
         self.worker.start()
+        self.cancel_button.setEnabled(True)
+        self.cancel_button.setVisible(True)
+
+    def on_page_progress(self, done, total, pages_per_second, eta_seconds):
+        status = f"Estado: Comprimiendo... página {done} de {total} ({pages_per_second:.1f} pág/s"
+        if eta_seconds >= 0 and done < total:
+            minutes, seconds = divmod(int(eta_seconds), 60)
+            status += f", faltan {minutes}:{seconds:02d}"
+        self.status_label.setText(status + ")")
+
+    def cancel_compression(self):
+        if self.worker is not None and self.worker.isRunning():
+            self.cancel_button.setEnabled(False)
+            self.status_label.setText("Estado: Cancelando...")
+            self.worker.cancel()
+
+    def process_batch(self):
+        out_dir = QFileDialog.getExistingDirectory(self, "Carpeta de destino para los PDF comprimidos")
+        if not out_dir:
+            QMessageBox.information(self, "Cancelado", "La operación de guardado ha sido cancelada.")
+            return
+
+        if self.needs_ghostscript() and not self.ghostscript_available():
+            return
+
+        jobs = [(path, os.path.join(out_dir, os.path.splitext(os.path.basename(path))[0] + "_comprimido.pdf"))
+                for path in self.batch_files]
+        for row in range(len(jobs)):
+            self.batch_table.item(row, 1).setText("En cola")
+            self.batch_table.item(row, 3).setText("")
+
+        self.status_label.setText(f"Estado: Comprimiendo {len(jobs)} archivos...")
+        self.status_label.setStyleSheet("font-style: italic; color: #f39c12;")
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(0)
+        self.set_compress_button_enabled(False)
+
+        target_bytes = int(self.target_spin.value() * 1024 * 1024) if self.selected_quality() == "target" else None
+        self.worker = BatchCompressionWorker(jobs, self.selected_quality(), get_setting("compression_workers"), target_bytes,
+                                             self.selected_engine())
+        self.worker.file_started.connect(lambda row: self.batch_table.item(row, 1).setText("Comprimiendo..."))
+        self.worker.file_finished.connect(self.on_batch_file_finished)
+        self.worker.file_sizes_updated.connect(self.on_batch_file_sizes)
+        self.worker.progress_update.connect(self.progress_bar.setValue)
+        self.worker.sizes_updated.connect(self.update_sizes)
+        self.worker.finished_batch.connect(self.on_batch_finished)
+        self.worker.error.connect(self.on_error)
+        self.worker.start()
+        self.cancel_button.setEnabled(True)
+        self.cancel_button.setVisible(True)
+        logging.info(f"Compresión por lotes iniciada: {len(jobs)} archivos en {out_dir}")
+
+    def on_batch_file_finished(self, row, success, message):
+        self.batch_table.item(row, 1).setText("Listo" if success else f"Error: {message}")
+
+    def on_batch_file_sizes(self, row, original_mb, compressed_mb):
+        reduction = (1 - compressed_mb / original_mb) * 100 if original_mb else 0
+        self.batch_table.item(row, 3).setText(f"{compressed_mb:.2f} MB ({reduction:.0f}% menos)")
+
+    def on_batch_finished(self, succeeded, total):
+        self.progress_bar.setVisible(False)
+        self.cancel_button.setVisible(False)
+        self.set_compress_button_enabled(True)
+        message = f"{succeeded} de {total} archivos comprimidos."
+        self.status_label.setText(f"Estado: {message}")
+        self.status_label.setStyleSheet("font-style: italic; color: #2ecc71;" if succeeded == total else "font-style: italic; color: #e74c3c;")
+        logging.info(f"Compresión por lotes finalizada: {message}")
+        QMessageBox.information(self, "Compresión por lotes", message)
+
+    def needs_ghostscript(self):
+        # El motor nativo no usa Ghostscript; el tamaño objetivo y la división en partes sí
+        return self.selected_engine() != "native" or self.selected_quality() == "target"
+
+    def ghostscript_available(self):
+        # La prueba se hace una sola vez (normalmente ya la hizo WarmupWorker al arrancar)
+        if probe_ghostscript() is None:
+            QMessageBox.critical(self, "Error", 
+                "No se encontró Ghostscript. La función de compresión no está disponible.")
+            return False
+        return True
         
     def on_compression_finished(self, success, message):
         self.progress_bar.setVisible(False)
-        self.compress_button.setEnabled(True)
+        self.cancel_button.setVisible(False)
         
-        if success:
-            self.compress_button.setStyleSheet("""
-                QPushButton {
-                    background-color: #4CAF50;
-                    color: white;
-                    font-weight: bold;
-                    border-radius: 5px;
-                }
-                QPushButton:hover {
-                    background-color: #45a049;
-                }
-                QPushButton:pressed {
-                    background-color: #3e8e41;
-                }
-            """)
+        if message == CANCELLED_MESSAGE:
+            self.set_compress_button_enabled(True)
+            self.status_label.setText(f"Estado: {message}")
+            self.status_label.setStyleSheet("font-style: italic; color: #3498db;")
+        elif success:
+            self.set_compress_button_enabled(True)
             self.status_label.setText(f"Estado: {message}")
             self.status_label.setStyleSheet("font-style: italic; color: #2ecc71;")
             QMessageBox.information(self, "Éxito", message)
         else:
-            self.compress_button.setStyleSheet("""
-                QPushButton {
-                    background-color: #bdc3c7;
-                    color: #808080;
-                    font-weight: bold;
-                    border-radius: 5px;
-                }
-            """)
+            self.set_compress_button_enabled(False)
             self.status_label.setText(f"Estado: Error - {message}")
             self.status_label.setStyleSheet("font-style: italic; color: #e74c3c;")
             QMessageBox.critical(self, "Error", f"Ocurrió un error durante la compresión: {message}")
@@ -696,6 +2256,7 @@ class PDFCompressorTab(QWidget):
 
     def on_error(self, message):
         self.progress_bar.setVisible(False)
+        self.cancel_button.setVisible(False)
         
         QMessageBox.critical(self, "Error", f"Ocurrió un error: {message}")
         
@@ -703,29 +2264,94 @@ class PDFCompressorTab(QWidget):
 
     def reset_state(self):
         """Reinicia la interfaz a su estado inicial de 'esperando archivo'."""
+        self.release_session()
         self.input_pdf = None
+        self.batch_files = []
+        self.batch_table.setVisible(False)
+        self.label.setVisible(True)
         self.status_label.setText("Estado: Esperando archivo...")
         self.status_label.setStyleSheet("font-style: italic; color: #3498db;")
         self.original_size_label.setText("Tamaño Original: N/A")
         self.compressed_size_label.setText("Tamaño Comprimido: N/A")
-        self.compress_button.setEnabled(False)
-        self.compress_button.setStyleSheet("""
-            QPushButton {
-                background-color: #bdc3c7;
-                color: #808080;
-                font-weight: bold;
-                border-radius: 5px;
-            }
-        """)
+        self.set_compress_button_enabled(False)
 
     def format_size(self, size_bytes):
-        if size_bytes == 0:
-            return "0 B"
-        size_name = ("B", "KB", "MB", "GB", "TB", "PB", "EB", "ZB", "YB")
-        i = int(math.floor(math.log(size_bytes, 1024)))
-        p = math.pow(1024, i)
-        s = round(size_bytes / p, 2)
-        return f"{s} {size_name[i]}"
+        return format_size(size_bytes)
+
+class JobSignals(QObject):
+    """Lleva los avisos del planificador (que llegan desde cualquier hilo) al hilo de la interfaz."""
+    changed = pyqtSignal(object)
+
+
+class JobsTab(QWidget):
+    """Lista de trabajos en segundo plano con su estado, avance y un botón para cancelarlos."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = {}
+        self.init_ui()
+        self.signals = JobSignals()
+        self.signals.changed.connect(self.update_job)
+        get_scheduler().add_listener(self.signals.changed.emit)
+        for job in get_scheduler().jobs():
+            self.update_job(job)
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        self.table = QTableWidget(0, 5, self)
+        self.table.setHorizontalHeaderLabels(["Trabajo", "Prioridad", "Estado", "Avance", ""])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionMode(QAbstractItemView.NoSelection)
+        self.table.verticalHeader().setVisible(False)
+        layout.addWidget(self.table)
+
+        self.clear_button = QPushButton("Limpiar terminados")
+        self.clear_button.setToolTip("Quita de la lista los trabajos terminados, con error o cancelados.")
+        self.clear_button.clicked.connect(self.clear_finished)
+        layout.addWidget(self.clear_button, alignment=Qt.AlignRight)
+
+        self.setLayout(layout)
+
+    def update_job(self, job):
+        row = self.rows.get(job.id)
+        if row is None:
+            if job.finished:
+                return
+            row = self.table.rowCount()
+            self.table.insertRow(row)
+            self.rows[job.id] = row
+            self.table.setItem(row, 0, QTableWidgetItem(job.name))
+            self.table.setItem(row, 1, QTableWidgetItem(PRIORITY_LABELS[job.priority]))
+            self.table.setItem(row, 2, QTableWidgetItem())
+            self.table.setCellWidget(row, 3, QProgressBar())
+            cancel_button = QPushButton("Cancelar")
+            cancel_button.clicked.connect(lambda _, job_id=job.id: get_scheduler().cancel(job_id))
+            self.table.setCellWidget(row, 4, cancel_button)
+
+        state = STATE_LABELS[job.state]
+        self.table.item(row, 2).setText(f"{state}: {job.detail}" if job.detail else state)
+        progress_bar = self.table.cellWidget(row, 3)
+        if job.progress is None:
+            # Sin avance conocido: barra indeterminada mientras corre
+            progress_bar.setRange(0, 0 if job.state == RUNNING else 100)
+        else:
+            progress_bar.setRange(0, 100)
+            progress_bar.setValue(int(job.progress * 100))
+        self.table.cellWidget(row, 4).setEnabled(not job.finished)
+
+    def clear_finished(self):
+        jobs = {job.id: job for job in get_scheduler().jobs()}
+        for job_id, row in sorted(self.rows.items(), key=lambda entry: entry[1], reverse=True):
+            job = jobs.get(job_id)
+            if job is None or job.finished:
+                self.table.removeRow(row)
+                del self.rows[job_id]
+        # Las filas se corrieron al borrar: se renumeran por orden
+        for row, job_id in enumerate(sorted(self.rows, key=self.rows.get)):
+            self.rows[job_id] = row
+
 
 class PDFToolApp(QWidget):
     def __init__(self):
@@ -742,10 +2368,12 @@ class PDFToolApp(QWidget):
         self.word_to_pdf_tab = WordToPDFTab()
         self.page_remover_tab = PageRemoverTab()
         self.pdf_compressor_tab = PDFCompressorTab()
+        self.jobs_tab = JobsTab()
 
         self.tabs.addTab(self.word_to_pdf_tab, "Convertir Word a PDF")
         self.tabs.addTab(self.page_remover_tab, "Eliminar Páginas")
         self.tabs.addTab(self.pdf_compressor_tab, "Comprimir PDF")
+        self.tabs.addTab(self.jobs_tab, "Trabajos")
         
         layout.addWidget(self.tabs)
 
@@ -756,6 +2384,15 @@ class PDFToolApp(QWidget):
 
         self.setLayout(layout)
 
+def format_size(size_bytes):
+    if size_bytes < 1:
+        return "0 B"
+    size_name = ("B", "KB", "MB", "GB", "TB", "PB", "EB", "ZB", "YB")
+    i = int(math.floor(math.log(size_bytes, 1024)))
+    p = math.pow(1024, i)
+    s = round(size_bytes / p, 2)
+    return f"{s} {size_name[i]}"
+
 def resource_path(relative_path):
     """Obtiene la ruta absoluta a un recurso, para que funcione tanto en desarrollo como en PyInstaller."""
     try:
@@ -766,6 +2403,8 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 if __name__ == "__main__":
+    # Necesario para que el pool de procesos funcione en el ejecutable de PyInstaller
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     
     app.setWindowIcon(QIcon(resource_path('recursos/icon.ico')))
@@ -776,41 +2415,44 @@ if __name__ == "__main__":
     splash.setWindowFlags(Qt.SplashScreen | Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
     
     splash.show()
-    
-    load_timer = QTimer()
-    global step
-    step = 0
-    def update_splash_message():
-        global step
-        messages = ["Iniciando.", "Iniciando..", "Iniciando...", "Cargando.", "Cargando..", "Cargando..."]
-        step = (step + 1) % len(messages)
-        splash.showMessage(messages[step], Qt.AlignBottom | Qt.AlignCenter, Qt.white)
-
-    load_timer.timeout.connect(update_splash_message)
-    load_timer.start(500) 
+    splash.showMessage("Cargando...", Qt.AlignBottom | Qt.AlignCenter, Qt.white)
+    app.processEvents()
+    log_startup("splash visible")
     
     window = PDFToolApp()
     window.setWindowOpacity(0.0) 
+    # Primero se cancela lo que quede en cola o en curso, para que los hilos terminen con la
+    # ventana; recién después se cierran las instancias de Word del pool de conversión
+    # (los hooks se ejecutan en el orden en que se conectan)
+    app.aboutToQuit.connect(lambda: get_scheduler().cancel_all())
+    app.aboutToQuit.connect(lambda: __import__("converters").shutdown_converter_pool())
+    log_startup("ventana construida")
     
     anim = QPropertyAnimation(splash, b"windowOpacity")
-    anim.setDuration(1500)
+    anim.setDuration(300)
     anim.setStartValue(1)
     anim.setEndValue(0)
     anim.setEasingCurve(QEasingCurve.InQuad)
     
     main_anim = QPropertyAnimation(window, b"windowOpacity")
-    main_anim.setDuration(1000) 
+    main_anim.setDuration(300) 
     main_anim.setStartValue(0)
     main_anim.setEndValue(1)
     
     anim.finished.connect(splash.close)
     anim.finished.connect(main_anim.start)
+    main_anim.finished.connect(lambda: log_startup("ventana lista"))
+
+    # Los backends pesados se cargan mientras el usuario ya ve la ventana
+    warmup = WarmupWorker()
+    warmup.finished_warmup.connect(lambda: log_startup("precarga completa"))
 
     def finish_splash_and_show_main():
-        load_timer.stop()
         window.show() 
         anim.start()
+        warmup.start()
     
-    QTimer.singleShot(3000, finish_splash_and_show_main)
+    # Se cierra el splash en cuanto el bucle de eventos arranca con la ventana ya construida
+    QTimer.singleShot(0, finish_splash_and_show_main)
     
     sys.exit(app.exec_())
@@ -0,0 +1,186 @@
+# native_compressor.py
+import io
+import os
+import zlib
+import shutil
+import logging
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import fitz
+from PIL import Image
+
+# preset de Ghostscript -> (resolución máxima de imágenes en dpi, calidad JPEG, convertir escaneos de texto a 1 bit)
+NATIVE_PRESETS = {
+    "screen": (72, 45, True),
+    "ebook": (150, 65, True),
+    "printer": (300, 85, False),
+}
+# Una imagen en escala de grises con menos de esta fracción de grises intermedios se trata como texto escaneado
+BILEVEL_MIDTONE_LIMIT = 0.02
+# Imágenes pendientes por hilo: acota la memoria usada en documentos con miles de imágenes
+IN_FLIGHT_PER_WORKER = 2
+
+# Stream ya codificado listo para escribir sobre el xref de la imagen original
+EncodedImage = namedtuple("EncodedImage", "data filter width height colorspace bpc")
+
+
+def _has_mask(doc, xref):
+    """True para máscaras de recorte (/ImageMask true, típicas de las capas CCITT/MRC) y para
+    imágenes con /Mask: reemplazarlas por una imagen opaca cambia cómo se ve la página."""
+    if doc.xref_get_key(xref, "ImageMask") == ("bool", "true"):
+        return True
+    return doc.xref_get_key(xref, "Mask")[0] != "null"
+
+
+def _collect_images(doc):
+    """Devuelve {xref: (pagina, dpi_efectivo)} para las imágenes sin máscara de ningún tipo."""
+    images = {}
+    masked = set()
+    for page in doc:
+        for xref, smask, width, *_ in page.get_images(full=True):
+            if smask or xref in masked:
+                continue
+            if xref not in images and _has_mask(doc, xref):
+                masked.add(xref)
+                continue
+            dpi = 0
+            for rect in page.get_image_rects(xref):
+                if rect.width > 0:
+                    dpi = max(dpi, width / (rect.width / 72))
+            previous = images.get(xref)
+            if previous is None or dpi > previous[1]:
+                images[xref] = (page.number, dpi)
+    return images
+
+
+def _is_bilevel(image):
+    histogram = image.histogram()
+    midtones = sum(histogram[32:224])
+    return midtones / max(1, image.width * image.height) < BILEVEL_MIDTONE_LIMIT
+
+
+def recompress_image(raw, dpi, max_dpi, jpeg_quality, allow_bilevel, stored_bytes=None):
+    """Reduce y recodifica una imagen; devuelve un EncodedImage o None si no conviene reemplazarla.
+
+    stored_bytes es lo que ocupa hoy el stream en el PDF; extract_image() puede devolver la
+    imagen en otro formato (p. ej. CCITT convertido a PNG), así que len(raw) no sirve de referencia.
+    """
+    image = Image.open(io.BytesIO(raw))
+    if image.mode in ("RGBA", "LA", "PA"):
+        return None
+    if image.mode not in ("1", "L", "RGB"):
+        image = image.convert("RGB")
+
+    if dpi > max_dpi * 1.1:
+        scale = max_dpi / dpi
+        image = image.resize((max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+                             Image.LANCZOS)
+
+    if image.mode == "1" or (allow_bilevel and image.mode == "L" and _is_bilevel(image)):
+        # Pillow no codifica JBIG2: el equivalente disponible es 1 bit por píxel con Flate.
+        # Umbral sin tramado: Floyd-Steinberg salpica el texto y comprime peor.
+        # En modo "1" Pillow empaqueta las filas igual que el PDF (1 = blanco en DeviceGray)
+        image = image.convert("1", dither=Image.NONE)
+        encoded = EncodedImage(zlib.compress(image.tobytes(), 9), "FlateDecode",
+                               image.width, image.height, "DeviceGray", 1)
+    else:
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=jpeg_quality, optimize=True)
+        encoded = EncodedImage(buffer.getvalue(), "DCTDecode", image.width, image.height,
+                               "DeviceGray" if image.mode == "L" else "DeviceRGB", 8)
+    return encoded if len(encoded.data) < (stored_bytes or len(raw)) else None
+
+
+def _write_image(doc, xref, encoded):
+    """Escribe la imagen sobre el mismo xref: replace_image() crea un objeto nuevo y deja el
+    original referenciado en /Resources, con lo que la imagen queda guardada dos veces."""
+    doc.update_stream(xref, encoded.data, compress=False)
+    doc.xref_set_key(xref, "Filter", "/" + encoded.filter)
+    doc.xref_set_key(xref, "Width", str(encoded.width))
+    doc.xref_set_key(xref, "Height", str(encoded.height))
+    doc.xref_set_key(xref, "BitsPerComponent", str(encoded.bpc))
+    doc.xref_set_key(xref, "ColorSpace", "/" + encoded.colorspace)
+    # Los parámetros del filtro y la tabla /Decode eran del stream anterior
+    doc.xref_set_key(xref, "DecodeParms", "null")
+    doc.xref_set_key(xref, "Decode", "null")
+
+
+def recompress_document_images(doc, quality, max_workers=None, progress=None):
+    """Recodifica en el lugar las imágenes de un fitz.Document abierto; devuelve (recodificadas, total).
+
+    Las imágenes se extraen y reemplazan en el hilo actual (PyMuPDF no es thread-safe)
+    y se decodifican, reducen y recodifican en un pool de hilos. progress(hechas, total)
+    se llama a medida que se aplican.
+    """
+    max_dpi, jpeg_quality, allow_bilevel = NATIVE_PRESETS[quality]
+    workers = max_workers or max(1, os.cpu_count() or 1)
+    images = _collect_images(doc)
+    replaced = 0
+    applied = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = []
+
+        def apply(done):
+            nonlocal replaced, applied
+            xref, page_number, future = done
+            try:
+                data = future.result()
+            except Exception as e:
+                # Formatos que Pillow no puede abrir (p. ej. JBIG2 o JPX sin soporte) quedan como están
+                logging.debug(f"Imagen {xref} no recodificada: {e}")
+                data = None
+            if data is not None:
+                _write_image(doc, xref, data)
+                replaced += 1
+            applied += 1
+            if progress is not None:
+                progress(applied, len(images))
+
+        for xref, (page_number, dpi) in images.items():
+            extracted = doc.extract_image(xref)
+            if not extracted:
+                applied += 1
+                continue
+            raw = extracted["image"]
+            stored_bytes = len(doc.xref_stream_raw(xref) or b"")
+            pending.append((xref, page_number, executor.submit(
+                recompress_image, raw, dpi, max_dpi, jpeg_quality, allow_bilevel, stored_bytes)))
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                apply(pending.pop(0))
+        for done in pending:
+            apply(done)
+    return replaced, len(images)
+
+
+def compress_pdf_native(input_pdf, output_pdf, quality, max_workers=None, progress=None):
+    """Comprime un PDF sin Ghostscript, recodificando sus imágenes con PyMuPDF y Pillow.
+
+    Ver recompress_document_images (progress se le pasa tal cual). El resultado se guarda con recolección de basura y
+    deflate; si no queda más chico que la entrada se guarda la entrada sin cambios.
+    Devuelve (exito, mensaje) como compress_pdf.
+    """
+    if not os.path.exists(input_pdf):
+        logging.error(f"El archivo de entrada no existe: {input_pdf}")
+        return False, f"El archivo de entrada no existe: {input_pdf}"
+
+    try:
+        doc = fitz.open(input_pdf)
+        try:
+            replaced, total = recompress_document_images(doc, quality, max_workers, progress)
+            doc.save(output_pdf, garbage=3, deflate=True, use_objstms=1)
+        finally:
+            doc.close()
+
+        if os.path.getsize(output_pdf) >= os.path.getsize(input_pdf):
+            shutil.copyfile(input_pdf, output_pdf)
+            logging.info("El motor nativo no logró reducir el PDF; se guardó sin cambios.")
+            return True, "El PDF ya estaba optimizado; se guardó sin cambios."
+
+        logging.info(f"PDF comprimido con el motor nativo ({replaced} de {total} imágenes recodificadas).")
+        return True, "PDF comprimido y guardado exitosamente."
+    except Exception as e:
+        error_msg = f"Ocurrió un error inesperado al comprimir el PDF: {e}"
+        logging.error(error_msg)
+        if os.path.exists(output_pdf):
+            os.remove(output_pdf)
+        return False, error_msg
@@ -0,0 +1,261 @@
+# page_analysis.py
+"""Detección de páginas en blanco y de páginas escaneadas dos veces.
+
+Cada página se renderiza una sola vez en gris y a baja resolución (con el mismo
+PageRasterizer que las miniaturas) y se reduce enseguida a dos datos: la proporción de
+tinta y una miniatura de 32x32. Con esas miniaturas apiladas, los hashes perceptuales y
+las comparaciones entre todas las páginas se calculan en bloque con NumPy.
+
+A esa resolución dos páginas distintas de texto denso se ven iguales, así que los
+hashes solo proponen candidatos: cada par se confirma volviendo a renderizar ambas
+páginas a ~50 dpi y comparando la tinta píxel a píxel, tras alinear el corrimiento del
+escáner.
+"""
+import logging
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from telemetry import operation
+
+# Caja de renderizado para el análisis (~18 dpi en carta); la decodificación del escaneo domina el costo
+ANALYSIS_SIZE = (150, 200)
+# Margen que se ignora al medir la tinta (bordes del escáner, perforaciones, sombras del lomo)
+MARGIN_RATIO = 0.06
+# Un píxel es tinta si es INK_CONTRAST niveles más oscuro que el fondo de su página
+INK_CONTRAST = 48
+# Por debajo de esta proporción de tinta la página se considera en blanco
+BLANK_MAX_INK = 0.002
+MINI_SIZE = 32
+# dHash de 16x16 bits: dos páginas son candidatas a duplicado con hasta esta distancia de Hamming.
+# Una celda solo cuenta como "más clara" que la anterior con HASH_TOLERANCE niveles de diferencia,
+# para que el ruido del papel en blanco no cambie bits al azar.
+HASH_SIDE = 16
+HASH_TOLERANCE = 2.0
+DUPLICATE_MAX_BITS = 24
+# ...y si además sus miniaturas (normalizadas por brillo) difieren en promedio menos que esto
+DUPLICATE_MAX_DIFF = 4.0
+# Filas de la matriz de distancias que se calculan por vez (acota la memoria en documentos grandes)
+COMPARE_CHUNK = 256
+# Confirmación de cada par candidato: caja de renderizado (~50 dpi en carta), corrimiento máximo
+# que se alinea (en píxeles de esa caja) y tinta que puede cambiar. Un píxel de tinta solo cuenta
+# como cambio si la otra página no tiene tinta a CONFIRM_RADIUS píxeles o menos y si tiene al
+# lado otro píxel cambiado (los puntos sueltos son ruido del escáner). Se tolera
+# CONFIRM_MAX_CHANGED del total de tinta y nunca más de CONFIRM_MAX_PIXELS: menos que una
+# palabra corta, porque un "no" agregado cambia un escrito.
+CONFIRM_SIZE = (425, 550)
+CONFIRM_MAX_SHIFT = 12
+CONFIRM_RADIUS = 1
+CONFIRM_MAX_CHANGED = 0.0005
+CONFIRM_MAX_PIXELS = 12
+# Candidatas a original que se confirman por página, de la más parecida a la menos; acota el
+# costo cuando muchas páginas distintas de texto denso se parecen a baja resolución
+CONFIRM_MAX_TRIES = 3
+# Renders de confirmación que se conservan (las originales se comparan con varias copias)
+CONFIRM_CACHE = 32
+
+# blank: índices en blanco. duplicates: {índice: índice de la primera aparición}. ink: proporción por página
+AnalysisResult = namedtuple("AnalysisResult", "blank duplicates ink")
+
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint16)
+
+
+def _block_means(pixels, rows, cols):
+    """Promedios por bloque de una imagen 2D (o de una pila 3D) sobre una grilla rows x cols."""
+    height, width = pixels.shape[-2:]
+    row_edges = np.linspace(0, height, rows + 1).astype(np.intp)
+    col_edges = np.linspace(0, width, cols + 1).astype(np.intp)
+    sums = np.add.reduceat(np.add.reduceat(pixels.astype(np.float32), row_edges[:-1], axis=-2),
+                           col_edges[:-1], axis=-1)
+    counts = np.outer(np.diff(row_edges), np.diff(col_edges)).astype(np.float32)
+    return sums / np.maximum(counts, 1)
+
+
+def page_features(samples, width, height, stride):
+    """Proporción de tinta y miniatura MINI_SIZE x MINI_SIZE de un raster en gris."""
+    pixels = np.frombuffer(samples, dtype=np.uint8).reshape(height, stride)[:, :width]
+    margin_y, margin_x = int(height * MARGIN_RATIO), int(width * MARGIN_RATIO)
+    body = pixels[margin_y:height - margin_y or None, margin_x:width - margin_x or None]
+    # El fondo de un escaneo rara vez es blanco puro: se toma el percentil 90 como papel
+    paper = np.percentile(body, 90) if body.size else 255
+    ink = float(np.count_nonzero(body < paper - INK_CONTRAST)) / max(body.size, 1)
+    mini = _block_means(pixels, MINI_SIZE, MINI_SIZE).astype(np.uint8)
+    return ink, mini
+
+
+def dhash(minis):
+    """dHash de cada miniatura de la pila (N, MINI_SIZE, MINI_SIZE): (N, HASH_SIDE**2 / 8) bytes."""
+    grid = _block_means(minis, HASH_SIDE, HASH_SIDE + 1)
+    bits = grid[:, :, 1:] > grid[:, :, :-1] + HASH_TOLERANCE
+    return np.packbits(bits.reshape(len(minis), -1), axis=1)
+
+
+def ink_mask(samples, width, height, stride):
+    """Máscara de tinta de un raster en gris, con el mismo criterio que page_features."""
+    pixels = np.frombuffer(samples, dtype=np.uint8).reshape(height, stride)[:, :width]
+    paper = np.percentile(pixels, 90)
+    return pixels < paper - INK_CONTRAST
+
+
+def _best_shift(profile_a, profile_b):
+    """Corrimiento de b (en [-CONFIRM_MAX_SHIFT, CONFIRM_MAX_SHIFT]) que mejor lo alinea con a."""
+    best, best_error = 0, None
+    for shift in range(-CONFIRM_MAX_SHIFT, CONFIRM_MAX_SHIFT + 1):
+        error = np.abs(profile_a - np.roll(profile_b, shift)).sum()
+        if best_error is None or error < best_error:
+            best, best_error = shift, error
+    return best
+
+
+def _shifted(mask, dy, dx):
+    """mask desplazada (dy, dx) píxeles, rellenando con fondo lo que entra por el borde."""
+    result = np.zeros_like(mask)
+    height, width = mask.shape
+    result[max(dy, 0):height + min(dy, 0), max(dx, 0):width + min(dx, 0)] = \
+        mask[max(-dy, 0):height + min(-dy, 0), max(-dx, 0):width + min(-dx, 0)]
+    return result
+
+
+def _neighbors(mask, radius):
+    """True donde hay algún píxel de mask a radius píxeles o menos, sin contar el propio."""
+    result = np.zeros_like(mask)
+    for dy in range(-radius, radius + 1):
+        for dx in range(-radius, radius + 1):
+            if dy or dx:
+                result |= _shifted(mask, dy, dx)
+    return result
+
+
+def _dilate(mask, radius):
+    return mask | _neighbors(mask, radius)
+
+
+def same_page(mask_a, mask_b):
+    """True si dos máscaras de tinta son la misma página escaneada (salvo corrimiento y ruido)."""
+    if mask_a.shape != mask_b.shape:
+        return False
+    rows_a, rows_b = mask_a.sum(axis=1, dtype=np.int32), mask_b.sum(axis=1, dtype=np.int32)
+    cols_a, cols_b = mask_a.sum(axis=0, dtype=np.int32), mask_b.sum(axis=0, dtype=np.int32)
+    mask_b = _shifted(mask_b, _best_shift(rows_a, rows_b), _best_shift(cols_a, cols_b))
+    changed = (mask_a & ~_dilate(mask_b, CONFIRM_RADIUS)) | (mask_b & ~_dilate(mask_a, CONFIRM_RADIUS))
+    changed &= _neighbors(changed, 1)
+    ink = max(np.count_nonzero(mask_a), np.count_nonzero(mask_b), 1)
+    return np.count_nonzero(changed) <= min(CONFIRM_MAX_PIXELS, CONFIRM_MAX_CHANGED * ink)
+
+
+class _PageConfirmer:
+    """Confirma pares candidatos renderizando las dos páginas a CONFIRM_SIZE."""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.masks = OrderedDict()
+        self.compared = 0
+
+    def mask(self, index):
+        from renderer import render_page
+
+        mask = self.masks.get(index)
+        if mask is None:
+            page = render_page(self.doc, index, CONFIRM_SIZE, gray=True)
+            mask = self.masks[index] = ink_mask(page.samples, page.width, page.height, page.stride)
+            if len(self.masks) > CONFIRM_CACHE:
+                self.masks.popitem(last=False)
+        else:
+            self.masks.move_to_end(index)
+        return mask
+
+    def __call__(self, original, copy):
+        self.compared += 1
+        return same_page(self.mask(original), self.mask(copy))
+
+
+def find_duplicates(hashes, minis, candidates, confirm=None):
+    """Devuelve {página: primera página igual} entre los índices de candidates.
+
+    Una página es candidata a copia de las anteriores a ella que estén a
+    DUPLICATE_MAX_BITS bits o menos y cuya miniatura sea prácticamente la misma.
+    Sin confirm gana la primera; con confirm(original, copia) se prueban hasta
+    CONFIRM_MAX_TRIES, de la miniatura más parecida a la menos.
+    """
+    candidates = np.asarray(candidates, dtype=np.intp)
+    if len(candidates) < 2:
+        return {}
+    hashes = hashes[candidates]
+    normalized = minis[candidates].astype(np.float32)
+    normalized -= normalized.mean(axis=(1, 2), keepdims=True)
+
+    duplicates = {}
+    for start in range(0, len(candidates), COMPARE_CHUNK):
+        block = hashes[start:start + COMPARE_CHUNK]
+        # Solo hacen falta las páginas anteriores a cada fila del bloque
+        distances = _POPCOUNT[block[:, None, :] ^ hashes[None, :start + len(block), :]].sum(axis=2)
+        for row, distance in enumerate(distances):
+            position = start + row
+            close = np.flatnonzero(distance[:position] <= DUPLICATE_MAX_BITS)
+            if not len(close):
+                continue
+            diffs = np.abs(normalized[close] - normalized[position]).mean(axis=(1, 2))
+            page = int(candidates[position])
+            similar = diffs <= DUPLICATE_MAX_DIFF
+            matches = close[similar]
+            if confirm is not None:
+                matches = matches[np.argsort(diffs[similar], kind="stable")]
+            tried = set()
+            for match in matches:
+                if confirm is not None and len(tried) >= CONFIRM_MAX_TRIES:
+                    break
+                original = int(candidates[match])
+                # Si la primera aparición ya es copia de otra, se compara con (y se apunta a) la original
+                original = duplicates.get(original, original)
+                if original in tried:
+                    continue
+                tried.add(original)
+                if confirm is None or confirm(original, page):
+                    duplicates[page] = original
+                    break
+    return duplicates
+
+
+def analyze_pdf(pdf_path, workers=None, progress=None, should_stop=None):
+    """Analiza todas las páginas de pdf_path y devuelve un AnalysisResult (o None si se detuvo).
+
+    progress(hechas, total) se llama a medida que se renderizan las páginas y
+    should_stop() permite interrumpir el análisis entre páginas.
+    """
+    from renderer import PageRasterizer
+
+    rasterizer = PageRasterizer(pdf_path, size=ANALYSIS_SIZE, workers=workers, gray=True)
+    total = len(rasterizer.doc)
+    with operation("analyze", pages=total, workers=rasterizer.workers if rasterizer.executor else 1) as record:
+        ink = np.zeros(total, dtype=np.float32)
+        minis = np.zeros((total, MINI_SIZE, MINI_SIZE), dtype=np.uint8)
+        try:
+            pages = rasterizer.render(range(total))
+            for done, page in enumerate(pages, 1):
+                if should_stop is not None and should_stop():
+                    pages.close()
+                    record["ok"], record["cancelled"] = False, True
+                    return None
+                ink[page.index], minis[page.index] = page_features(page.samples, page.width, page.height, page.stride)
+                if progress is not None:
+                    progress(done, total)
+
+            blank = np.flatnonzero(ink < BLANK_MAX_INK)
+            content = np.flatnonzero(ink >= BLANK_MAX_INK)
+            confirmer = _PageConfirmer(rasterizer.doc)
+            duplicates = find_duplicates(dhash(minis), minis, content, confirm=confirmer)
+        finally:
+            rasterizer.close()
+        record["blank"], record["duplicates"], record["confirm_pairs"] = len(blank), len(duplicates), confirmer.compared
+    logging.info(f"Análisis de {pdf_path}: {len(blank)} páginas en blanco y {len(duplicates)} duplicadas de {total}")
+    return AnalysisResult([int(i) for i in blank], duplicates, ink.tolist())
+
+
+def removal_candidates(result, blank=True, duplicates=True):
+    """Índices (desde 0) sugeridos para remove_selected_pages."""
+    pages = set()
+    if blank:
+        pages.update(result.blank)
+    if duplicates:
+        pages.update(result.duplicates)
+    return sorted(pages)
@@ -0,0 +1,210 @@
+# pdf_builder.py
+"""Arma un único PDF con una página por imagen, escribiendo el archivo a medida que avanza.
+
+Los JPEG se incrustan tal cual (DCTDecode), sin decodificar ni recodificar. El resto de
+los formatos se decodifica y normaliza en un pool de hilos y se guarda sin pérdida (Flate).
+Solo hay unas pocas imágenes en memoria a la vez, sin importar cuántas sean.
+"""
+import os
+import zlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from telemetry import operation
+
+# Tamaños de página en puntos (1/72 de pulgada); "image" usa el tamaño de la imagen según su DPI
+PAGE_SIZES = {
+    "image": None,
+    "a4": (595.28, 841.89),
+    "letter": (612, 792),
+    "legal": (612, 1008),
+    "oficio": (612, 936),
+}
+DEFAULT_DPI = 150
+# Imágenes preparadas por adelantado por cada hilo del pool
+PREFETCH_PER_WORKER = 2
+# Orientaciones EXIF que se resuelven girando la página en lugar de recodificar el JPEG
+_PASSTHROUGH_ORIENTATIONS = (1, 3, 6, 8)
+_EXIF_ORIENTATION = 0x0112
+
+
+def _prepare_image(path, auto_orient):
+    """Lee una imagen y devuelve un dict con el stream listo para el PDF y sus parámetros."""
+    from PIL import Image, ImageOps
+
+    with Image.open(path) as image:
+        orientation = image.getexif().get(_EXIF_ORIENTATION, 1) if auto_orient else 1
+        dpi = image.info.get("dpi", (0, 0))[0] or None
+        if (image.format == "JPEG" and image.mode in ("L", "RGB", "CMYK")
+                and orientation in _PASSTHROUGH_ORIENTATIONS):
+            with open(path, "rb") as f:
+                data = f.read()
+            decode = None
+            if image.mode == "CMYK" and "adobe" in image.info:
+                # Los JPEG CMYK de Adobe se guardan invertidos
+                decode = "[1 0 1 0 1 0 1 0]"
+            return {
+                "data": data, "filter": "DCTDecode", "width": image.width, "height": image.height,
+                "colorspace": {"L": "DeviceGray", "RGB": "DeviceRGB", "CMYK": "DeviceCMYK"}[image.mode],
+                "bpc": 8, "decode": decode, "orientation": orientation, "dpi": dpi, "passthrough": True,
+            }
+
+        was_jpeg = image.format == "JPEG"
+        if auto_orient:
+            image = ImageOps.exif_transpose(image)
+        if image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info):
+            rgba = image.convert("RGBA")
+            image = Image.new("RGB", rgba.size, (255, 255, 255))
+            image.paste(rgba, mask=rgba.getchannel("A"))
+        elif image.mode not in ("1", "L", "RGB"):
+            image = image.convert("RGB")
+
+        if was_jpeg and image.mode != "1":
+            # JPEG espejado o en un modo poco común: se recodifica una sola vez, a alta calidad
+            import io
+            buffer = io.BytesIO()
+            image.save(buffer, "JPEG", quality=92)
+            data, pdf_filter = buffer.getvalue(), "DCTDecode"
+        else:
+            data, pdf_filter = zlib.compress(image.tobytes(), 6), "FlateDecode"
+        return {
+            "data": data, "filter": pdf_filter, "width": image.width, "height": image.height,
+            "colorspace": "DeviceRGB" if image.mode == "RGB" else "DeviceGray",
+            "bpc": 1 if image.mode == "1" else 8, "decode": None, "orientation": 1, "dpi": dpi,
+            "passthrough": False,
+        }
+
+
+def _placement(prepared, page_size, dpi):
+    """Calcula (ancho_pagina, alto_pagina, matriz cm) para dibujar la imagen derecha y centrada."""
+    width, height = prepared["width"], prepared["height"]
+    if prepared["orientation"] in (6, 8):
+        width, height = height, width
+
+    if PAGE_SIZES[page_size] is None:
+        resolution = dpi or prepared["dpi"] or DEFAULT_DPI
+        page_w, page_h = width / resolution * 72, height / resolution * 72
+        x, y, draw_w, draw_h = 0, 0, page_w, page_h
+    else:
+        page_w, page_h = PAGE_SIZES[page_size]
+        if (width > height) != (page_w > page_h):
+            page_w, page_h = page_h, page_w
+        scale = min(page_w / width, page_h / height)
+        if dpi:
+            # Con un DPI fijo la imagen no se amplía más allá de su tamaño físico
+            scale = min(scale, 72 / dpi)
+        draw_w, draw_h = width * scale, height * scale
+        x, y = (page_w - draw_w) / 2, (page_h - draw_h) / 2
+
+    orientation = prepared["orientation"]
+    if orientation == 3:
+        matrix = (-draw_w, 0, 0, -draw_h, x + draw_w, y + draw_h)
+    elif orientation == 6:
+        matrix = (0, -draw_h, draw_w, 0, x, y + draw_h)
+    elif orientation == 8:
+        matrix = (0, draw_h, -draw_w, 0, x + draw_w, y)
+    else:
+        matrix = (draw_w, 0, 0, draw_h, x, y)
+    return page_w, page_h, matrix
+
+
+class _PDFWriter:
+    """Escritor mínimo de PDF que vuelca cada objeto al disco apenas se genera."""
+
+    def __init__(self, path):
+        self.f = open(path, "wb")
+        self.offsets = {}
+        self.next_number = 3  # 1 = catálogo, 2 = árbol de páginas (se escriben al final)
+        self.pages = []
+        self.f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def reserve(self):
+        number = self.next_number
+        self.next_number += 1
+        return number
+
+    def write_object(self, number, body, stream=None):
+        self.offsets[number] = self.f.tell()
+        self.f.write(f"{number} 0 obj\n".encode())
+        if stream is None:
+            self.f.write(body.encode() + b"\nendobj\n")
+        else:
+            self.f.write(body[:-2].encode() + f" /Length {len(stream)} >>\nstream\n".encode())
+            self.f.write(stream)
+            self.f.write(b"\nendstream\nendobj\n")
+
+    def add_page(self, prepared, page_w, page_h, matrix):
+        image_number, content_number, page_number = self.reserve(), self.reserve(), self.reserve()
+        decode = f" /Decode {prepared['decode']}" if prepared["decode"] else ""
+        self.write_object(image_number,
+                          f"<< /Type /XObject /Subtype /Image /Width {prepared['width']} /Height {prepared['height']}"
+                          f" /ColorSpace /{prepared['colorspace']} /BitsPerComponent {prepared['bpc']}"
+                          f" /Filter /{prepared['filter']}{decode} >>",
+                          prepared["data"])
+        content = ("q " + " ".join(f"{value:.4f}" for value in matrix) + " cm /Im0 Do Q").encode()
+        self.write_object(content_number, "<< >>", content)
+        self.write_object(page_number,
+                          f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {page_w:.2f} {page_h:.2f}]"
+                          f" /Resources << /XObject << /Im0 {image_number} 0 R >> >> /Contents {content_number} 0 R >>")
+        self.pages.append(page_number)
+
+    def close(self):
+        kids = " ".join(f"{number} 0 R" for number in self.pages)
+        self.write_object(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.pages)} >>")
+        self.write_object(1, "<< /Type /Catalog /Pages 2 0 R >>")
+        info_number = self.reserve()
+        self.write_object(info_number, "<< /Producer (LegalDocs) >>")
+
+        xref_offset = self.f.tell()
+        size = self.next_number
+        self.f.write(f"xref\n0 {size}\n0000000000 65535 f \n".encode())
+        for number in range(1, size):
+            self.f.write(f"{self.offsets[number]:010d} 00000 n \n".encode())
+        self.f.write(f"trailer\n<< /Size {size} /Root 1 0 R /Info {info_number} 0 R >>\n"
+                     f"startxref\n{xref_offset}\n%%EOF\n".encode())
+        self.f.close()
+
+
+def images_to_pdf(image_paths, output_pdf_path, page_size="image", dpi=None, auto_orient=True,
+                  max_workers=None, progress=None):
+    """Crea output_pdf_path con una página por imagen, en el orden recibido.
+
+    page_size es una clave de PAGE_SIZES; con "image" la página mide lo que la imagen a
+    dpi (o a su DPI propio, o DEFAULT_DPI). auto_orient aplica la orientación EXIF.
+    progress(hechas, total) se llama después de escribir cada página.
+    """
+    if page_size not in PAGE_SIZES:
+        raise ValueError(f"Tamaño de página desconocido: {page_size}")
+    if not image_paths:
+        raise ValueError("No hay imágenes para convertir.")
+
+    workers = max_workers or max(1, os.cpu_count() or 1)
+    window = workers * PREFETCH_PER_WORKER
+    with operation("img2pdf", pages=len(image_paths), page_size=page_size, dpi=dpi, workers=workers,
+                   input_bytes=sum(os.path.getsize(path) for path in image_paths)) as record:
+        writer = _PDFWriter(output_pdf_path)
+        passthrough = 0
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                pending = []
+                next_index = 0
+                for done in range(len(image_paths)):
+                    # Mantiene a lo sumo `window` imágenes preparadas o en preparación
+                    while next_index < len(image_paths) and len(pending) < window:
+                        pending.append(executor.submit(_prepare_image, image_paths[next_index], auto_orient))
+                        next_index += 1
+                    prepared = pending.pop(0).result()
+                    writer.add_page(prepared, *_placement(prepared, page_size, dpi))
+                    passthrough += prepared["passthrough"]
+                    del prepared
+                    if progress is not None:
+                        progress(done + 1, len(image_paths))
+            writer.close()
+        except Exception:
+            writer.f.close()
+            if os.path.exists(output_pdf_path):
+                os.remove(output_pdf_path)
+            raise
+        record["jpeg_passthrough"] = passthrough
+        record["output_bytes"] = os.path.getsize(output_pdf_path)
+    logging.info(f"{len(image_paths)} imágenes unidas en {output_pdf_path}")
@@ -0,0 +1,156 @@
+# pdf_inspector.py
+"""Cuánto pesa cada página de un PDF, sin decodificar ningún stream.
+
+Se recorre la tabla xref: de cada objeto solo se lee su diccionario y el /Length de
+los streams, que es lo que ocupan guardados en el archivo. Cada página suma los
+objetos que alcanza (contenido, imágenes, fuentes, formularios, anotaciones); un
+recurso compartido por varias páginas se reparte en partes iguales entre ellas.
+"""
+import os
+import re
+import logging
+import threading
+from collections import OrderedDict, namedtuple
+
+from telemetry import operation
+
+CATEGORIES = ("images", "fonts", "content", "other")
+CATEGORY_LABELS = {"images": "Imágenes", "fonts": "Fuentes", "content": "Contenido", "other": "Otros"}
+# Documentos cuyo índice se conserva en memoria (se invalida si cambian tamaño o fecha del archivo)
+CACHE_ENTRIES = 16
+
+# pages: un dict por página con los bytes de cada categoría y "total".
+# document_bytes: lo que no cuelga de ninguna página (catálogo, marcadores, metadatos, xref).
+PageSizeIndex = namedtuple("PageSizeIndex", "pages document_bytes file_bytes")
+
+_REF = re.compile(rb"(\d+)\s+\d+\s+R")
+# Referencias hacia arriba o hacia otras páginas: seguirlas sumaría el documento entero
+_BACK_REF = re.compile(rb"/(?:Parent|P|Dest|D)\s*(?:\d+\s+\d+\s+R|\[[^\]]*\])")
+_CONTENTS = re.compile(rb"/Contents\s*(\[[^\]]*\]|\d+\s+\d+\s+R)")
+_LENGTH = re.compile(rb"/Length\s+(\d+)(\s+\d+\s+R)?")
+_KINDS = (
+    (re.compile(rb"/Subtype\s*/Image"), "images"),
+    (re.compile(rb"/Type\s*/Font(?:Descriptor)?\b"), "fonts"),
+    (re.compile(rb"/Subtype\s*/Form"), "content"),
+)
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+class _XrefReader:
+    """Lee y memoriza (bytes guardados, referencias, categoría propia) de cada objeto."""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.objects = {}
+
+    def source(self, xref):
+        try:
+            return self.doc.xref_object(xref, compressed=True).encode("latin-1", "replace")
+        except Exception:
+            return b""
+
+    def get(self, xref):
+        info = self.objects.get(xref)
+        if info is None:
+            text = self.source(xref)
+            size = len(text)
+            if self.doc.xref_is_stream(xref):
+                match = _LENGTH.search(text)
+                if match and match.group(2):
+                    # /Length indirecto: el número está en otro objeto
+                    length = self.source(int(match.group(1))).strip()
+                    size += int(length) if length.isdigit() else 0
+                elif match:
+                    size += int(match.group(1))
+            kind = next((name for pattern, name in _KINDS if pattern.search(text)), None)
+            refs = [int(ref) for ref in _REF.findall(_BACK_REF.sub(b"", text))]
+            info = self.objects[xref] = (size, refs, kind)
+        return info
+
+
+def _page_objects(reader, page_xref, stop):
+    """Devuelve {xref: categoría} de todo lo que alcanza una página, sin pasar por otras páginas."""
+    _, refs, _ = reader.get(page_xref)
+    contents = _CONTENTS.search(reader.source(page_xref))
+    content_refs = {int(ref) for ref in _REF.findall(contents.group(1))} if contents else set()
+
+    found = {page_xref: "other"}
+    pending = [(ref, "content" if ref in content_refs else "other") for ref in refs]
+    while pending:
+        xref, inherited = pending.pop()
+        if xref in found or xref in stop or xref <= 0:
+            continue
+        _, child_refs, kind = reader.get(xref)
+        category = kind or inherited
+        found[xref] = category
+        pending.extend((ref, category) for ref in child_refs)
+    return found
+
+
+def _build_index(doc, file_bytes):
+    reader = _XrefReader(doc)
+    page_xrefs = [doc.page_xref(i) for i in range(len(doc))]
+    # Nodos del árbol de páginas: frenan el recorrido igual que las demás páginas
+    stop = set(page_xrefs)
+    stop.update(xref for xref in range(1, doc.xref_length())
+                if doc.xref_get_key(xref, "Type") == ("name", "/Pages"))
+
+    per_page = [_page_objects(reader, xref, stop) for xref in page_xrefs]
+    users = {}
+    for objects in per_page:
+        for xref in objects:
+            users[xref] = users.get(xref, 0) + 1
+
+    pages = []
+    for objects in per_page:
+        sizes = dict.fromkeys(CATEGORIES, 0.0)
+        for xref, category in objects.items():
+            sizes[category] += reader.get(xref)[0] / users[xref]
+        sizes["total"] = sum(sizes[category] for category in CATEGORIES)
+        pages.append(sizes)
+    document_bytes = max(0, file_bytes - sum(page["total"] for page in pages))
+    return PageSizeIndex(pages, document_bytes, file_bytes)
+
+
+def page_size_index(pdf_path, doc=None):
+    """Índice de peso por página de pdf_path; doc permite reutilizar un fitz.Document ya abierto.
+
+    El resultado se guarda en memoria por archivo y se recalcula si el archivo cambia.
+    """
+    stat = os.stat(pdf_path)
+    key = os.path.normcase(os.path.abspath(pdf_path))
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == (stat.st_size, stat.st_mtime_ns):
+            _cache.move_to_end(key)
+            return cached[1]
+
+    own_doc = doc is None
+    if own_doc:
+        import fitz
+        doc = fitz.open(pdf_path)
+    try:
+        with operation("inspect", pages=len(doc), input_bytes=stat.st_size, objects=doc.xref_length()):
+            index = _build_index(doc, stat.st_size)
+    finally:
+        if own_doc:
+            doc.close()
+
+    with _cache_lock:
+        _cache[key] = ((stat.st_size, stat.st_mtime_ns), index)
+        while len(_cache) > CACHE_ENTRIES:
+            _cache.popitem(last=False)
+    logging.info(f"Índice de peso por página de {pdf_path}: {len(index.pages)} páginas")
+    return index
+
+
+def heaviest_pages(index, count=5):
+    """Los `count` índices de página (desde 0) con más bytes, de mayor a menor."""
+    return sorted(range(len(index.pages)), key=lambda i: index.pages[i]["total"], reverse=True)[:count]
+
+
+def main_category(sizes):
+    """La categoría que más pesa en una página (p. ej. "images")."""
+    return max(CATEGORIES, key=lambda category: sizes[category])
@@ -1,12 +1,58 @@
 # pdf_utils.py
+import os
+import tempfile
 import fitz
 
-def remove_selected_pages(input_pdf, output_pdf, pages_to_remove):
-    doc = fitz.open(input_pdf)
-    pages_to_keep = [i for i in range(len(doc)) if i not in pages_to_remove]
-    new_doc = fitz.open()
-    for i in pages_to_keep:
-        new_doc.insert_pdf(doc, from_page=i, to_page=i)
-    new_doc.save(output_pdf)
-    new_doc.close()
-    doc.close()
\ No newline at end of file
+from telemetry import operation
+
+# Opciones de guardado de PyMuPDF. "compact" elimina objetos huérfanos y duplicados,
+# agrupa objetos en streams comprimidos y aplica deflate a los streams sin comprimir.
+SAVE_MODES = {
+    "fast": dict(garbage=1),
+    "compact": dict(garbage=3, deflate=True, use_objstms=1),
+    "max": dict(garbage=4, deflate=True, deflate_images=True, deflate_fonts=True, use_objstms=1, clean=True),
+}
+
+
+def _same_file(path_a, path_b):
+    return os.path.exists(path_b) and os.path.samefile(path_a, path_b)
+
+
+def remove_selected_pages(input_pdf, output_pdf, pages_to_remove, save_mode="compact", incremental=False):
+    """Elimina las páginas indicadas (índices desde 0) y guarda el resultado en output_pdf.
+
+    La selección se hace en el mismo documento con select(), sin copiar página por página.
+    Si output_pdf es el archivo de entrada e incremental=True, solo se agregan los cambios
+    al final del archivo cuando el documento lo permite.
+    """
+    with operation("remove", save_mode=save_mode, incremental=incremental,
+                   input_bytes=os.path.getsize(input_pdf)) as record:
+        to_remove = set(pages_to_remove)
+        doc = fitz.open(input_pdf)
+        try:
+            pages_to_keep = [i for i in range(len(doc)) if i not in to_remove]
+            if not pages_to_keep:
+                raise ValueError("No se pueden eliminar todas las páginas del documento.")
+            record["pages"] = len(doc)
+            record["removed"] = len(doc) - len(pages_to_keep)
+            doc.select(pages_to_keep)
+
+            if not _same_file(input_pdf, output_pdf):
+                doc.save(output_pdf, **SAVE_MODES[save_mode])
+            elif incremental and doc.can_save_incrementally():
+                doc.save(input_pdf, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+            else:
+                # PyMuPDF no permite sobrescribir el archivo abierto: se guarda aparte y se reemplaza
+                fd, temp_path = tempfile.mkstemp(suffix=".pdf", dir=os.path.dirname(os.path.abspath(output_pdf)))
+                os.close(fd)
+                try:
+                    doc.save(temp_path, **SAVE_MODES[save_mode])
+                    doc.close()
+                    os.replace(temp_path, output_pdf)
+                finally:
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+        finally:
+            if not doc.is_closed:
+                doc.close()
+        record["output_bytes"] = os.path.getsize(output_pdf)
@@ -0,0 +1,286 @@
+# pipeline.py
+"""Trabajos encadenados (convertir → eliminar páginas → comprimir) sobre un documento abierto.
+
+Cada etapa recibe el fitz.Document de la anterior, así que la entrada se analiza una sola
+vez y el resultado se escribe una sola vez. Una DocumentSession mantiene abierto el PDF
+que el usuario está viendo para que otra pestaña lo use sin volver a leerlo del disco.
+
+Ghostscript y Word trabajan con archivos: la etapa de compresión con Ghostscript le pasa
+el documento serializado una vez y, si es la última, escribe directamente la salida.
+"""
+import os
+import shutil
+import logging
+import tempfile
+import threading
+
+import fitz
+
+from pdf_utils import SAVE_MODES, _same_file
+from telemetry import operation
+
+
+class DocumentSession:
+    """Un PDF abierto y compartido; todo acceso al documento se hace con `lock` tomado."""
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.lock = threading.RLock()
+        self.users = 0
+        self._doc = None
+        self._mtime = None
+
+    def document(self):
+        """El fitz.Document abierto; se vuelve a abrir si el archivo cambió en el disco."""
+        with self.lock:
+            mtime = os.path.getmtime(self.path)
+            if self._doc is None or self._doc.is_closed or mtime != self._mtime:
+                self.close()
+                self._doc = fitz.open(self.path)
+                self._mtime = mtime
+            return self._doc
+
+    def close(self):
+        with self.lock:
+            if self._doc is not None and not self._doc.is_closed:
+                self._doc.close()
+            self._doc = None
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _session_key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def open_session(path):
+    """Devuelve la sesión compartida de path (la crea si hace falta) y suma un usuario."""
+    with _sessions_lock:
+        session = _sessions.get(_session_key(path))
+        if session is None:
+            session = _sessions[_session_key(path)] = DocumentSession(path)
+        session.users += 1
+        return session
+
+
+def release_session(session):
+    """Resta un usuario; sin usuarios el documento se cierra y la sesión se descarta."""
+    with _sessions_lock:
+        session.users -= 1
+        if session.users > 0:
+            return
+        _sessions.pop(_session_key(session.path), None)
+    session.close()
+
+
+class PipelineState:
+    """Lo que pasa de una etapa a la siguiente.
+
+    doc es el documento actual; si borrowed es True pertenece a una sesión y no se puede
+    modificar (se copia antes). written indica que una etapa ya guardó la salida final.
+    """
+
+    def __init__(self, doc=None, borrowed=False, source_path=None):
+        self.doc = doc
+        self.borrowed = borrowed
+        self.source_path = source_path
+        self.written = False
+        self.work_dir = None
+
+    def own(self):
+        """Garantiza un documento propio, copiando el de la sesión si hace falta.
+
+        La copia se hace serializando el documento entero: insert_pdf() en un documento
+        vacío pierde los marcadores y los vínculos internos.
+        """
+        if self.borrowed:
+            self.doc, self.borrowed = fitz.open("pdf", self.doc.tobytes()), False
+        return self.doc
+
+    def replace(self, doc):
+        if not self.borrowed and self.doc is not None:
+            self.doc.close()
+        self.doc, self.borrowed = doc, False
+
+    def temp_path(self, name):
+        if self.work_dir is None:
+            self.work_dir = tempfile.mkdtemp(prefix="legaldocs_pipeline_")
+        return os.path.join(self.work_dir, name)
+
+    def close_document(self):
+        if not self.borrowed and self.doc is not None and not self.doc.is_closed:
+            self.doc.close()
+
+    def close(self):
+        self.close_document()
+        if self.work_dir is not None:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+
+
+class Stage:
+    """Etapa de un Pipeline. weight es su peso relativo en la barra de progreso combinada."""
+    name = "etapa"
+    weight = 1.0
+
+    def run(self, state, output_pdf, is_last, progress, cancel_event):
+        raise NotImplementedError
+
+
+class ConvertStage(Stage):
+    """Word (u otro formato de oficina) a PDF con el pool de conversores abiertos."""
+    name = "convert"
+    weight = 3.0
+
+    def run(self, state, output_pdf, is_last, progress, cancel_event):
+        from converters import get_converter_pool
+
+        converted = state.temp_path("convertido.pdf")
+        get_converter_pool().submit(state.source_path, converted).result()
+        with open(converted, "rb") as f:
+            data = f.read()
+        os.remove(converted)
+        state.replace(fitz.open("pdf", data))
+        progress(1.0)
+
+
+class RemovePagesStage(Stage):
+    """Quita páginas (índices desde 0) sin tocar el documento de la sesión."""
+    name = "remove"
+    weight = 1.0
+
+    def __init__(self, pages_to_remove):
+        self.pages_to_remove = set(pages_to_remove)
+
+    def run(self, state, output_pdf, is_last, progress, cancel_event):
+        doc = state.doc
+        keep = [i for i in range(len(doc)) if i not in self.pages_to_remove]
+        if not keep:
+            raise ValueError("No se pueden eliminar todas las páginas del documento.")
+        # Igual que remove_selected_pages: select() conserva marcadores y vínculos de las páginas que quedan
+        state.own().select(keep)
+        progress(1.0)
+
+
+class CompressStage(Stage):
+    """Compresión con el motor nativo (en memoria) o con Ghostscript."""
+    name = "compress"
+    weight = 4.0
+
+    def __init__(self, quality="ebook", engine="ghostscript"):
+        self.quality = quality
+        self.engine = engine
+
+    def run(self, state, output_pdf, is_last, progress, cancel_event):
+        if self.engine == "native":
+            from native_compressor import recompress_document_images
+            recompress_document_images(state.own(), self.quality,
+                                       progress=lambda done, total: progress(done / total if total else 1.0))
+            return
+
+        from compressor import compress_pdf
+        source = state.temp_path("entrada_gs.pdf")
+        state.doc.save(source, garbage=1)
+        target = output_pdf if is_last else state.temp_path("salida_gs.pdf")
+        success, message = compress_pdf(source, target, self.quality,
+                                        progress=lambda done, total: progress(done / total),
+                                        cancel_event=cancel_event)
+        os.remove(source)
+        if not success:
+            raise RuntimeError(message)
+        if is_last:
+            state.written = True
+        else:
+            state.replace(fitz.open(target))
+
+
+class Pipeline:
+    """Etapas que se ejecutan en orden sobre un mismo documento; la salida se escribe una vez."""
+
+    def __init__(self, stages, save_mode="compact"):
+        self.stages = list(stages)
+        self.save_mode = save_mode
+
+    def run(self, source, output_pdf, progress=None, cancel_event=None):
+        """Ejecuta las etapas; source es una ruta o una DocumentSession.
+
+        progress(fraccion, etapa) recibe el avance combinado de todas las etapas.
+        Devuelve (exito, mensaje) como el resto de las operaciones.
+        """
+        session = source if isinstance(source, DocumentSession) else None
+        source_path = session.path if session is not None else os.path.abspath(source)
+        overwrite = _same_file(source_path, output_pdf)
+        # No se puede reemplazar un archivo abierto: se escribe aparte, en la misma carpeta para
+        # que os.replace no cruce de unidad, y se mueve al final
+        final_path = output_pdf
+        state = PipelineState(source_path=source_path)
+        if overwrite:
+            fd, output_pdf = tempfile.mkstemp(suffix=".pdf", dir=os.path.dirname(os.path.abspath(final_path)))
+            os.close(fd)
+
+        total_weight = sum(stage.weight for stage in self.stages) or 1.0
+        done_weight = 0.0
+        names = [stage.name for stage in self.stages]
+
+        with operation("pipeline", stages=names, input_bytes=os.path.getsize(source_path),
+                       from_session=session is not None) as record:
+            try:
+                locked = False
+                if not self.stages or not isinstance(self.stages[0], ConvertStage):
+                    if session is not None:
+                        session.lock.acquire()
+                        locked = True
+                        state.doc, state.borrowed = session.document(), True
+                    else:
+                        state.doc = fitz.open(source_path)
+                try:
+                    for position, stage in enumerate(self.stages):
+                        if cancel_event is not None and cancel_event.is_set():
+                            from compressor import CANCELLED_MESSAGE
+                            record["ok"], record["cancelled"] = False, True
+                            return False, CANCELLED_MESSAGE
+
+                        def stage_progress(fraction, stage=stage, base=done_weight):
+                            if progress is not None:
+                                progress(min(1.0, (base + stage.weight * fraction) / total_weight), stage.name)
+
+                        stage.run(state, output_pdf, position == len(self.stages) - 1, stage_progress, cancel_event)
+                        done_weight += stage.weight
+                        # Cuando una etapa ya copió el documento de la sesión, la sesión queda libre
+                        if locked and not state.borrowed:
+                            session.lock.release()
+                            locked = False
+                    if not state.written:
+                        state.doc.save(output_pdf, **SAVE_MODES[self.save_mode])
+                    record["pages"] = len(state.doc) if state.doc is not None and not state.doc.is_closed else None
+                finally:
+                    if locked:
+                        session.lock.release()
+
+                if overwrite:
+                    # Los documentos abiertos sobre el original impiden reemplazarlo en Windows
+                    state.close_document()
+                    if session is not None:
+                        session.close()
+                    os.replace(output_pdf, final_path)
+                record["output_bytes"] = os.path.getsize(final_path)
+                if progress is not None:
+                    progress(1.0, "listo")
+                logging.info(f"Trabajo encadenado ({' → '.join(names)}) guardado en {final_path}")
+                return True, "PDF procesado y guardado exitosamente."
+            except Exception as e:
+                from compressor import CANCELLED_MESSAGE
+                message = str(e)
+                record["ok"] = False
+                if message == CANCELLED_MESSAGE:
+                    record["cancelled"] = True
+                    return False, message
+                logging.error(f"Error en el trabajo encadenado ({' → '.join(names)}): {message}")
+                if not overwrite and os.path.exists(final_path):
+                    os.remove(final_path)
+                return False, f"Ocurrió un error al procesar el PDF: {message}"
+            finally:
+                state.close()
+                if overwrite and os.path.exists(output_pdf):
+                    os.remove(output_pdf)
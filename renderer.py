@@ -0,0 +1,103 @@
+# renderer.py
+import os
+import logging
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import fitz
+
+# Por debajo de esta cantidad de páginas arrancar procesos cuesta más de lo que ahorra
+POOL_MIN_PAGES = 40
+
+# Tamaño de los iconos de PageRemoverTab; se renderiza directamente a esta caja
+THUMBNAIL_SIZE = (300, 400)
+
+# samples: RGB (o gris) sin alfa, stride bytes por fila. jpeg: la misma imagen codificada (o None)
+RenderedPage = namedtuple("RenderedPage", "index width height stride samples jpeg")
+
+# Documento abierto por cada proceso del pool (ver _init_pool_worker)
+_worker_doc = None
+
+
+def default_worker_count():
+    """Deja un núcleo libre para la interfaz."""
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def fit_matrix(rect, size):
+    """Matriz que escala la página para que entre en la caja (ancho, alto) manteniendo la proporción."""
+    zoom = min(size[0] / max(rect.width, 1), size[1] / max(rect.height, 1))
+    return fitz.Matrix(zoom, zoom)
+
+
+def render_page(doc, index, size, jpeg_quality=None, gray=False):
+    page = doc[index]
+    pix = page.get_pixmap(matrix=fit_matrix(page.rect, size), colorspace=fitz.csGRAY if gray else fitz.csRGB,
+                          alpha=False)
+    jpeg = pix.tobytes("jpg", jpg_quality=jpeg_quality) if jpeg_quality else None
+    return RenderedPage(index, pix.width, pix.height, pix.stride, pix.samples, jpeg)
+
+
+def _init_pool_worker(pdf_path):
+    global _worker_doc
+    _worker_doc = fitz.open(pdf_path)
+
+
+def _render_in_pool(index, size, jpeg_quality, gray):
+    return render_page(_worker_doc, index, size, jpeg_quality, gray)
+
+
+class PageRasterizer:
+    """Renderiza páginas de un PDF en el hilo actual o repartidas en un pool de procesos.
+
+    Cada proceso del pool abre su propio fitz.Document una sola vez. Las páginas se
+    renderizan ya al tamaño final, sin reescalados posteriores.
+    """
+
+    def __init__(self, pdf_path, size=THUMBNAIL_SIZE, workers=None, jpeg_quality=None,
+                 min_pool_pages=POOL_MIN_PAGES, gray=False):
+        self.pdf_path = pdf_path
+        self.size = size
+        self.jpeg_quality = jpeg_quality
+        self.gray = gray
+        self.doc = fitz.open(pdf_path)
+        self.workers = workers or default_worker_count()
+        self.executor = None
+        if self.workers > 1 and len(self.doc) >= min_pool_pages:
+            try:
+                self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                    initializer=_init_pool_worker,
+                                                    initargs=(pdf_path,))
+            except Exception as e:
+                logging.warning(f"No se pudo iniciar el pool de renderizado, se usa un solo hilo: {e}")
+
+    @property
+    def batch_size(self):
+        """Cantidad de páginas que conviene pedir por vez para ocupar todos los procesos."""
+        return self.workers * 2 if self.executor else 1
+
+    def render(self, indices, ordered=False):
+        """Genera RenderedPage a medida que terminan (o en el orden pedido si ordered=True)."""
+        if self.executor is None:
+            for index in indices:
+                yield render_page(self.doc, index, self.size, self.jpeg_quality, self.gray)
+            return
+
+        futures = [self.executor.submit(_render_in_pool, index, self.size, self.jpeg_quality, self.gray)
+                   for index in indices]
+        try:
+            if ordered:
+                for future in futures:
+                    yield future.result()
+            else:
+                for future in as_completed(futures):
+                    yield future.result()
+        finally:
+            # Si el consumidor abandona el generador, las páginas que no empezaron se descartan
+            for future in futures:
+                future.cancel()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        self.doc.close()
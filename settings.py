@@ -0,0 +1,80 @@
+# settings.py
+import os
+import sys
+import json
+import logging
+
+# Valores por defecto; el usuario puede sobrescribirlos en settings.json dentro de la carpeta de datos
+DEFAULTS = {
+    # Procesos para renderizar miniaturas (0 = automático según núcleos disponibles)
+    "render_workers": 0,
+    # Caché de miniaturas: "on", "encrypted" (solo Windows, DPAPI) u "off" para material sensible
+    "thumbnail_cache": "on",
+    "thumbnail_cache_mb": 256,
+    # Caché en memoria de los mosaicos de la vista previa en alta resolución
+    "preview_cache_mb": 128,
+    # Procesos de Ghostscript simultáneos en compresión por lotes (0 = uno por núcleo)
+    "compression_workers": 0,
+    # Motor de compresión por defecto: "ghostscript" o "native" (PyMuPDF + Pillow)
+    "compression_engine": "ghostscript",
+    # Cómo se ejecuta Ghostscript: "auto", "gsapi" (biblioteca en el proceso) o "subprocess"
+    "ghostscript_backend": "auto",
+    # Borrado seguro: pasadas, patrón ("zeros", "random" o "dod") y archivos simultáneos
+    "shred_passes": 1,
+    "shred_pattern": "zeros",
+    "shred_workers": 2,
+    # Conversión de Word a PDF: "auto", "word", "libreoffice" o "fake"; instancias abiertas
+    # en simultáneo y documentos tras los cuales se reinicia cada una
+    "converter_backend": "auto",
+    "converter_workers": 2,
+    "converter_recycle_after": 50,
+    # Trabajos simultáneos por recurso en el planificador (jobs.py); p. ej. {"compress": 2}
+    "job_limits": {},
+    # Carpetas vigiladas (python -m legaldocs watch): carpetas, salida ("" = la misma carpeta),
+    # regla de nombres ({name}, {quality}, {date}), calidad, compresiones simultáneas y
+    # segundos sin cambios de tamaño ni fecha antes de tomar un archivo
+    "watch_folders": [],
+    "watch_output_dir": "",
+    "watch_name_pattern": "{name}_comprimido.pdf",
+    "watch_quality": "ebook",
+    "watch_workers": 2,
+    "watch_stable_seconds": 2.0,
+    # Telemetría por operación en telemetry.jsonl: "on" u "off"; tamaño de cada archivo y copias rotadas
+    "telemetry": "on",
+    "telemetry_max_mb": 5,
+    "telemetry_backups": 3,
+}
+
+_settings = None
+
+
+def get_app_data_dir():
+    """Carpeta de datos de la aplicación (%LOCALAPPDATA%\\LegalDocs o ~/.LegalDocs)."""
+    if sys.platform == "win32":
+        appdata_path = os.path.join(os.getenv('LOCALAPPDATA'), "LegalDocs")
+    else:
+        appdata_path = os.path.join(os.path.expanduser("~"), ".LegalDocs")
+
+    if not os.path.exists(appdata_path):
+        os.makedirs(appdata_path)
+    return appdata_path
+
+
+def load_settings():
+    """Lee settings.json una sola vez y lo combina con los valores por defecto."""
+    global _settings
+    if _settings is None:
+        _settings = dict(DEFAULTS)
+        settings_path = os.path.join(get_app_data_dir(), "settings.json")
+        try:
+            with open(settings_path, "r", encoding="utf-8") as f:
+                _settings.update(json.load(f))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logging.warning(f"No se pudo leer la configuración {settings_path}: {e}")
+    return _settings
+
+
+def get_setting(key):
+    return load_settings().get(key, DEFAULTS.get(key))
@@ -0,0 +1,233 @@
+# telemetry.py
+"""Registro estructurado de cada operación (JSON por línea) y un informe de percentiles.
+
+Uso:
+    with telemetry.operation("remove", pages=120, input_bytes=size) as record:
+        ...
+        record["output_bytes"] = os.path.getsize(salida)
+
+Al salir se agregan tiempo real, tiempo de CPU (propio y de procesos hijos como
+Ghostscript), rendimiento y memoria pico. Con telemetry = "off" en settings.json
+operation() devuelve un contexto vacío y no se escribe nada.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from logging.handlers import RotatingFileHandler
+
+from settings import get_app_data_dir, get_setting
+
+LOG_NAME = "telemetry.jsonl"
+PERCENTILES = (50, 90, 99)
+
+_logger = None
+_logger_lock = threading.Lock()
+
+
+def enabled():
+    return get_setting("telemetry") != "off"
+
+
+def log_path():
+    return os.path.join(get_app_data_dir(), LOG_NAME)
+
+
+def _get_logger():
+    """Logger propio con rotación por tamaño; no se mezcla con app_activity.log."""
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            logger = logging.getLogger("legaldocs.telemetry")
+            logger.propagate = False
+            logger.setLevel(logging.INFO)
+            handler = RotatingFileHandler(log_path(), maxBytes=int(get_setting("telemetry_max_mb") * 1024 * 1024),
+                                          backupCount=get_setting("telemetry_backups"), encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            _logger = logger
+    return _logger
+
+
+def _windows_peak_rss():
+    """PeakWorkingSetSize de GetProcessMemoryInfo, sin depender de psutil."""
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+    kernel32 = ctypes.WinDLL("kernel32")
+    psapi = ctypes.WinDLL("psapi")
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    psapi.GetProcessMemoryInfo.argtypes = [wintypes.HANDLE, ctypes.POINTER(ProcessMemoryCounters), wintypes.DWORD]
+    psapi.GetProcessMemoryInfo.restype = wintypes.BOOL
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    if not psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+        return None
+    return counters.PeakWorkingSetSize
+
+
+def peak_rss_bytes():
+    """Memoria residente pico del proceso hasta ahora, en bytes (None si no se puede medir)."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux informa KiB; macOS, bytes
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        pass
+    if sys.platform == "win32":
+        try:
+            return _windows_peak_rss()
+        except (OSError, AttributeError) as e:
+            logging.debug(f"No se pudo leer la memoria pico: {e}")
+    return None
+
+
+def peak_rss_mb():
+    """Memoria residente pico del proceso hasta ahora, en MB (None si no se puede medir)."""
+    peak = peak_rss_bytes()
+    return round(peak / (1024 * 1024), 1) if peak is not None else None
+
+
+def file_size(path):
+    """Tamaño de path, o None si ya no existe (movido o borrado mientras se trabajaba)."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+def _children_cpu():
+    times = os.times()
+    return times.children_user + times.children_system
+
+
+def record(name, **fields):
+    """Escribe un registro ya medido (p. ej. un archivo de un lote con su propio tiempo)."""
+    if not enabled():
+        return
+    entry = {"ts": time.strftime("%Y-%m-%dT%H:%M:%S"), "op": name}
+    entry.update(fields)
+    seconds = entry.get("seconds")
+    if seconds and "throughput" not in entry:
+        if entry.get("pages"):
+            entry["throughput"], entry["throughput_unit"] = round(entry["pages"] / seconds, 3), "pages/s"
+        elif entry.get("input_bytes"):
+            entry["throughput"], entry["throughput_unit"] = round(entry["input_bytes"] / seconds / 1e6, 3), "MB/s"
+    entry.setdefault("peak_rss_mb", peak_rss_mb())
+    try:
+        _get_logger().info(json.dumps(entry, ensure_ascii=False, default=str))
+    except Exception as e:
+        logging.warning(f"No se pudo escribir la telemetría: {e}")
+
+
+class _Operation:
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        self.children_start = _children_cpu()
+        return self.fields
+
+    def __exit__(self, exc_type, exc, tb):
+        fields = self.fields
+        fields.setdefault("ok", exc_type is None)
+        if exc is not None:
+            fields.setdefault("error", str(exc))
+        record(self.name,
+               seconds=round(time.perf_counter() - self.start, 4),
+               cpu_seconds=round(time.process_time() - self.cpu_start, 4),
+               child_cpu_seconds=round(_children_cpu() - self.children_start, 4),
+               **fields)
+        return False
+
+
+class _NullOperation:
+    def __enter__(self):
+        return {}
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_OPERATION = _NullOperation()
+
+
+def operation(name, **fields):
+    """Contexto que mide una operación; el dict devuelto admite campos adicionales.
+
+    Un campo "ok" en False (para funciones que devuelven (exito, mensaje)) marca la
+    operación como fallida aunque no haya habido excepción.
+    """
+    if not enabled():
+        return _NULL_OPERATION
+    return _Operation(name, fields)
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, -(-len(ordered) * percent // 100) - 1))
+    return ordered[index]
+
+
+def load_entries(path=None):
+    """Lee el log y sus copias rotadas (las más viejas primero)."""
+    path = path or log_path()
+    files = [f"{path}.{i}" for i in range(get_setting("telemetry_backups"), 0, -1)] + [path]
+    entries = []
+    for file_path in files:
+        if not os.path.exists(file_path):
+            continue
+        with open(file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+    return entries
+
+
+def build_report(entries):
+    """Agrupa por operación: cantidad, fallas y percentiles de tiempo y rendimiento."""
+    groups = {}
+    for entry in entries:
+        groups.setdefault(entry.get("op", "?"), []).append(entry)
+    report = {}
+    for name, items in sorted(groups.items()):
+        seconds = [item["seconds"] for item in items if isinstance(item.get("seconds"), (int, float))]
+        throughput = [item["throughput"] for item in items if isinstance(item.get("throughput"), (int, float))]
+        rss = [item["peak_rss_mb"] for item in items if isinstance(item.get("peak_rss_mb"), (int, float))]
+        summary = {"count": len(items), "failed": sum(1 for item in items if item.get("ok") is False)}
+        if seconds:
+            summary["seconds"] = {f"p{p}": _percentile(seconds, p) for p in PERCENTILES}
+        if throughput:
+            units = {item.get("throughput_unit") for item in items if item.get("throughput_unit")}
+            summary["throughput"] = {f"p{p}": _percentile(throughput, p) for p in PERCENTILES}
+            summary["throughput_unit"] = "/".join(sorted(units))
+        if rss:
+            summary["peak_rss_mb_max"] = max(rss)
+        report[name] = summary
+    return report
+
+
+def format_report(report):
+    lines = [f"{'operación':<14} {'n':>5} {'fallas':>6} {'p50 s':>9} {'p90 s':>9} {'p99 s':>9} {'p50 rend.':>16}"]
+    for name, summary in report.items():
+        seconds = summary.get("seconds", {})
+        throughput = summary.get("throughput", {})
+        rate = f"{throughput['p50']} {summary['throughput_unit']}" if throughput else "-"
+        lines.append(f"{name:<14} {summary['count']:>5} {summary['failed']:>6} "
+                     f"{seconds.get('p50', '-'):>9} {seconds.get('p90', '-'):>9} {seconds.get('p99', '-'):>9} {rate:>16}")
+    return "\n".join(lines)
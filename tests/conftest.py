@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    """PDF de cinco páginas con un marcador por página."""
+    import fitz
+
+    path = tmp_path / "muestra.pdf"
+    doc = fitz.open()
+    for number in range(5):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Página {number + 1}")
+    doc.set_toc([[1, f"Página {number + 1}", number + 1] for number in range(5)])
+    doc.save(str(path))
+    doc.close()
+    return str(path)
@@ -0,0 +1,107 @@
+import time
+import shutil
+import threading
+
+import fitz
+import pytest
+
+import compressor
+from compressor import CANCELLED_MESSAGE, compress_batch, compress_pdf_sharded
+
+
+@pytest.fixture
+def linked_pdf(tmp_path):
+    """Seis páginas con vínculos dentro del mismo rango y entre rangos distintos."""
+    path = tmp_path / "expediente.pdf"
+    doc = fitz.open()
+    for number in range(6):
+        doc.new_page().insert_text((72, 72), f"Foja {number + 1}")
+    for source, target in ((0, 1), (0, 5), (5, 0), (3, 2)):
+        doc[source].insert_link({"kind": fitz.LINK_GOTO, "from": fitz.Rect(72, 100 + 20 * target, 200, 115 + 20 * target),
+                                 "page": target, "to": fitz.Point(0, 0)})
+    doc.set_toc([[1, "Inicio", 1], [1, "Final", 6]])
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def _links(path):
+    with fitz.open(path) as doc:
+        return sorted((page.number, link["page"]) for page in doc for link in page.get_links()
+                      if link["kind"] == fitz.LINK_GOTO)
+
+
+def _copy_engine(input_pdf, output_pdf, quality, engine="ghostscript", progress=None, cancel_event=None):
+    shutil.copyfile(input_pdf, output_pdf)
+    return True, "ok"
+
+
+def test_sharded_keeps_cross_shard_links(linked_pdf, tmp_path, monkeypatch):
+    monkeypatch.setattr(compressor, "SHARD_MIN_SIZE", 2)
+    monkeypatch.setattr(compressor, "compress_with_engine", _copy_engine)
+    output = str(tmp_path / "salida.pdf")
+
+    ok, message = compress_pdf_sharded(linked_pdf, output, "ebook", max_workers=3, min_pages=1)
+
+    assert ok, message
+    assert _links(output) == _links(linked_pdf) == [(0, 1), (0, 5), (3, 2), (5, 0)]
+    with fitz.open(output) as doc:
+        assert len(doc) == 6
+        assert [title for _, title, _ in doc.get_toc()] == ["Inicio", "Final"]
+
+
+def test_sharded_failure_cancels_other_shards(linked_pdf, tmp_path, monkeypatch):
+    started, cancelled = [], []
+
+    def engine(input_pdf, output_pdf, quality, engine="ghostscript", progress=None, cancel_event=None):
+        if input_pdf.endswith("parte_000.pdf"):
+            return False, "Error en el proceso de Ghostscript."
+        # Las demás partes tardan hasta que se las cancela
+        started.append(input_pdf)
+        if cancel_event.wait(10):
+            cancelled.append(input_pdf)
+            return False, CANCELLED_MESSAGE
+        return _copy_engine(input_pdf, output_pdf, quality)
+
+    monkeypatch.setattr(compressor, "SHARD_MIN_SIZE", 2)
+    monkeypatch.setattr(compressor, "compress_with_engine", engine)
+    start = time.monotonic()
+
+    ok, message = compress_pdf_sharded(linked_pdf, str(tmp_path / "salida.pdf"), "ebook", max_workers=3, min_pages=1)
+
+    assert not ok
+    assert message == "Error en el proceso de Ghostscript."
+    assert time.monotonic() - start < 5
+    # Las partes que llegaron a empezar se interrumpieron; las demás ni siquiera arrancaron
+    assert sorted(cancelled) == sorted(started)
+
+
+def test_batch_closed_early_cancels_pending(tmp_path, monkeypatch):
+    started = []
+
+    def engine(input_pdf, output_pdf, quality, engine="ghostscript", progress=None, cancel_event=None):
+        started.append(input_pdf)
+        if input_pdf != "0":
+            cancel_event.wait(10)
+        return (False, CANCELLED_MESSAGE) if cancel_event.is_set() else (True, "ok")
+
+    monkeypatch.setattr(compressor, "compress_with_engine", engine)
+    batch = compress_batch([(str(index), str(index)) for index in range(6)], "ebook", max_workers=2)
+
+    assert next(batch)[0] == 0
+    start = time.monotonic()
+    batch.close()
+
+    assert time.monotonic() - start < 5
+    # Solo llegaron a empezar los que ocupaban los dos hilos; el resto se canceló
+    assert len(started) <= 3
+
+
+def test_batch_respects_caller_cancel(monkeypatch):
+    monkeypatch.setattr(compressor, "compress_with_engine", lambda *args, **kwargs: (True, "ok"))
+    cancel = threading.Event()
+    cancel.set()
+
+    results = list(compress_batch([("a", "b"), ("c", "d")], "ebook", max_workers=2, cancel_event=cancel))
+
+    assert sorted(results) == [(0, False, CANCELLED_MESSAGE), (1, False, CANCELLED_MESSAGE)]
@@ -0,0 +1,91 @@
+import time
+import threading
+
+import pytest
+
+from converters import ConverterPool, FakeBackend
+
+
+def _wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def documents(tmp_path):
+    def make(count):
+        pairs = []
+        for number in range(count):
+            src = tmp_path / f"escrito{number}.docx"
+            src.write_bytes(b"docx")
+            pairs.append((str(src), str(tmp_path / "pdf" / f"escrito{number}.pdf")))
+        return pairs
+    return make
+
+
+def test_recycles_after_n_documents(documents):
+    backends = []
+
+    def factory():
+        backends.append(FakeBackend())
+        return backends[-1]
+
+    pool = ConverterPool(factory, size=1, recycle_after=3)
+    for future in pool.convert_many(documents(7)):
+        future.result(timeout=5)
+    pool.shutdown()
+
+    # Arranque inicial y un reinicio cada tres documentos: 1-3, 4-6, 7
+    assert backends[0].starts == 3
+    assert pool.restarts == 0
+
+
+def test_crash_restarts_and_retries_once(documents):
+    # El segundo documento tumba el conversor: se reinicia y el reintento funciona
+    backend = FakeBackend(crash_every=2)
+    pool = ConverterPool(lambda: backend, size=1)
+    results = [future.result(timeout=5) for future in pool.convert_many(documents(2))]
+    pool.shutdown()
+
+    assert all(path.endswith(".pdf") for path in results)
+    assert pool.restarts == 1
+    assert backend.starts == 2
+
+
+def test_crash_on_retry_fails_the_document(documents):
+    # Se cae en cada conversión: el reintento también falla y el error llega al Future
+    pool = ConverterPool(lambda: FakeBackend(crash_every=1), size=1)
+    future = pool.submit(*documents(1)[0])
+
+    with pytest.raises(RuntimeError):
+        future.result(timeout=5)
+    pool.shutdown()
+    assert pool.restarts == 1
+
+
+def test_shutdown_cancels_queued_jobs(documents):
+    release = threading.Event()
+
+    class SlowBackend(FakeBackend):
+        def convert(self, src, dst):
+            release.wait(5)
+            super().convert(src, dst)
+
+    pool = ConverterPool(SlowBackend, size=1)
+    futures = pool.convert_many(documents(5))
+    assert _wait_until(futures[0].running)
+
+    closer = threading.Thread(target=pool.shutdown)
+    closer.start()
+    # La conversión en curso termina; las encoladas no deben esperar a convertirse
+    cancelled = _wait_until(lambda: all(future.cancelled() for future in futures[1:]), timeout=2)
+    release.set()
+    closer.join(timeout=5)
+
+    assert cancelled
+    assert not closer.is_alive()
+    assert futures[0].result(timeout=5).endswith(".pdf")
+    with pytest.raises(RuntimeError):
+        pool.submit(*documents(1)[0])
@@ -0,0 +1,60 @@
+import time
+import threading
+
+from jobs import JobScheduler, BATCH, NORMAL, INTERACTIVE, CancelToken
+
+
+def _interactive_span(scheduler, started, release):
+    job = type("InteractiveJob", (), {"priority": INTERACTIVE})()
+    with scheduler.busy(job):
+        started.set()
+        release.wait(5)
+
+
+def _blocks(token, timeout=0.3):
+    finished = threading.Event()
+    thread = threading.Thread(target=lambda: (token.wait_if_paused(), finished.set()), daemon=True)
+    thread.start()
+    return not finished.wait(timeout), finished
+
+
+def test_batch_yields_while_interactive_work_runs():
+    scheduler = JobScheduler()
+    started, release = threading.Event(), threading.Event()
+    threading.Thread(target=_interactive_span, args=(scheduler, started, release), daemon=True).start()
+    assert started.wait(5)
+
+    blocked, finished = _blocks(CancelToken(scheduler, BATCH))
+    assert blocked
+    release.set()
+    assert finished.wait(5)
+
+
+def test_normal_and_interactive_never_yield():
+    scheduler = JobScheduler()
+    started, release = threading.Event(), threading.Event()
+    threading.Thread(target=_interactive_span, args=(scheduler, started, release), daemon=True).start()
+    assert started.wait(5)
+
+    try:
+        for priority in (NORMAL, INTERACTIVE):
+            blocked, _ = _blocks(CancelToken(scheduler, priority))
+            assert not blocked
+    finally:
+        release.set()
+
+
+def test_cancel_releases_a_paused_batch_job():
+    scheduler = JobScheduler()
+    started, release = threading.Event(), threading.Event()
+    threading.Thread(target=_interactive_span, args=(scheduler, started, release), daemon=True).start()
+    assert started.wait(5)
+
+    token = CancelToken(scheduler, BATCH)
+    blocked, finished = _blocks(token)
+    assert blocked
+    start = time.monotonic()
+    token.cancel()
+    assert finished.wait(5)
+    assert time.monotonic() - start < 2
+    release.set()
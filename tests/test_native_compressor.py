@@ -0,0 +1,80 @@
+import io
+
+import fitz
+from PIL import Image, ImageDraw
+
+from native_compressor import compress_pdf_native
+
+
+def _image_xrefs(path):
+    with fitz.open(path) as doc:
+        return sorted({image[0] for page in doc for image in page.get_images(full=True)})
+
+
+def _stored_images(path):
+    with fitz.open(path) as doc:
+        return sum(1 for xref in range(1, doc.xref_length()) if doc.xref_get_key(xref, "Subtype")[1] == "/Image")
+
+
+def _encode(image, fmt):
+    buffer = io.BytesIO()
+    image.save(buffer, fmt)
+    return buffer.getvalue()
+
+
+def _mean_gray(page):
+    pix = page.get_pixmap(dpi=36, colorspace=fitz.csGRAY)
+    return sum(pix.samples) / len(pix.samples)
+
+
+def _scanned_pdf(path):
+    """Dos páginas escaneadas a 600 dpi: una foto en color y una de texto en blanco y negro."""
+    photo = Image.effect_mandelbrot((2400, 3000), (-2.0, -1.5, 1.0, 1.5), 100).convert("RGB")
+    photo = Image.merge("RGB", (photo.getchannel(0), photo.getchannel(0).rotate(90), photo.getchannel(0)))
+    text = Image.new("L", (2400, 3000), 255)
+    draw = ImageDraw.Draw(text)
+    # Renglones gruesos: siguen siendo blanco y negro después de reducir a 150 dpi
+    for top in range(100, 2700, 360):
+        for left in range(100, 1900, 600):
+            draw.rectangle((left, top, left + 480, top + 240), fill=0)
+    doc = fitz.open()
+    for stream in (_encode(photo, "PNG"), _encode(text, "JPEG")):
+        page = doc.new_page(width=288, height=360)
+        page.insert_image(page.rect, stream=stream)
+    doc.save(str(path))
+    doc.close()
+
+
+def test_images_are_rewritten_in_place(tmp_path):
+    source, target = tmp_path / "entrada.pdf", tmp_path / "salida.pdf"
+    _scanned_pdf(source)
+
+    ok, message = compress_pdf_native(str(source), str(target), "ebook", max_workers=2)
+
+    assert ok, message
+    assert target.stat().st_size < source.stat().st_size
+    assert _stored_images(str(target)) == _stored_images(str(source)) == 2
+    assert len(_image_xrefs(str(target))) == 2
+    with fitz.open(str(target)) as doc:
+        widths = sorted(doc.extract_image(xref)["width"] for xref in _image_xrefs(str(target)))
+        assert widths == [600, 600]
+        bits = sorted(doc.xref_get_key(xref, "BitsPerComponent")[1] for xref in _image_xrefs(str(target)))
+        assert bits == ["1", "8"]
+        converted = _mean_gray(doc[1])
+    with fitz.open(str(source)) as doc:
+        original = _mean_gray(doc[1])
+    # El texto a 1 bit no debe quedar invertido
+    assert abs(converted - original) < 10
+
+
+def test_output_never_larger_than_input(tmp_path):
+    source, target = tmp_path / "entrada.pdf", tmp_path / "salida.pdf"
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Sin imágenes")
+    doc.save(str(source), garbage=3, deflate=True, use_objstms=1)
+    doc.close()
+
+    ok, _ = compress_pdf_native(str(source), str(target), "screen")
+
+    assert ok
+    assert target.read_bytes() == source.read_bytes()
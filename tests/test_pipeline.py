@@ -0,0 +1,42 @@
+import os
+
+import fitz
+
+from pipeline import Pipeline, RemovePagesStage, open_session, release_session
+
+
+def _pdf_files(folder):
+    return sorted(name for name in os.listdir(folder) if name.endswith(".pdf"))
+
+
+def test_overwrite_replaces_source(sample_pdf):
+    ok, message = Pipeline([RemovePagesStage([1])]).run(sample_pdf, sample_pdf)
+
+    assert ok, message
+    with fitz.open(sample_pdf) as doc:
+        assert len(doc) == 4
+        assert [title for _, title, _ in doc.get_toc()] == ["Página 1", "Página 3", "Página 4", "Página 5"]
+    # El archivo temporal se crea junto al destino y no debe quedar
+    assert _pdf_files(os.path.dirname(sample_pdf)) == ["muestra.pdf"]
+
+
+def test_overwrite_from_session(sample_pdf):
+    session = open_session(sample_pdf)
+    try:
+        ok, message = Pipeline([RemovePagesStage([0, 4])]).run(session, sample_pdf)
+    finally:
+        release_session(session)
+
+    assert ok, message
+    with fitz.open(sample_pdf) as doc:
+        assert len(doc) == 3
+    assert _pdf_files(os.path.dirname(sample_pdf)) == ["muestra.pdf"]
+
+
+def test_failed_overwrite_keeps_source(sample_pdf):
+    ok, _ = Pipeline([RemovePagesStage(range(5))]).run(sample_pdf, sample_pdf)
+
+    assert not ok
+    with fitz.open(sample_pdf) as doc:
+        assert len(doc) == 5
+    assert _pdf_files(os.path.dirname(sample_pdf)) == ["muestra.pdf"]
@@ -0,0 +1,44 @@
+import os
+import sqlite3
+
+from thumbnail_cache import SCHEMA_VERSION, ThumbnailCache, file_fingerprint
+
+
+def _old_cache(db_path, pdf_path):
+    """Base con el esquema anterior y un hash memorizado con la huella de entonces."""
+    stat = os.stat(pdf_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE thumbnails (doc_hash TEXT, page INTEGER, variant TEXT, data BLOB)")
+    conn.execute("CREATE TABLE documents (path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime REAL NOT NULL, "
+                 "doc_hash TEXT NOT NULL)")
+    conn.execute("INSERT INTO documents VALUES (?, ?, ?, ?)",
+                 (os.path.abspath(pdf_path), stat.st_size, stat.st_mtime, "0" * 64))
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION - 1}")
+    conn.commit()
+    conn.close()
+
+
+def test_schema_change_discards_memoized_hashes(sample_pdf, tmp_path):
+    db_path = str(tmp_path / "miniaturas.db")
+    _old_cache(db_path, sample_pdf)
+
+    cache = ThumbnailCache(db_path, 10 * 1024 * 1024)
+    try:
+        assert cache.document_hash(sample_pdf) == file_fingerprint(sample_pdf)
+    finally:
+        cache.close()
+
+
+def test_put_and_get_survive_reopening(sample_pdf, tmp_path):
+    db_path = str(tmp_path / "miniaturas.db")
+    cache = ThumbnailCache(db_path, 10 * 1024 * 1024)
+    doc_hash = cache.document_hash(sample_pdf)
+    cache.put(doc_hash, 0, "300x400", b"png")
+    cache.close()
+
+    cache = ThumbnailCache(db_path, 10 * 1024 * 1024)
+    try:
+        assert cache.document_hash(sample_pdf) == doc_hash
+        assert cache.get_many(doc_hash, [0, 1], "300x400") == {0: b"png"}
+    finally:
+        cache.close()
@@ -0,0 +1,138 @@
+import os
+import time
+import shutil
+import threading
+
+import pytest
+
+from watch_folder import FolderWatcher, PARTIAL_PREFIX
+
+
+def _wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+
+def _write_pdf(path, content=b"%PDF-1.4\n%%EOF\n"):
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+class CopyCompress:
+    """Hook de compresión que copia el archivo y recuerda qué recibió."""
+
+    def __init__(self, result=True):
+        self.result = result
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, input_path, output_path):
+        with self.lock:
+            self.calls.append(input_path)
+        if not self.result:
+            return False, "Error simulado."
+        shutil.copyfile(input_path, output_path)
+        return True, "ok"
+
+
+@pytest.fixture
+def inbox(tmp_path):
+    folder = tmp_path / "bandeja"
+    folder.mkdir()
+    return folder
+
+
+def _watcher(inbox, compress, **kwargs):
+    options = {"stable_seconds": 0.2, "poll_interval": 0.05, "use_inotify": False}
+    options.update(kwargs)
+    return FolderWatcher([str(inbox)], compress=compress, **options)
+
+
+def test_waits_until_file_is_stable(inbox):
+    watcher = _watcher(inbox, CopyCompress(), stable_seconds=0.4)
+    path = str(inbox / "escaneo.pdf")
+    _write_pdf(path)
+
+    watcher.notice(path)
+    assert watcher.check_stable() == 0
+    time.sleep(0.25)
+    # El escáner sigue escribiendo: la espera vuelve a empezar
+    _write_pdf(path, b"%PDF-1.4\n" + b"0" * 1024 + b"\n%%EOF\n")
+    assert watcher.check_stable() == 0
+    time.sleep(0.25)
+    assert watcher.check_stable() == 0
+    time.sleep(0.25)
+    assert watcher.check_stable() == 1
+    assert watcher.stats()["queued"] == 1
+
+
+def test_does_not_retake_its_own_outputs(inbox):
+    compress = CopyCompress()
+    watcher = _watcher(inbox, compress)
+    watcher.start()
+    try:
+        _write_pdf(str(inbox / "escrito.pdf"))
+        assert _wait_until(lambda: watcher.stats()["processed"] == 1)
+        # Varias vueltas más de sondeo: la salida está en la carpeta vigilada
+        time.sleep(0.5)
+    finally:
+        watcher.stop()
+
+    assert compress.calls == [str(inbox / "escrito.pdf")]
+    assert sorted(os.listdir(inbox)) == ["escrito.pdf", "escrito_comprimido.pdf"]
+    assert watcher.stats()["waiting"] == 0
+
+
+def test_restart_skips_files_already_compressed(inbox):
+    first = CopyCompress()
+    watcher = _watcher(inbox, first)
+    watcher.start()
+    try:
+        _write_pdf(str(inbox / "escrito.pdf"))
+        assert _wait_until(lambda: watcher.stats()["processed"] == 1)
+    finally:
+        watcher.stop()
+
+    second = CopyCompress()
+    restarted = _watcher(inbox, second)
+    restarted.start()
+    try:
+        assert _wait_until(lambda: restarted.stats()["skipped"] == 1)
+    finally:
+        restarted.stop()
+
+    assert second.calls == []
+    assert restarted.stats()["processed"] == 0
+
+
+def test_failures_are_counted_and_leave_no_output(inbox):
+    compress = CopyCompress(result=False)
+    watcher = _watcher(inbox, compress)
+    watcher.start()
+    try:
+        _write_pdf(str(inbox / "a.pdf"))
+        _write_pdf(str(inbox / "b.pdf"))
+        assert _wait_until(lambda: watcher.stats()["failed"] == 2)
+    finally:
+        watcher.stop()
+
+    stats = watcher.stats()
+    assert (stats["processed"], stats["failed"]) == (0, 2)
+    assert sorted(os.listdir(inbox)) == ["a.pdf", "b.pdf"]
+    assert not any(name.startswith(PARTIAL_PREFIX) for name in os.listdir(inbox))
+
+
+def test_exception_in_hook_counts_as_failure(inbox):
+    def broken(input_path, output_path):
+        raise RuntimeError("Ghostscript no disponible")
+
+    watcher = _watcher(inbox, broken)
+    watcher.start()
+    try:
+        _write_pdf(str(inbox / "a.pdf"))
+        assert _wait_until(lambda: watcher.stats()["failed"] == 1)
+    finally:
+        watcher.stop()
+    assert watcher.stats()["in_flight"] == 0
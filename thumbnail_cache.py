@@ -0,0 +1,179 @@
+# thumbnail_cache.py
+import os
+import sys
+import time
+import sqlite3
+import hashlib
+import logging
+from settings import get_app_data_dir, get_setting
+
+# La huella lee FINGERPRINT_BLOCKS bloques repartidos en el archivo (incluidos el primero y el
+# último, donde están el encabezado y la tabla xref con el /ID del documento)
+FINGERPRINT_BLOCK = 64 * 1024
+FINGERPRINT_BLOCKS = 8
+# Incrementar al cambiar el esquema: la caché se descarta y se vuelve a crear
+SCHEMA_VERSION = 3
+
+
+def file_fingerprint(file_path):
+    """Huella BLAKE2b del tamaño, la fecha de modificación y unos pocos bloques del archivo.
+
+    Lee como mucho FINGERPRINT_BLOCKS * FINGERPRINT_BLOCK bytes: un escaneo de 500 MB en una
+    carpeta de red no se lee entero antes de mostrar la primera miniatura. Una copia con la
+    misma fecha (copy2, la mayoría de los exploradores) comparte la huella.
+    """
+    stat = os.stat(file_path)
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    last = max(0, stat.st_size - FINGERPRINT_BLOCK)
+    offsets = sorted({last * i // (FINGERPRINT_BLOCKS - 1) for i in range(FINGERPRINT_BLOCKS)})
+    with open(file_path, "rb") as f:
+        for offset in offsets:
+            f.seek(offset)
+            h.update(f.read(FINGERPRINT_BLOCK))
+    return h.hexdigest()
+
+
+def _protect(data):
+    import win32crypt
+    return win32crypt.CryptProtectData(data, None, None, None, None, 0)
+
+
+def _unprotect(data):
+    import win32crypt
+    return win32crypt.CryptUnprotectData(data, None, None, None, 0)[1]
+
+
+class ThumbnailCache:
+    """Caché de miniaturas en un único archivo SQLite con expulsión LRU por tamaño.
+
+    Las entradas se indexan por huella del archivo, número de página y variante de
+    renderizado (p. ej. "300x400"). Con
+    encrypt=True los blobs se cifran con DPAPI (ligado al usuario de Windows).
+    put() no confirma la transacción: las escrituras se agrupan hasta flush() o close().
+    Una instancia solo debe usarse desde el hilo que la creó.
+    """
+
+    def __init__(self, db_path, max_bytes, encrypt=False):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.encrypt = encrypt
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            # documents también: guarda hashes calculados con el esquema anterior
+            self.conn.execute("DROP TABLE IF EXISTS thumbnails")
+            self.conn.execute("DROP TABLE IF EXISTS documents")
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS thumbnails (
+                doc_hash TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                variant TEXT NOT NULL,
+                encrypted INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (doc_hash, page, variant)
+            )""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS thumbnails_lru ON thumbnails (last_access)")
+        # Evita recalcular el hash de archivos que no cambiaron desde la última apertura
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS documents (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                doc_hash TEXT NOT NULL
+            )""")
+        self.conn.commit()
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM thumbnails").fetchone()[0]
+
+    def document_hash(self, pdf_path):
+        path = os.path.abspath(pdf_path)
+        stat = os.stat(path)
+        row = self.conn.execute("SELECT size, mtime, doc_hash FROM documents WHERE path = ?", (path,)).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime:
+            return row[2]
+        doc_hash = file_fingerprint(path)
+        self.conn.execute("INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?)",
+                          (path, stat.st_size, stat.st_mtime, doc_hash))
+        self.conn.commit()
+        return doc_hash
+
+    def get_many(self, doc_hash, pages, variant):
+        """Devuelve {pagina: bytes} con las entradas presentes y actualiza su último acceso."""
+        found = {}
+        if not pages:
+            return found
+        placeholders = ",".join("?" * len(pages))
+        rows = self.conn.execute(
+            f"SELECT page, encrypted, data FROM thumbnails WHERE doc_hash = ? AND variant = ? AND page IN ({placeholders})",
+            (doc_hash, variant, *pages)).fetchall()
+        for page, encrypted, data in rows:
+            if encrypted != self.encrypt:
+                continue
+            try:
+                found[page] = _unprotect(data) if encrypted else data
+            except Exception as e:
+                logging.warning(f"Entrada de caché ilegible (página {page}): {e}")
+        if found:
+            now = time.time()
+            self.conn.executemany("UPDATE thumbnails SET last_access = ? WHERE doc_hash = ? AND page = ? AND variant = ?",
+                                  [(now, doc_hash, page, variant) for page in found])
+            self.conn.commit()
+        return found
+
+    def put(self, doc_hash, page, variant, data):
+        if self.encrypt:
+            data = _protect(data)
+        old = self.conn.execute("SELECT size FROM thumbnails WHERE doc_hash = ? AND page = ? AND variant = ?",
+                                (doc_hash, page, variant)).fetchone()
+        self.conn.execute("INSERT OR REPLACE INTO thumbnails VALUES (?, ?, ?, ?, ?, ?, ?)",
+                          (doc_hash, page, variant, int(self.encrypt), data, len(data), time.time()))
+        self.total_bytes += len(data) - (old[0] if old else 0)
+        if self.total_bytes > self.max_bytes:
+            self._evict()
+
+    def flush(self):
+        """Confirma las escrituras pendientes de put() en una sola transacción."""
+        self.conn.commit()
+
+    def _evict(self):
+        """Elimina las entradas menos usadas hasta quedar en el 90% del límite."""
+        target = self.max_bytes * 0.9
+        rows = self.conn.execute("SELECT rowid, size FROM thumbnails ORDER BY last_access").fetchall()
+        expired = []
+        for rowid, size in rows:
+            if self.total_bytes <= target:
+                break
+            expired.append((rowid,))
+            self.total_bytes -= size
+        self.conn.executemany("DELETE FROM thumbnails WHERE rowid = ?", expired)
+
+    def clear(self):
+        self.conn.execute("DELETE FROM thumbnails")
+        self.conn.execute("DELETE FROM documents")
+        self.conn.commit()
+        self.total_bytes = 0
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+def open_thumbnail_cache():
+    """Abre la caché según la configuración; devuelve None si está deshabilitada o no disponible."""
+    mode = get_setting("thumbnail_cache")
+    if mode == "off":
+        return None
+    encrypt = mode == "encrypted"
+    if encrypt and sys.platform != "win32":
+        # Sin DPAPI no hay forma segura de guardar la clave: mejor no cachear material sensible
+        logging.warning("Caché cifrada no disponible en esta plataforma; la caché de miniaturas queda deshabilitada.")
+        return None
+    try:
+        db_path = os.path.join(get_app_data_dir(), "thumbnails.db")
+        return ThumbnailCache(db_path, get_setting("thumbnail_cache_mb") * 1024 * 1024, encrypt=encrypt)
+    except Exception as e:
+        logging.warning(f"No se pudo abrir la caché de miniaturas: {e}")
+        return None
@@ -0,0 +1,132 @@
+# tiles.py
+"""Vista previa de páginas en alta resolución por mosaicos.
+
+A cada nivel de zoom la página se divide en mosaicos de TILE_SIZE píxeles que se
+renderizan por separado con get_pixmap(clip=...): acercarse a una esquina de un
+escaneo de 600 dpi rasteriza solo lo que se ve, no la página entera. Los mosaicos se
+guardan en un caché LRU en memoria, acotado en bytes y compartido por todas las
+páginas y documentos.
+"""
+import os
+import math
+import threading
+from collections import OrderedDict, namedtuple
+
+from settings import get_setting
+
+TILE_SIZE = 512
+# Zoom respecto de 72 ppp (1.0 = 72 ppp, 8.0 = 576 ppp)
+ZOOM_LEVELS = (0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 4.0, 6.0, 8.0)
+
+# samples: RGB sin alfa, stride bytes por fila
+Tile = namedtuple("Tile", "width height stride samples")
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def document_key(pdf_path):
+    """Identifica el archivo en las claves del caché; cambia si el archivo se modifica."""
+    stat = os.stat(pdf_path)
+    return os.path.normcase(os.path.abspath(pdf_path)), stat.st_size, stat.st_mtime_ns
+
+
+def zoom_key(zoom):
+    # El zoom de "ajustar al ancho" no es un nivel fijo; se redondea para usarlo de clave
+    return round(zoom, 4)
+
+
+def page_pixels(width, height, zoom):
+    """Tamaño en píxeles de una página de width x height puntos al zoom dado."""
+    return max(1, math.ceil(width * zoom)), max(1, math.ceil(height * zoom))
+
+
+def tile_rect(width, height, zoom, col, row):
+    """(x0, y0, x1, y1) en píxeles del mosaico (col, row), recortado al borde de la página."""
+    page_width, page_height = page_pixels(width, height, zoom)
+    return (col * TILE_SIZE, row * TILE_SIZE,
+            min((col + 1) * TILE_SIZE, page_width), min((row + 1) * TILE_SIZE, page_height))
+
+
+def tiles_in_view(width, height, zoom, view, margin=0):
+    """Mosaicos (col, row) que tocan view = (x, y, ancho, alto) en píxeles, del centro hacia afuera.
+
+    margin agrega esa cantidad de mosaicos alrededor, para que desplazarse no muestre huecos.
+    """
+    page_width, page_height = page_pixels(width, height, zoom)
+    x, y, view_width, view_height = view
+    first_col = max(0, int(x // TILE_SIZE) - margin)
+    first_row = max(0, int(y // TILE_SIZE) - margin)
+    last_col = min(math.ceil(page_width / TILE_SIZE), math.ceil((x + view_width) / TILE_SIZE) + margin)
+    last_row = min(math.ceil(page_height / TILE_SIZE), math.ceil((y + view_height) / TILE_SIZE) + margin)
+    center_col = (x + view_width / 2) / TILE_SIZE
+    center_row = (y + view_height / 2) / TILE_SIZE
+    tiles = [(col, row) for row in range(first_row, last_row) for col in range(first_col, last_col)]
+    tiles.sort(key=lambda tile: (tile[0] + 0.5 - center_col) ** 2 + (tile[1] + 0.5 - center_row) ** 2)
+    return tiles
+
+
+def render_tile(page, zoom, col, row):
+    """Renderiza solo el área del mosaico; page es un fitz.Page."""
+    import fitz
+
+    rect = page.rect
+    x0, y0, x1, y1 = tile_rect(rect.width, rect.height, zoom, col, row)
+    clip = fitz.Rect(rect.x0 + x0 / zoom, rect.y0 + y0 / zoom, rect.x0 + x1 / zoom, rect.y0 + y1 / zoom)
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip, colorspace=fitz.csRGB, alpha=False)
+    return Tile(pix.width, pix.height, pix.stride, pix.samples)
+
+
+class TileCache:
+    """LRU de mosaicos en memoria; las claves son (documento, página, zoom, col, fila)."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._tiles = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._tiles
+
+    def get(self, key):
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is None:
+                self.misses += 1
+                return None
+            self._tiles.move_to_end(key)
+            self.hits += 1
+            return tile
+
+    def put(self, key, tile):
+        with self._lock:
+            if key in self._tiles:
+                return
+            self._tiles[key] = tile
+            self._bytes += len(tile.samples)
+            # Siempre queda al menos el último: un mosaico más grande que el caché igual se muestra
+            while self._bytes > self.max_bytes and len(self._tiles) > 1:
+                _, old = self._tiles.popitem(last=False)
+                self._bytes -= len(old.samples)
+
+    def clear(self):
+        with self._lock:
+            self._tiles.clear()
+            self._bytes = 0
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+
+def get_tile_cache():
+    """Caché de mosaicos compartido por toda la aplicación, del tamaño de "preview_cache_mb"."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TileCache(int(get_setting("preview_cache_mb") * 1024 * 1024))
+    return _cache
@@ -0,0 +1,353 @@
+# watch_folder.py
+"""Vigila carpetas de entrada (p. ej. la bandeja del escáner) y comprime cada PDF nuevo.
+
+Un archivo se procesa recién cuando su tamaño y su fecha de modificación no cambian
+durante stable_seconds: el escáner o la copia por red pueden tardar en terminar de
+escribirlo. Los archivos listos se reparten en un pool de a lo sumo `workers` a la vez;
+el resto espera en cola. Los PDF que genera el propio vigilante nunca se vuelven a tomar.
+
+En Linux los cambios llegan por inotify; en otros sistemas, o si inotify no está
+disponible (carpetas de red, límite de watches), las carpetas se recorren cada
+poll_interval segundos.
+"""
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from telemetry import operation
+
+DEFAULT_NAME_PATTERN = "{name}_comprimido.pdf"
+# Prefijo de las salidas mientras se escriben; no terminan en .pdf, así que nadie las toma a medias
+PARTIAL_PREFIX = ".parcial_"
+
+# Constantes de <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_Q_OVERFLOW = 0x00004000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Envoltorio mínimo de inotify por ctypes (sin dependencias externas)."""
+
+    MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_MODIFY
+
+    def __init__(self, folders):
+        import ctypes
+        import ctypes.util
+
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falló")
+        self.folders = {}
+        for folder in folders:
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(folder), self.MASK)
+            if wd < 0:
+                error = ctypes.get_errno()
+                os.close(self.fd)
+                raise OSError(error, f"No se puede vigilar {folder}: {os.strerror(error)}")
+            self.folders[wd] = folder
+
+    def read(self, timeout):
+        """Espera hasta timeout segundos; devuelve las rutas tocadas (None si hubo desborde)."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return []
+            raise
+        paths = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & _IN_Q_OVERFLOW:
+                return None
+            if name and wd in self.folders:
+                paths.append(os.path.join(self.folders[wd], os.fsdecode(name)))
+        return paths
+
+    def close(self):
+        os.close(self.fd)
+
+
+class FolderWatcher:
+    """Servicio que comprime los PDF que van apareciendo en una o varias carpetas.
+
+    output_dir es la carpeta de salida (por defecto, la misma del archivo) y
+    name_pattern la regla de nombres: admite {name} (nombre sin extensión), {quality}
+    y {date} (AAAA-MM-DD). compress(entrada, salida) permite reemplazar la compresión,
+    por ejemplo para probar el servicio sobre una carpeta temporal sin Ghostscript.
+    """
+
+    def __init__(self, folders, output_dir=None, quality="ebook", engine="ghostscript",
+                 name_pattern=DEFAULT_NAME_PATTERN, workers=2, stable_seconds=2.0, poll_interval=1.0,
+                 process_existing=True, use_inotify=True, compress=None):
+        self.folders = [os.path.abspath(folder) for folder in folders]
+        self.output_dir = os.path.abspath(output_dir) if output_dir else None
+        self.quality = quality
+        self.engine = engine
+        self.name_pattern = name_pattern
+        self.workers = max(1, workers)
+        self.stable_seconds = stable_seconds
+        self.poll_interval = poll_interval
+        self.process_existing = process_existing
+        self.use_inotify = use_inotify
+        self.compress = compress or self._compress
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._executor = None
+        # Archivos vistos que todavía pueden estar escribiéndose: ruta -> (tamaño, mtime, desde cuándo)
+        self._candidates = {}
+        # Listos para comprimir, esperando un lugar en el pool
+        self._ready = deque()
+        self._in_flight = 0
+        # (ruta, tamaño, mtime) ya tomados, para no procesar dos veces la misma versión
+        self._seen = set()
+        self._produced = set()
+        self._started_at = None
+        self._outputs_watched = self.output_dir is None or self._key(self.output_dir) in map(self._key, self.folders)
+        suffix = name_pattern.split("{name}", 1)[1] if "{name}" in name_pattern else ""
+        self._output_suffix = suffix if "{" not in suffix else ""
+        self.counters = {"processed": 0, "failed": 0, "skipped": 0, "input_bytes": 0, "output_bytes": 0}
+
+    # --- Reglas de nombres y exclusiones ---
+
+    def output_path_for(self, input_path):
+        name = os.path.splitext(os.path.basename(input_path))[0]
+        file_name = self.name_pattern.format(name=name, quality=self.quality, date=time.strftime("%Y-%m-%d"))
+        folder = self.output_dir or os.path.dirname(input_path)
+        path = os.path.join(folder, file_name)
+        stem, extension = os.path.splitext(path)
+        number = 2
+        # No se pisa una salida anterior con el mismo nombre (otro día, otro archivo homónimo)
+        while os.path.exists(path) and self._key(path) not in self._produced:
+            path = f"{stem} ({number}){extension}"
+            number += 1
+        return path
+
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.abspath(path))
+
+    def _is_candidate(self, path):
+        name = os.path.basename(path)
+        if not name.lower().endswith(".pdf") or name.startswith((".", "~$")):
+            return False
+        if self._key(path) in self._produced:
+            return False
+        # Si las salidas caen en una carpeta vigilada, lo que ya sigue la regla de nombres es una salida
+        return not (self._outputs_watched and self._output_suffix and name.endswith(self._output_suffix))
+
+    # --- Detección de archivos estables ---
+
+    def notice(self, path):
+        """Registra un archivo nuevo o modificado; empieza (o reinicia) su espera."""
+        if not self._is_candidate(path):
+            return
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        with self._lock:
+            if (self._key(path), stat.st_size, stat.st_mtime_ns) in self._seen:
+                return
+            previous = self._candidates.get(path)
+            if previous is None or previous[:2] != (stat.st_size, stat.st_mtime_ns):
+                self._candidates[path] = (stat.st_size, stat.st_mtime_ns, time.monotonic())
+
+    def scan(self):
+        """Recorre las carpetas vigiladas (sondeo, arranque o desborde de inotify)."""
+        for folder in self.folders:
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            self.notice(entry.path)
+            except OSError as e:
+                logging.warning(f"No se pudo leer la carpeta vigilada {folder}: {e}")
+
+    def check_stable(self):
+        """Pasa a la cola los candidatos que no cambiaron durante stable_seconds; devuelve cuántos."""
+        now = time.monotonic()
+        promoted = 0
+        with self._lock:
+            candidates = list(self._candidates.items())
+        for path, (size, mtime, since) in candidates:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                with self._lock:
+                    self._candidates.pop(path, None)
+                continue
+            with self._lock:
+                if (stat.st_size, stat.st_mtime_ns) != (size, mtime):
+                    self._candidates[path] = (stat.st_size, stat.st_mtime_ns, now)
+                    continue
+                if now - since < self.stable_seconds or stat.st_size == 0:
+                    continue
+                del self._candidates[path]
+                self._seen.add((self._key(path), size, mtime))
+                if self._already_done(path, stat):
+                    self.counters["skipped"] += 1
+                    continue
+                self._ready.append(path)
+                promoted += 1
+        self._dispatch()
+        return promoted
+
+    def _already_done(self, path, stat):
+        """True si una salida para este archivo ya existe y es más nueva (p. ej. tras reiniciar)."""
+        if "{date}" in self.name_pattern:
+            return False
+        name = os.path.splitext(os.path.basename(path))[0]
+        output = os.path.join(self.output_dir or os.path.dirname(path),
+                              self.name_pattern.format(name=name, quality=self.quality, date=""))
+        return os.path.exists(output) and os.path.getmtime(output) >= stat.st_mtime
+
+    # --- Pool de compresión ---
+
+    def _compress(self, input_path, output_path):
+        from compressor import compress_with_engine
+        return compress_with_engine(input_path, output_path, self.quality, self.engine)
+
+    def _dispatch(self):
+        with self._lock:
+            while self._ready and self._in_flight < self.workers and self._executor is not None:
+                path = self._ready.popleft()
+                self._in_flight += 1
+                self._executor.submit(self._process, path)
+
+    def _process(self, path):
+        output = None
+        input_bytes = 0
+        try:
+            output = self.output_path_for(path)
+            partial = os.path.join(os.path.dirname(output), PARTIAL_PREFIX + os.path.basename(output))
+            with self._lock:
+                self._produced.add(self._key(output))
+            input_bytes = os.path.getsize(path)
+            with operation("watch", engine=self.engine, quality=self.quality, input_bytes=input_bytes) as record:
+                success, message = self.compress(path, partial)
+                record["ok"] = success
+                if success:
+                    os.replace(partial, output)
+                    record["output_bytes"] = os.path.getsize(output)
+                elif os.path.exists(partial):
+                    os.remove(partial)
+        except Exception as e:
+            success, message = False, str(e)
+        with self._lock:
+            self._in_flight -= 1
+            if success:
+                self.counters["processed"] += 1
+                self.counters["input_bytes"] += input_bytes
+                self.counters["output_bytes"] += os.path.getsize(output)
+            else:
+                self.counters["failed"] += 1
+        if success:
+            logging.info(f"Carpeta vigilada: {path} comprimido en {output}")
+        else:
+            logging.error(f"Carpeta vigilada: no se pudo comprimir {path}: {message}")
+        self._dispatch()
+
+    # --- Ciclo de vida ---
+
+    def stats(self):
+        """Contadores actuales: en espera de estabilidad, en cola, en proceso, hechos y fallidos."""
+        with self._lock:
+            elapsed = time.monotonic() - self._started_at if self._started_at else 0
+            stats = dict(self.counters)
+            stats.update({
+                "waiting": len(self._candidates),
+                "queued": len(self._ready),
+                "in_flight": self._in_flight,
+                "files_per_minute": round(self.counters["processed"] / elapsed * 60, 2) if elapsed else 0.0,
+                "mb_per_second": round(self.counters["input_bytes"] / elapsed / 1e6, 3) if elapsed else 0.0,
+            })
+        return stats
+
+    def start(self):
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+        self._stop.clear()
+        self._started_at = time.monotonic()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        self._thread = threading.Thread(target=self._run, name="FolderWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait=True):
+        """Deja de vigilar; los archivos en proceso terminan, los que estaban en cola se descartan."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            self._ready.clear()
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _open_inotify(self):
+        if not self.use_inotify or not sys.platform.startswith("linux"):
+            return None
+        try:
+            return _Inotify(self.folders)
+        except (OSError, AttributeError) as e:
+            logging.warning(f"inotify no disponible, se vigila por sondeo: {e}")
+            return None
+
+    def _run(self):
+        inotify = self._open_inotify()
+        logging.info(f"Vigilando {', '.join(self.folders)} ({'inotify' if inotify else 'sondeo'})")
+        if self.process_existing:
+            self.scan()
+        else:
+            # Lo que ya estaba se marca como visto sin procesarlo
+            self.scan()
+            with self._lock:
+                for path, (size, mtime, _) in self._candidates.items():
+                    self._seen.add((self._key(path), size, mtime))
+                self._candidates.clear()
+        last_scan = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                with self._lock:
+                    waiting = bool(self._candidates)
+                # Con candidatos pendientes se revisa seguido; si no, se espera el próximo evento
+                timeout = min(self.poll_interval, max(0.1, self.stable_seconds / 4)) if waiting else self.poll_interval
+                if inotify is not None:
+                    paths = inotify.read(timeout)
+                    if paths is None:
+                        self.scan()
+                    else:
+                        for path in paths:
+                            self.notice(path)
+                else:
+                    self._stop.wait(timeout)
+                    if time.monotonic() - last_scan >= self.poll_interval:
+                        self.scan()
+                        last_scan = time.monotonic()
+                self.check_stable()
+        finally:
+            if inotify is not None:
+                inotify.close()